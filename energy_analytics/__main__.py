@@ -4,12 +4,15 @@ import argparse
 
 from energy_analytics.charts import run_charts
 from energy_analytics.dashboard import run_dashboard
-from energy_analytics.finance import run_finance
-from energy_analytics.forecast import run_forecast
+from energy_analytics.finance import run_finance, run_finance_monte_carlo
+from energy_analytics.forecast import run_day_ahead, run_forecast
 from energy_analytics.ingest import run_ingest
 from energy_analytics.markets import run_markets
+from energy_analytics.nodal import run_nodal
+from energy_analytics.profiles import run_profiles
 from energy_analytics.qa import run_qa
 from energy_analytics.queue import run_queue_transform
+from energy_analytics.storage import run_storage
 from energy_analytics.transform import run_transform
 
 
@@ -23,9 +26,14 @@ def main() -> None:
             "ingest-hybrid",
             "transform",
             "forecast",
+            "forecast-day-ahead",
             "queue",
+            "profiles",
             "markets",
+            "nodal",
+            "storage",
             "finance",
+            "finance-monte-carlo",
             "charts",
             "dashboard",
             "qa",
@@ -45,12 +53,22 @@ def main() -> None:
         run_transform()
     elif args.command == "forecast":
         run_forecast()
+    elif args.command == "forecast-day-ahead":
+        run_day_ahead()
     elif args.command == "queue":
         run_queue_transform()
+    elif args.command == "profiles":
+        run_profiles()
     elif args.command == "markets":
         run_markets()
+    elif args.command == "nodal":
+        run_nodal()
+    elif args.command == "storage":
+        run_storage()
     elif args.command == "finance":
         run_finance()
+    elif args.command == "finance-monte-carlo":
+        run_finance_monte_carlo()
     elif args.command == "charts":
         run_charts()
     elif args.command == "dashboard":
@@ -61,9 +79,14 @@ def main() -> None:
         run_ingest()
         run_transform()
         run_forecast()
+        run_day_ahead()
         run_queue_transform()
+        run_profiles()
         run_markets()
+        run_nodal()
+        run_storage()
         run_finance()
+        run_finance_monte_carlo()
         run_charts()
         run_dashboard()
         run_qa()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date
+from functools import partial
+from pathlib import Path
+
+from energy_analytics.forecast import np, run_backtest, run_day_ahead_backtest
+from energy_analytics.markets import capture_prices
+from energy_analytics.nodal import nodal_basis, write_store
+
+BENCH_HOURS = (8760, 5 * 8760)
+CAPTURE_BENCH_HOURS = (8760, 10 * 8760)
+CAPTURE_BENCH_PROFILES = 300
+NODAL_BENCH_NODES = 1000
+NODAL_BENCH_CHUNK = 256
+
+
+def synthetic_panel(hours: int, seed: int = 7) -> dict[str, list[float]]:
+    """Deterministic hourly load/temperature/price series with daily and annual seasonality."""
+    rng = random.Random(seed)
+    first_day = date(2025, 1, 1).toordinal()
+    temps: list[float] = []
+    loads: list[float] = []
+    prices: list[float] = []
+    for i in range(hours):
+        daily = math.sin(2 * math.pi * (i % 24) / 24)
+        temp = 65 + 20 * math.sin(2 * math.pi * i / 8760) + 8 * daily + rng.gauss(0, 3)
+        temps.append(round(temp, 1))
+        loads.append(round(42000 + 300 * abs(temp - 65) + 3000 * daily + rng.gauss(0, 500)))
+        prices.append(round(30 + 0.002 * (loads[-1] - 42000) + rng.gauss(0, 10), 2))
+    return {
+        "load_mw": loads,
+        "temperature_f": temps,
+        "price_usd_mwh": prices,
+        "hour": [float(i % 24) for i in range(hours)],
+        "weekday": [float((i // 24) % 7) for i in range(hours)],
+        "month": [float(date.fromordinal(first_day + i // 24).month) for i in range(hours)],
+    }
+
+
+def _timed(fn: Callable[[], object], repeats: int) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_forecast(hours_list: tuple[int, ...] = BENCH_HOURS, repeats: int = 3) -> list[dict[str, str]]:
+    engines = ["python"] + (["numpy"] if np is not None else [])
+    worker_counts = sorted({1, os.cpu_count() or 1})
+    out: list[dict[str, str]] = []
+    for hours in hours_list:
+        panel = synthetic_panel(hours)
+        for engine in engines:
+            for workers in worker_counts:
+                sec = _timed(partial(run_backtest, panel, engine=engine, workers=workers), repeats)
+                out.append(
+                    {
+                        "stage": "forecast_backtest",
+                        "engine": engine,
+                        "workers": str(workers),
+                        "hours": str(hours),
+                        "seconds": f"{sec:.4f}",
+                    }
+                )
+            sec = _timed(partial(run_day_ahead_backtest, panel, engine=engine), repeats)
+            out.append(
+                {
+                    "stage": "forecast_day_ahead",
+                    "engine": engine,
+                    "workers": "1",
+                    "hours": str(hours),
+                    "seconds": f"{sec:.4f}",
+                }
+            )
+    return out
+
+
+def synthetic_profiles(count: int, seed: int = 11) -> dict[str, list[float]]:
+    """Hour-of-year shapes: solar-like daylight bells and wind-like noisy plateaus."""
+    rng = random.Random(seed)
+    out: dict[str, list[float]] = {}
+    for k in range(count):
+        if k % 2:
+            out[f"wind_{k}"] = [min(1.0, max(0.0, 0.45 + rng.gauss(0, 0.2))) for _ in range(8760)]
+        else:
+            peak = rng.uniform(0.8, 1.0)
+            out[f"solar_{k}"] = [peak * max(0.0, math.sin(math.pi * ((h % 24) - 6) / 12)) for h in range(8760)]
+    return out
+
+
+def bench_markets(
+    hours_list: tuple[int, ...] = CAPTURE_BENCH_HOURS, profiles: int = CAPTURE_BENCH_PROFILES, repeats: int = 3
+) -> list[dict[str, str]]:
+    engines = ["python"] + (["numpy"] if np is not None else [])
+    shapes = synthetic_profiles(profiles)
+    out: list[dict[str, str]] = []
+    for hours in hours_list:
+        panel = synthetic_panel(hours)
+        hod = [int(h) for h in panel["hour"]]
+        hoy = [i % 8760 for i in range(hours)]
+        for engine in engines:
+            sec = _timed(partial(capture_prices, shapes, panel["price_usd_mwh"], hod, hoy, engine=engine), repeats)
+            out.append(
+                {
+                    "stage": f"markets_capture_{profiles}p",
+                    "engine": engine,
+                    "workers": "1",
+                    "hours": str(hours),
+                    "seconds": f"{sec:.4f}",
+                }
+            )
+    return out
+
+
+def bench_nodal(nodes: int = NODAL_BENCH_NODES, hours: int = 8760, repeats: int = 1) -> list[dict[str, str]]:
+    """Basis statistics for ``nodes`` synthetic settlement points over one year, chunked."""
+    hub = synthetic_panel(hours)["price_usd_mwh"]
+    rng = random.Random(13)
+    names = [f"NODE_{k:04d}" for k in range(nodes)]
+    stamps = [str(h) for h in range(hours)]
+    engines = ["python"] + (["numpy"] if np is not None else [])
+    worker_counts = sorted({1, os.cpu_count() or 1})
+    out: list[dict[str, str]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        offsets = [rng.gauss(0, 4) for _ in names]
+        write_store(root, names, stamps, ([p + off + rng.gauss(0, 3) for p in hub] for off in offsets))
+        for engine in engines:
+            for workers in worker_counts:
+                sec = _timed(partial(nodal_basis, root, "HUB", hub, 5.0, NODAL_BENCH_CHUNK, engine, workers), repeats)
+                out.append(
+                    {
+                        "stage": f"nodal_basis_{nodes}n",
+                        "engine": engine,
+                        "workers": str(workers),
+                        "hours": str(hours),
+                        "seconds": f"{sec:.4f}",
+                    }
+                )
+    return out
+
+
+def run_bench() -> None:
+    rows = bench_forecast() + bench_markets() + bench_nodal()
+    print(f"{'stage':<24}{'engine':<10}{'workers':>8}{'hours':>10}{'seconds':>12}")
+    for r in rows:
+        print(f"{r['stage']:<24}{r['engine']:<10}{r['workers']:>8}{r['hours']:>10}{r['seconds']:>12}")
+
+
+if __name__ == "__main__":
+    run_bench()
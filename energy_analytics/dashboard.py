@@ -7,6 +7,7 @@ from typing import Any
 
 from energy_analytics.config import load_config
 from energy_analytics.metadata import log_metadata
+from energy_analytics.timeparts import DEFAULT_PEAK_BLOCK
 
 
 def _read_csv(path: Path) -> list[dict[str, str]]:
@@ -38,6 +39,36 @@ def _scenario_index(rows: list[dict[str, str]]) -> dict[str, dict[str, float]]:
     return idx
 
 
+def _cube_index(rows: list[dict[str, str]]) -> dict[str, dict[str, Any]]:
+    """Month -> season and per-block metrics for the all-hubs slice of the markets cube."""
+    idx: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        if row["region"] != "ALL" or row["hub"] != "ALL":
+            continue
+        month = idx.setdefault(row["month"], {"season": row["season"], "on_peak": {}, "off_peak": {}})
+        month[row["block"]][row["metric"]] = float(row["value"])
+    return dict(sorted(idx.items()))
+
+
+def _cube_table(cube: dict[str, dict[str, Any]]) -> str:
+    lines = [
+        "<table class='cube'><tr><th>Month</th><th>Season</th><th>On-peak avg</th><th>Off-peak avg</th>"
+        "<th>Peak spread</th><th>On-peak neg %</th><th>Off-peak neg %</th><th>On-peak congestion</th></tr>"
+    ]
+    for month, cell in cube.items():
+        on, off = cell["on_peak"], cell["off_peak"]
+        on_avg, off_avg = on.get("avg_price_usd_mwh", 0.0), off.get("avg_price_usd_mwh", 0.0)
+        lines.append(
+            f"<tr data-season='{cell['season']}' data-month='{month}'><td>{month}</td><td>{cell['season']}</td>"
+            f"<td>{on_avg:.2f}</td><td>{off_avg:.2f}</td><td>{on_avg - off_avg:.2f}</td>"
+            f"<td>{100 * on.get('negative_price_share', 0.0):.1f}</td>"
+            f"<td>{100 * off.get('negative_price_share', 0.0):.1f}</td>"
+            f"<td>{on.get('congestion_proxy_mean', 0.0):.2f}</td></tr>"
+        )
+    lines.append("</table>")
+    return "\n".join(lines)
+
+
 def _build_summary_report(cfg: dict[str, Any], metrics: dict[str, float], base_fin: dict[str, float]) -> Path:
     report_path = Path("reports/dashboard/summary_report.html")
     report_path.parent.mkdir(parents=True, exist_ok=True)
@@ -96,6 +127,8 @@ def run_dashboard() -> None:
     panel_rows = _read_csv(Path(cfg["curated_output"]["panel_csv"]))
     queue_rows = _read_csv(Path(cfg["curated_output"]["queue_outlook_csv"]))
     market_metrics = _metric_map(_read_csv(Path(cfg["markets_output"]["metrics_csv"])))
+    market_cube = _cube_index(_read_csv(Path(cfg["markets_output"]["cube_csv"])))
+    peak = {**DEFAULT_PEAK_BLOCK, **(cfg.get("markets", {}).get("peak_block") or {})}
     finance_rows = _read_csv(Path(cfg["finance_output"]["scenarios_csv"]))
     scenario_idx = _scenario_index(finance_rows)
 
@@ -143,6 +176,7 @@ def run_dashboard() -> None:
             "queue_p90": queue_p90,
         },
         "finance_scenarios": scenario_idx,
+        "market_cube": market_cube,
     }
 
     html = f"""<!doctype html>
@@ -184,6 +218,9 @@ def run_dashboard() -> None:
     .chart {{ width:100%; border:1px solid var(--line); border-radius:10px; background:#fff; padding:6px; }}
     details {{ margin-top:6px; }}
     .foot {{ color:var(--muted); font-size:12px; margin-top:12px; }}
+    table.cube {{ border-collapse:collapse; width:100%; font-size:12px; margin-top:8px; }}
+    table.cube th,table.cube td {{ border:1px solid var(--line); padding:5px 7px; text-align:right; }}
+    table.cube th {{ background:#eef3f5; }}
     .dl a {{ display:block; margin:4px 0; color:#0a4f6f; text-decoration:none; }}
     @media (max-width:900px) {{ .layout{{grid-template-columns:1fr;}} .side{{border-right:0;border-bottom:1px solid var(--line);}} .grid3{{grid-template-columns:1fr;}} }}
   </style>
@@ -266,7 +303,12 @@ def run_dashboard() -> None:
         <div class='kpi'><div class='m'>Congestion Mean (USD/MWh)</div><div class='v' id='k_cong'>-</div></div>
         <div class='kpi'><div class='m'>Negative Price Share (%)</div><div class='v' id='k_neg'>-</div></div>
       </div>
-      <details><summary>Metric Notes</summary><div class='foot'>Negative price share = hours with price < 0 divided by total hours in modeled period.</div></details>
+      <h3>Monthly Peak Blocks</h3>
+      <label title='Filter the month x peak-block cube by season.'>Season</label>
+      <select id='cube_season'><option value='all' selected>All</option><option>winter</option><option>spring</option><option>summer</option><option>fall</option></select>
+      <div class='kpi'><div class='m'>Mean On/Off-Peak Spread (USD/MWh)</div><div class='v' id='k_spread'>-</div></div>
+      {_cube_table(market_cube)}
+      <details><summary>Metric Notes</summary><div class='foot'>Negative price share = hours with price < 0 divided by total hours in modeled period. On-peak = hours {peak['start_hour']}:00 to {peak['end_hour']}:00 at UTC{peak['utc_offset_h']:+d} on weekdays {peak['weekdays']}; cube months are in the same local time.</div></details>
     </section>
 
     <section id='finance' class='tab'>
@@ -284,6 +326,7 @@ def run_dashboard() -> None:
       <h3>Downloads and Report</h3>
       <div class='dl'>
         <a href='../../data/marts/ercot_market_metrics.csv' download>Download market metrics CSV</a>
+        <a href='../../data/marts/ercot_market_cube.csv' download>Download market month x peak-block cube CSV</a>
         <a href='../../data/marts/ercot_load_backtest.csv' download>Download load backtest CSV</a>
         <a href='../../data/marts/ercot_load_forecast_scenarios.csv' download>Download load scenarios CSV</a>
         <a href='../../data/marts/ercot_finance_scenarios.csv' download>Download finance scenarios CSV</a>
@@ -336,6 +379,19 @@ function refresh() {{
   const qTotal = qArr.reduce((a,b)=>a+b,0) * loadMult;
   document.getElementById('k_queue_total').textContent = fmt(qTotal, 1);
 
+  const season = document.getElementById('cube_season').value;
+  let spreadSum = 0, spreadN = 0;
+  for (const [month, cell] of Object.entries(DATA.market_cube)) {{
+    const show = season === 'all' || cell.season === season;
+    const row = document.querySelector("table.cube tr[data-season][data-month='" + month + "']");
+    if (row) row.style.display = show ? '' : 'none';
+    if (show && cell.on_peak.hours && cell.off_peak.hours) {{
+      spreadSum += cell.on_peak.avg_price_usd_mwh - cell.off_peak.avg_price_usd_mwh;
+      spreadN += 1;
+    }}
+  }}
+  document.getElementById('k_spread').textContent = spreadN ? fmt(spreadSum / spreadN * tightMult) : '-';
+
   const key = scenarioKeyFromControls();
   const s = DATA.finance_scenarios[key] || DATA.finance_scenarios['contracted|base|base'];
   document.getElementById('k_npv').textContent = fmt(s.npv_musd, 2);
@@ -353,7 +409,7 @@ for (const btn of document.querySelectorAll('.tab-btn')) {{
   }});
 }}
 
-for (const id of ['load_scn','queue_scn','tight_scn','contract_type','capex','opex','wacc','debt','ppa','degrade']) {{
+for (const id of ['load_scn','queue_scn','tight_scn','cube_season','contract_type','capex','opex','wacc','debt','ppa','degrade']) {{
   document.getElementById(id).addEventListener('input', refresh);
 }}
 refresh();
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only where numpy is absent
+    np = None
+
+
+def resolve_engine(requested: str, stage: str) -> str:
+    """Map a ``<stage>.engine`` setting (auto|python|numpy) to the engine that will run."""
+    if requested == "auto":
+        return "numpy" if np is not None else "python"
+    if requested == "numpy" and np is None:
+        raise SystemExit(f"{stage}.engine=numpy requires numpy; install it or use engine=auto|python")
+    if requested not in {"python", "numpy"}:
+        raise SystemExit(f"Unsupported {stage}.engine={requested}; expected auto|python|numpy")
+    return requested
+
+
+def resolve_workers(requested: int, tasks: int | None = None) -> int:
+    """Pool size for a ``<stage>.workers`` setting: 0 means every core, capped at ``tasks`` when given."""
+    workers = requested if requested > 0 else (os.cpu_count() or 1)
+    if tasks is not None:
+        workers = min(workers, tasks)
+    return max(1, workers)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    # Linear interpolation between closest ranks (numpy's default method).
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
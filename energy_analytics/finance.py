@@ -1,10 +1,26 @@
 from __future__ import annotations
 
 import csv
+import itertools
+import math
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
 from energy_analytics.config import load_config
+from energy_analytics.engines import resolve_engine, resolve_workers
 from energy_analytics.metadata import log_metadata
+from energy_analytics.profiles import HOURS_PER_YEAR
+from energy_analytics.sampling import draw, draw_numpy
+from energy_analytics.sketches import tdigest_add, tdigest_init, tdigest_merge, tdigest_quantile
+from energy_analytics.timeparts import DEFAULT_PEAK_BLOCK, time_parts
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional accelerator; the pure-Python path is always available.
+    np = None
 
 SCENARIO_COLUMNS = [
     "scenario_id",
@@ -16,12 +32,82 @@ SCENARIO_COLUMNS = [
     "npv_musd",
     "after_tax_npv_musd",
     "irr",
+    "irr_status",
     "min_dscr",
     "avg_dscr",
     "lcoe_usd_mwh",
     "year1_revenue_musd",
 ]
 
+# Rates scanned for roots when Newton fails or the cash flows change sign more than once.
+IRR_BRACKET = (-0.9, 1.5)
+IRR_SCAN_POINTS = 49
+IRR_TOL = 1e-12
+# Two Newton/Brent roots closer than this (relative) are the same root.
+IRR_ROOT_GAP = 1e-9
+NEWTON_STEPS = 30
+IRR_STATUSES = ("ok", "multiple_roots", "no_root", "not_converged")
+
+# ``debt_service_years`` counts the years with debt service; DSCRs are 0.0 when there are none.
+CASE_RESULTS = ("npv", "after_tax_npv", "irr", "min_dscr", "avg_dscr", "debt_service_years", "lcoe", "year1_revenue")
+# Case columns that are not ``finance_assumptions`` keys.
+CASE_KEYS = ("price_multiplier", "capex_multiplier", "contract_type")
+# Inputs that set the shape of the cash-flow matrix, so every case in one call must share them.
+SHARED_ASSUMPTIONS = ("project_life_years", "debt_tenor_years")
+
+DEFAULT_MONTE_CARLO_SETTINGS: dict[str, Any] = {
+    "draws": 100_000,
+    "chunk_draws": 10_000,
+    "seed": 42,
+    "workers": 0,
+    "contract_type": "contracted",
+    "dscr_covenant": 1.20,
+    "quantile_compression": 200,
+    "distributions": {},
+}
+# Results summarized per draw; NPV is reported in million USD.
+MONTE_CARLO_RESULTS = ("npv_musd", "irr", "min_dscr")
+MONTE_CARLO_QUANTILES = (0.10, 0.50, 0.90)
+
+# Without a finance.sensitivity block the tornado swings price and capex by 10%, apart and
+# together; the combined driver's low end is the price -10% & capex +10% downside case.
+DEFAULT_SENSITIVITY: dict[str, Any] = {
+    "base": {},
+    "drivers": [
+        {"name": "Price", "input": "price_multiplier", "low": 0.90, "high": 1.10},
+        {"name": "Capex", "input": "capex_multiplier", "low": 0.90, "high": 1.10},
+        {
+            "name": "Price & capex",
+            "low": {"price_multiplier": 0.90, "capex_multiplier": 1.10},
+            "high": {"price_multiplier": 1.10, "capex_multiplier": 0.90},
+        },
+    ],
+    "factorial": [],
+}
+SENSITIVITY_COLUMNS = [
+    "driver",
+    "input",
+    "low_value",
+    "high_value",
+    "npv_low_musd",
+    "npv_high_musd",
+    "delta_low_musd",
+    "delta_high_musd",
+    "swing_musd",
+]
+SWEEP_COLUMNS = [
+    "sweep",
+    "case_id",
+    "inputs",
+    "npv_musd",
+    "after_tax_npv_musd",
+    "irr",
+    "irr_status",
+    "min_dscr",
+    "lcoe_usd_mwh",
+    "delta_npv_musd",
+]
+
 
 def _read_metric(metrics_path: Path, metric_name: str) -> float:
     with metrics_path.open("r", encoding="utf-8", newline="") as f:
@@ -31,33 +117,342 @@ def _read_metric(metrics_path: Path, metric_name: str) -> float:
     raise ValueError(f"Metric not found: {metric_name}")
 
 
+def _read_hourly_years(hourly_path: Path, hub: str, profile: str, engine: str = "python") -> tuple[list[int], Any, Any]:
+    """Calendar years in the enriched market mart, each as 8760 prices and generation weights.
+
+    Weights are the mart's ``<profile>_profile`` column. Hours a year does not cover take that
+    year's mean for the same hour of day, so a partial extract prices as a repeated typical day.
+    With numpy the (years x 8760) sums and counts are two ``bincount`` calls and the rows come
+    back as arrays; the pure-Python engine returns lists.
+    """
+    column = f"{profile}_profile"
+    timestamps: list[str] = []
+    prices: list[float] = []
+    weights: list[float] = []
+    with hourly_path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if column not in (reader.fieldnames or []):
+            raise SystemExit(f"finance.hourly.profile={profile} has no {column} column in {hourly_path}")
+        for row in reader:
+            if row["hub"] == hub:
+                timestamps.append(row["timestamp_utc"])
+                prices.append(float(row["price_usd_mwh"]))
+                weights.append(float(row[column]))
+    if not timestamps:
+        raise SystemExit(f"Hourly revenue mode needs {hub} rows in {hourly_path}")
+
+    parts = time_parts(timestamps, DEFAULT_PEAK_BLOCK)
+    if engine == "numpy":
+        years, row = np.unique(np.asarray(parts["year"]), return_inverse=True)
+        cells = row * HOURS_PER_YEAR + np.asarray(parts["hour_of_year"])
+        shape = (len(years), HOURS_PER_YEAR)
+        days = (len(years), HOURS_PER_YEAR // 24, 24)
+        counts = np.bincount(cells, minlength=len(years) * HOURS_PER_YEAR).reshape(shape)
+        seen = counts > 0
+        # Each hour of day's fallback is the mean over the covered hours of that year.
+        covered = seen.reshape(days).sum(axis=1)
+        filled = []
+        for values in (prices, weights):
+            total = np.bincount(cells, weights=np.asarray(values, dtype=np.float64), minlength=counts.size)
+            means = np.where(seen, total.reshape(shape) / np.maximum(counts, 1), 0.0)
+            fallback = np.where(covered > 0, means.reshape(days).sum(axis=1) / np.maximum(covered, 1), 0.0)
+            filled.append(np.where(seen, means, np.tile(fallback, (1, HOURS_PER_YEAR // 24))))
+        return years.tolist(), filled[0], filled[1]
+
+    sums: dict[int, dict[str, list[float]]] = {}
+    counts: dict[int, list[int]] = {}
+    for year, hoy, price, weight in zip(parts["year"], parts["hour_of_year"], prices, weights, strict=True):
+        if year not in sums:
+            sums[year] = {"price": [0.0] * HOURS_PER_YEAR, "weight": [0.0] * HOURS_PER_YEAR}
+            counts[year] = [0] * HOURS_PER_YEAR
+        sums[year]["price"][hoy] += price
+        sums[year]["weight"][hoy] += weight
+        counts[year][hoy] += 1
+
+    years = sorted(sums)
+    out_prices: list[list[float]] = []
+    out_weights: list[list[float]] = []
+    for year in years:
+        seen = counts[year]
+        filled = {}
+        for name, total in sums[year].items():
+            means = [total[h] / seen[h] if seen[h] else 0.0 for h in range(HOURS_PER_YEAR)]
+            by_hour = [[means[h] for h in range(hr, HOURS_PER_YEAR, 24) if seen[h]] for hr in range(24)]
+            fallback = [sum(v) / len(v) if v else 0.0 for v in by_hour]
+            filled[name] = [means[h] if seen[h] else fallback[h % 24] for h in range(HOURS_PER_YEAR)]
+        out_prices.append(filled["price"])
+        out_weights.append(filled["weight"])
+    return years, out_prices, out_weights
+
+
+def hourly_capture_by_year(prices: Any, weights: Any, engine: str = "auto") -> tuple[float, ...]:
+    """Generation-weighted price of each ``(years, 8760)`` price/weight row.
+
+    A project year's merchant revenue is sum_h gen_h * price_h with gen_h = energy * w_h / sum(w).
+    Degradation, escalation and case multipliers scale whole years, so they factor out of the
+    hourly sum: one (years x 8760) product prices every case and year, and the case engines
+    apply the rest per year.
+    """
+    engine = resolve_engine(engine, "finance")
+    if engine == "numpy":
+        p = np.asarray(prices, dtype=np.float64)
+        w = np.asarray(weights, dtype=np.float64)
+        energy = w.sum(axis=1)
+        weighted = np.einsum("yh,yh->y", w, p)
+        return tuple(np.where(energy > 0, weighted / np.where(energy > 0, energy, 1.0), 0.0).tolist())
+    out = []
+    for p_row, w_row in zip(prices, weights, strict=True):
+        energy = sum(w_row)
+        out.append(sum(a * b for a, b in zip(w_row, p_row, strict=True)) / energy if energy > 0 else 0.0)
+    return tuple(out)
+
+
+def _capture_by_year(cfg: dict[str, Any], engine: str) -> tuple[float, ...] | None:
+    finance_cfg = cfg.get("finance", {})
+    mode = str(finance_cfg.get("revenue_mode", "annual"))
+    if mode == "annual":
+        return None
+    if mode != "hourly":
+        raise SystemExit(f"Unsupported finance.revenue_mode={mode}; expected annual|hourly")
+    profile = str((finance_cfg.get("hourly") or {}).get("profile", "solar"))
+    _, prices, weights = _read_hourly_years(Path(cfg["markets_output"]["hourly_csv"]), cfg["hub"], profile, engine)
+    return hourly_capture_by_year(prices, weights, engine)
+
+
 def _npv(rate: float, cashflows: list[float]) -> float:
     return sum(cf / ((1 + rate) ** t) for t, cf in enumerate(cashflows))
 
 
-def _irr(cashflows: list[float]) -> float:
-    lo = -0.90
-    hi = 1.50
-    npv_lo = _npv(lo, cashflows)
-    npv_hi = _npv(hi, cashflows)
-    if npv_lo == 0:
-        return lo
-    if npv_hi == 0:
-        return hi
-    if npv_lo * npv_hi > 0:
-        return 0.0
-    for _ in range(80):
-        mid = (lo + hi) / 2
-        npv_mid = _npv(mid, cashflows)
-        if abs(npv_mid) < 1e-8:
-            return mid
-        if npv_lo * npv_mid < 0:
-            hi = mid
-            npv_hi = npv_mid
+def _npv_slope(rate: float, cashflows: list[float]) -> tuple[float, float]:
+    """NPV and dNPV/drate by Horner's rule in ``v = 1 / (1 + rate)``; no powers are formed."""
+    v = 1.0 / (1.0 + rate)
+    value = 0.0
+    dv = 0.0
+    for cf in reversed(cashflows):
+        dv = dv * v + value
+        value = value * v + cf
+    return value, -dv * v * v
+
+
+def _sign_changes(cashflows: list[float]) -> int:
+    # Descartes' rule of signs: one change means exactly one IRR above -100%.
+    signs = [cf > 0 for cf in cashflows if cf != 0]
+    return sum(1 for a, b in zip(signs, signs[1:], strict=False) if a != b)
+
+
+def _newton(cashflows: list[float], guess: float) -> float | None:
+    rate = guess
+    for _ in range(NEWTON_STEPS):
+        value, slope = _npv_slope(rate, cashflows)
+        if slope == 0 or value != value:
+            return None
+        step = value / slope
+        nxt = rate - step
+        if nxt <= -1.0:
+            nxt = (rate - 1.0) / 2.0  # halve the distance to -100% instead of stepping past it
+        if abs(nxt - rate) <= IRR_TOL * (1.0 + abs(rate)):
+            return nxt
+        rate = nxt
+    return None
+
+
+def _brent(cashflows: list[float], a: float, b: float, fa: float, fb: float) -> float:
+    """Brent's method on a sign-changing bracket: inverse quadratic / secant steps with bisection."""
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(200):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2e-16 * abs(b) + 0.5 * IRR_TOL
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2.0 * m * s, 1.0 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
         else:
-            lo = mid
-            npv_lo = npv_mid
-    return (lo + hi) / 2
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = _npv_slope(b, cashflows)[0]
+    return b
+
+
+def solve_irr(cashflows: list[float], guess: float = 0.1) -> tuple[float, str]:
+    """Equity IRR and its status (one of ``IRR_STATUSES``).
+
+    Newton steps with the analytic derivative run from ``guess``; a neighbouring case's IRR
+    makes a good warm start. With a single sign change in the cash flows the root is unique,
+    so a converged Newton step is final. Otherwise NPV is scanned across ``IRR_BRACKET``; a
+    Newton root is kept only if it lies in one of the scan's sign-changing brackets, and if not
+    Brent's method solves the bracket nearest ``guess``. ``multiple_roots`` (more than one
+    bracket, or a Newton root outside the scanned brackets) returns that root, while
+    ``no_root`` and ``not_converged`` return NaN rather than a number that looks valid.
+    """
+    changes = _sign_changes(cashflows)
+    if changes == 0:
+        return math.nan, "no_root"
+    root = _newton(cashflows, guess)
+    if root is not None and changes == 1:
+        return root, "ok"
+    lo, hi = IRR_BRACKET
+    rates = [lo + (hi - lo) * k / (IRR_SCAN_POINTS - 1) for k in range(IRR_SCAN_POINTS)]
+    values = [_npv_slope(r, cashflows)[0] for r in rates]
+    brackets = [
+        (rates[k], rates[k + 1], values[k], values[k + 1])
+        for k in range(IRR_SCAN_POINTS - 1)
+        if values[k] == 0 or (values[k] > 0) != (values[k + 1] > 0)
+    ]
+    status = "multiple_roots" if len(brackets) > 1 else "ok"
+    if root is not None and any(a <= root <= b for a, b, _, _ in brackets):
+        return root, status
+    if not brackets:
+        return math.nan, "not_converged" if changes == 1 else "no_root"
+    a, b, fa, fb = min(brackets, key=lambda br: abs((br[0] + br[1]) / 2 - guess))
+    found = a if fa == 0 else _brent(cashflows, a, b, fa, fb)
+    if root is not None and abs(root - found) > IRR_ROOT_GAP * (1.0 + abs(found)):
+        status = "multiple_roots"
+    return found, status
+
+
+def irr_batch(
+    cashflows: Any, guesses: list[float] | None = None, engine: str = "auto"
+) -> tuple[list[float], list[str]]:
+    """IRR and status for each row of a (cases x periods) cash-flow matrix.
+
+    With numpy every row takes Newton steps together (Horner's rule down the period axis);
+    rows that do not converge or may have several roots are finished one at a time by
+    ``solve_irr``, warm-started from the nearest converged row. The pure-Python engine solves
+    rows in order, each starting from the previous row's IRR. ``guesses`` overrides the
+    starting rates (default 0.1).
+    """
+    engine = resolve_engine(engine, "finance")
+    rows = cashflows.tolist() if hasattr(cashflows, "tolist") else [list(r) for r in cashflows]
+    count = len(rows)
+    starts = list(guesses) if guesses is not None else [0.1] * count
+    rates = [math.nan] * count
+    statuses = ["not_converged"] * count
+    if engine == "python":
+        warm = None
+        for i, row in enumerate(rows):
+            rates[i], statuses[i] = solve_irr(row, starts[i] if guesses is not None or warm is None else warm)
+            if statuses[i] == "ok":
+                warm = rates[i]
+        return rates, statuses
+    if not count:
+        return rates, statuses
+
+    cf = np.asarray(rows, dtype=np.float64)
+    rate = np.asarray(starts, dtype=np.float64)
+    done = np.zeros(count, dtype=bool)
+
+    def npv_slope(at: Any, flows: Any = cf) -> tuple[Any, Any]:
+        v = 1.0 / (1.0 + at)
+        value = np.zeros(flows.shape[0])
+        dv = np.zeros(flows.shape[0])
+        for t in range(flows.shape[1] - 1, -1, -1):
+            dv = dv * v + value
+            value = value * v + flows[:, t]
+        return value, -dv * v * v
+
+    with np.errstate(all="ignore"):
+        # Rows whose NPV changes sign across IRR_BRACKET keep a shrinking bracket and bisect
+        # whenever a Newton step would leave it, so an overshoot towards -100% cannot stall them.
+        lo = np.full(count, IRR_BRACKET[0])
+        hi = np.full(count, IRR_BRACKET[1])
+        lo_sign = np.sign(npv_slope(lo)[0])
+        bracketed = lo_sign * np.sign(npv_slope(hi)[0]) < 0
+        for _ in range(NEWTON_STEPS):
+            value, slope = npv_slope(rate)
+            inside = bracketed & (rate > lo) & (rate < hi)
+            left = np.sign(value) == lo_sign
+            lo = np.where(inside & left, rate, lo)
+            hi = np.where(inside & ~left, rate, hi)
+            nxt = rate - value / slope
+            stray = bracketed & ~((nxt > lo) & (nxt < hi))
+            nxt = np.where(stray, (lo + hi) / 2.0, nxt)
+            nxt = np.where(nxt <= -1.0, (rate - 1.0) / 2.0, nxt)
+            settled = ~done & np.isfinite(nxt) & (np.abs(nxt - rate) <= IRR_TOL * (1.0 + np.abs(rate)))
+            rate = np.where(done, rate, nxt)
+            done |= settled
+            if done.all():
+                break
+    # Sign changes per row, ignoring zero flows, to tell unique roots from possible multiples.
+    last = np.zeros(count)
+    changes = np.zeros(count, dtype=np.int64)
+    for t in range(cf.shape[1]):
+        sign = np.sign(cf[:, t])
+        changes += (sign != 0) & (last != 0) & (sign != last)
+        last = np.where(sign != 0, sign, last)
+    resolved = done & (changes == 1)
+    several = np.zeros(count, dtype=bool)
+    # Several sign changes need not mean several roots: as in ``solve_irr``, a converged row
+    # whose NPV crosses zero only once over the IRR_BRACKET scan, at the rate Newton found, is
+    # resolved here in one pass.
+    multi = np.flatnonzero(done & (changes > 1))
+    if multi.size:
+        lo, hi = IRR_BRACKET
+        grid = np.linspace(lo, hi, IRR_SCAN_POINTS)
+        v = 1.0 / (1.0 + grid)
+        scan = np.zeros((multi.size, IRR_SCAN_POINTS))
+        for t in range(cf.shape[1] - 1, -1, -1):
+            scan = scan * v + cf[multi, t : t + 1]
+        positive = scan > 0
+        crossed = (scan[:, :-1] == 0) | (positive[:, :-1] != positive[:, 1:])
+        first = crossed.argmax(axis=1)
+        within = (rate[multi] >= grid[first]) & (rate[multi] <= grid[first + 1])
+        resolved[multi[(crossed.sum(axis=1) == 1) & within]] = True
+        # The bracketed steps above cannot leave IRR_BRACKET, so repeat ``solve_irr``'s free
+        # Newton run from the starting rate: settling on a root outside the crossing means a
+        # second root the scan cannot see.
+        free = np.asarray(starts, dtype=np.float64)[multi]
+        settled = np.zeros(multi.size, dtype=bool)
+        with np.errstate(all="ignore"):
+            for _ in range(NEWTON_STEPS):
+                value, slope = npv_slope(free, cf[multi])
+                nxt = free - value / slope
+                nxt = np.where(nxt <= -1.0, (free - 1.0) / 2.0, nxt)
+                converged = np.isfinite(nxt) & (np.abs(nxt - free) <= IRR_TOL * (1.0 + np.abs(free)))
+                free = np.where(settled, free, nxt)
+                settled |= converged
+                if settled.all():
+                    break
+        outside = (free < grid[first]) | (free > grid[first + 1])
+        apart = np.abs(free - rate[multi]) > IRR_ROOT_GAP * (1.0 + np.abs(rate[multi]))
+        several[multi[settled & outside & apart]] = True
+    good = np.flatnonzero(resolved)
+    rates = np.where(resolved, rate, np.nan).tolist()
+    statuses = [
+        ("multiple_roots" if m else "ok") if u else "not_converged"
+        for u, m in zip(resolved.tolist(), several.tolist(), strict=True)
+    ]
+    for i in np.flatnonzero(~resolved).tolist():
+        if changes[i] == 0:
+            rates[i], statuses[i] = math.nan, "no_root"
+            continue
+        guess = starts[i]
+        if guesses is None and good.size:
+            k = int(np.searchsorted(good, i))
+            near = [good[j] for j in (k - 1, k) if 0 <= j < good.size]
+            guess = float(rate[min(near, key=lambda j: abs(j - i))])
+        rates[i], statuses[i] = solve_irr(rows[i], guess)
+    return rates, statuses
 
 
 def _annuity_payment(principal: float, rate: float, years: int) -> float:
@@ -75,7 +470,15 @@ def _build_case(
     price_multiplier: float,
     capex_multiplier: float,
     contract_type: str,
+    capture_by_year: tuple[float, ...] | None = None,
 ) -> dict[str, float]:
+    """Pro-forma for one case.
+
+    Merchant revenue is priced at ``base_capture`` every year, or in the hourly revenue mode at
+    ``capture_by_year`` (generation-weighted hourly prices per market year, replayed in order
+    over the project life); the contracted strike is fixed off ``base_capture``. Both
+    escalate at ``price_escalation_rate``.
+    """
     life = int(assumptions["project_life_years"])
     debt_tenor = int(assumptions["debt_tenor_years"])
     capacity_mw = float(assumptions["capacity_mw"])
@@ -89,6 +492,7 @@ def _build_case(
     tax_rate = float(assumptions.get("tax_rate", 0.25))
     merchant_discount = float(assumptions.get("merchant_basis_discount", 0.92))
     contracted_adder = float(assumptions.get("contracted_price_adder_usd_mwh", 2.0))
+    escalation = float(assumptions.get("price_escalation_rate", 0.0))
 
     capacity_kw = capacity_mw * 1000.0
     capex = capacity_kw * capex_kw
@@ -111,7 +515,10 @@ def _build_case(
 
     for year in range(1, life + 1):
         energy = annual_energy * ((1 - degradation) ** (year - 1))
-        revenue = energy * strike_price
+        price = strike_price
+        if capture_by_year is not None and contract_type != "contracted":
+            price = (capture_by_year[(year - 1) % len(capture_by_year)] * price_multiplier) * merchant_discount
+        revenue = energy * price * ((1 + escalation) ** (year - 1))
         opex = capacity_kw * opex_kw
         cash = revenue - opex
         cfads.append(cash)
@@ -128,7 +535,7 @@ def _build_case(
 
     npv_equity = _npv(discount, equity_cfs)
     npv_equity_after_tax = _npv(discount, equity_cfs_after_tax)
-    irr_equity = _irr(equity_cfs)
+    irr_equity, irr_status = solve_irr(equity_cfs)
     min_dscr = min(debt_dscr) if debt_dscr else 0.0
     avg_dscr = sum(debt_dscr) / len(debt_dscr) if debt_dscr else 0.0
     lcoe = (discounted_cost / discounted_energy) if discounted_energy else 0.0
@@ -137,21 +544,423 @@ def _build_case(
         "npv": npv_equity,
         "after_tax_npv": npv_equity_after_tax,
         "irr": irr_equity,
+        "irr_status": irr_status,
         "min_dscr": min_dscr,
         "avg_dscr": avg_dscr,
+        "debt_service_years": len(debt_dscr),
         "lcoe": lcoe,
         "year1_revenue": cfads[0] + (capacity_kw * opex_kw),
     }
 
 
+def _case_count(cases: dict[str, list[Any]]) -> int:
+    lengths = {len(col) for col in cases.values()}
+    if len(lengths) != 1:
+        raise SystemExit("Finance cases need one equal-length column per varying input")
+    return lengths.pop()
+
+
+def _case_grid_numpy(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    cases: dict[str, list[Any]],
+    capture_by_year: tuple[float, ...] | None = None,
+) -> dict[str, Any]:
+    """``_build_case`` for every case at once, as (cases x years) cash-flow matrices.
+
+    Inputs that vary across cases are ``(cases, 1)`` columns and everything else stays a
+    scalar, so a shared discount rate gives one discount-factor vector for the whole grid.
+    """
+    count = _case_count(cases)
+
+    def param(name: str, default: float | None = None) -> Any:
+        if name in cases:
+            return np.asarray(cases[name], dtype=np.float64).reshape(count, 1)
+        return float(assumptions[name]) if default is None else float(assumptions.get(name, default))
+
+    life = int(assumptions["project_life_years"])
+    debt_tenor = int(assumptions["debt_tenor_years"])
+    capacity_mw = param("capacity_mw")
+    cap_factor = param("solar_capacity_factor")
+    degradation = param("degradation_rate")
+    capex_kw = param("capex_per_kw") * np.asarray(cases.get("capex_multiplier", [1.0] * count)).reshape(count, 1)
+    opex_kw = param("fixed_opex_per_kw_year")
+    debt_fraction = param("debt_fraction")
+    debt_rate = param("debt_rate")
+    discount = param("equity_discount_rate")
+    tax_rate = param("tax_rate", 0.25)
+    merchant_discount = param("merchant_basis_discount", 0.92)
+    contracted_adder = param("contracted_price_adder_usd_mwh", 2.0)
+    escalation = param("price_escalation_rate", 0.0)
+    price_multiplier = np.asarray(cases.get("price_multiplier", [1.0] * count), dtype=np.float64).reshape(count, 1)
+    contracted = np.asarray(cases.get("contract_type", ["contracted"] * count)).reshape(count, 1) == "contracted"
+
+    capacity_kw = capacity_mw * 1000.0
+    capex = capacity_kw * capex_kw
+    debt = capex * debt_fraction
+    equity = capex - debt
+    if debt_tenor > 0:
+        growth = (1 + debt_rate) ** debt_tenor
+        with np.errstate(invalid="ignore", divide="ignore"):
+            annual_debt_service = np.where(
+                debt_rate == 0, debt / debt_tenor, debt * ((debt_rate * growth) / (growth - 1))
+            )
+    else:
+        annual_debt_service = np.zeros((count, 1))
+
+    annual_energy = capacity_mw * 8760.0 * cap_factor
+    # The hourly mode's capture prices, replayed over the project life, as a (1, years) row.
+    merchant_capture = base_capture
+    if capture_by_year is not None:
+        merchant_capture = np.asarray(capture_by_year)[np.arange(life) % len(capture_by_year)][None, :]
+    strike_price = np.where(
+        contracted,
+        (base_capture * price_multiplier) + contracted_adder,
+        (merchant_capture * price_multiplier) * merchant_discount,
+    )
+
+    years = np.arange(1, life + 1, dtype=np.float64)
+    energy = annual_energy * ((1 - degradation) ** (years - 1))
+    opex = capacity_kw * opex_kw
+    cash = energy * strike_price * ((1 + escalation) ** (years - 1)) - opex
+    debt_service = np.where(years <= debt_tenor, annual_debt_service, 0.0)
+    levered = cash - debt_service
+    # Discount factors for t = 0..life; one shared row unless the rate varies by case.
+    factors = (1 + discount) ** np.arange(0, life + 1, dtype=np.float64)
+    equity_cfs = np.concatenate((np.broadcast_to(-equity, (count, 1)), levered), axis=1)
+    after_tax_cfs = np.concatenate((np.broadcast_to(-equity, (count, 1)), levered * (1 - tax_rate)), axis=1)
+
+    serviced = np.broadcast_to(debt_service > 0, cash.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dscr = np.where(serviced, cash / np.where(serviced, debt_service, 1.0), np.nan)
+    has_debt = serviced.any(axis=1)
+    min_dscr = np.where(has_debt, np.where(serviced, dscr, np.inf).min(axis=1), 0.0)
+    avg_dscr = np.where(has_debt, np.where(serviced, dscr, 0.0).sum(axis=1) / np.maximum(serviced.sum(axis=1), 1), 0.0)
+
+    tail_factors = factors[..., 1:]
+    discounted_cost = capex[:, 0] + np.broadcast_to(opex / tail_factors, cash.shape).sum(axis=1)
+    discounted_energy = np.broadcast_to(energy / tail_factors, cash.shape).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        lcoe = np.where(discounted_energy != 0, discounted_cost / discounted_energy, 0.0)
+
+    return {
+        "npv": (equity_cfs / factors).sum(axis=1),
+        "after_tax_npv": (after_tax_cfs / factors).sum(axis=1),
+        "equity_cfs": equity_cfs,
+        "min_dscr": min_dscr,
+        "avg_dscr": avg_dscr,
+        "debt_service_years": serviced.sum(axis=1),
+        "lcoe": lcoe,
+        "year1_revenue": (cash[:, :1] + opex)[:, 0],
+    }
+
+
+def evaluate_cases(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    cases: dict[str, list[Any]],
+    engine: str = "auto",
+    capture_by_year: tuple[float, ...] | None = None,
+) -> dict[str, list[Any]]:
+    """Finance results (``CASE_RESULTS`` plus ``irr_status``) for many cases in one call.
+
+    ``cases`` holds one equal-length column per input that varies: ``price_multiplier``,
+    ``capex_multiplier``, ``contract_type`` and any ``finance_assumptions`` key except
+    ``SHARED_ASSUMPTIONS``. Inputs without a column come from ``assumptions``. With numpy the
+    whole grid is one set of matrix operations; the pure-Python engine runs ``_build_case``
+    per case, and both agree to floating-point rounding. ``capture_by_year`` switches merchant
+    revenue to the hourly mode's per-year capture prices (see ``hourly_capture_by_year``).
+    """
+    engine = resolve_engine(engine, "finance")
+    count = _case_count(cases)
+    for name in SHARED_ASSUMPTIONS:
+        if name in cases and len({float(v) for v in cases[name]}) > 1:
+            raise SystemExit(f"finance case grids need one shared {name}")
+    if engine == "python":
+        out: dict[str, list[Any]] = {k: [] for k in CASE_RESULTS + ("irr_status",)}
+        for i in range(count):
+            row = {name: col[i] for name, col in cases.items()}
+            merged = {**assumptions, **{k: v for k, v in row.items() if k not in CASE_KEYS}}
+            r = _build_case(
+                base_capture,
+                merged,
+                float(row.get("price_multiplier", 1.0)),
+                float(row.get("capex_multiplier", 1.0)),
+                contract_type=str(row.get("contract_type", "contracted")),
+                capture_by_year=capture_by_year,
+            )
+            for k in CASE_RESULTS:
+                out[k].append(r[k])
+            out["irr_status"].append(r["irr_status"])
+        return out
+    grid = _case_grid_numpy(base_capture, assumptions, cases, capture_by_year)
+    out = {k: grid[k].tolist() for k in CASE_RESULTS if k != "irr"}
+    out["irr"], out["irr_status"] = irr_batch(grid["equity_cfs"], engine="numpy")
+    return {k: out[k] for k in CASE_RESULTS + ("irr_status",)}
+
+
+def _monte_carlo_chunk(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    settings: dict[str, Any],
+    capture_by_year: tuple[float, ...] | None,
+    seed: int,
+    draws: int,
+    engine: str,
+) -> dict[str, Any]:
+    """Digests and covenant counts for ``draws`` cases sampled with one chunk seed.
+
+    Each driver in ``settings["distributions"]`` (``price_multiplier``, ``capex_multiplier`` or a
+    ``finance_assumptions`` key) is drawn independently per case; the rest of the assumptions
+    stay fixed. IRRs without a root are counted but left out of the IRR digest; draws without
+    debt service have no DSCR, so they stay out of the DSCR digest and cannot breach the covenant.
+    """
+    specs = settings["distributions"]
+    if engine == "numpy":
+        rng = np.random.default_rng(seed)
+        columns = {name: draw_numpy(spec, rng, (draws,)) for name, spec in specs.items()}
+    else:
+        rng_py = random.Random(seed)
+        columns = {name: [] for name in specs}
+        for _ in range(draws):
+            for name, spec in specs.items():
+                columns[name].append(draw(spec, rng_py))
+    # Every sampled driver is a price, cost, rate or share, so draws below zero are clipped.
+    cases: dict[str, list[Any]] = {
+        name: (np.maximum(col, 0.0).tolist() if engine == "numpy" else [max(v, 0.0) for v in col])
+        for name, col in columns.items()
+    }
+    cases["contract_type"] = [settings["contract_type"]] * draws
+    results = evaluate_cases(base_capture, assumptions, cases, engine=engine, capture_by_year=capture_by_year)
+
+    compression = float(settings["quantile_compression"])
+    digests = {name: tdigest_init(compression) for name in MONTE_CARLO_RESULTS}
+    covenant = float(settings["dscr_covenant"])
+    breaches = 0
+    npv_sum = 0.0
+    for npv, irr, min_dscr, serviced in zip(
+        results["npv"], results["irr"], results["min_dscr"], results["debt_service_years"], strict=True
+    ):
+        npv_musd = npv / 1_000_000.0
+        npv_sum += npv_musd
+        tdigest_add(digests["npv_musd"], npv_musd)
+        if irr == irr:
+            tdigest_add(digests["irr"], irr)
+        if serviced:
+            tdigest_add(digests["min_dscr"], min_dscr)
+            breaches += min_dscr < covenant
+    return {"draws": draws, "breaches": breaches, "npv_musd_sum": npv_sum, "digests": digests}
+
+
+def monte_carlo(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    settings: dict[str, Any],
+    engine: str,
+    workers: int,
+    capture_by_year: tuple[float, ...] | None = None,
+) -> dict[str, Any]:
+    """Run ``settings["draws"]`` sampled cases in chunks across a process pool.
+
+    Chunk seeds come from one ``random.Random(seed)`` stream, so results depend on the seed
+    and chunk size but not on the worker count. Chunk digests are merged in chunk order, and
+    the pool gets a new chunk only as one is merged, so at most two chunks per worker are ever
+    queued or held at a time however many draws there are.
+    """
+    draws = int(settings["draws"])
+    chunk_draws = int(settings["chunk_draws"])
+    if draws <= 0 or chunk_draws <= 0:
+        raise SystemExit("finance.monte_carlo draws and chunk_draws must be > 0")
+    sizes = [min(chunk_draws, draws - start) for start in range(0, draws, chunk_draws)]
+    seeder = random.Random(int(settings["seed"]))
+    seeds = [seeder.getrandbits(63) for _ in sizes]
+
+    compression = float(settings["quantile_compression"])
+    total: dict[str, Any] = {
+        "draws": 0,
+        "breaches": 0,
+        "npv_musd_sum": 0.0,
+        "chunks": len(sizes),
+        "digests": {name: tdigest_init(compression) for name in MONTE_CARLO_RESULTS},
+    }
+
+    def fold(part: dict[str, Any]) -> None:
+        for key in ("draws", "breaches", "npv_musd_sum"):
+            total[key] += part[key]
+        for name, digest in part["digests"].items():
+            tdigest_merge(total["digests"][name], digest)
+
+    args = (base_capture, assumptions, settings, capture_by_year)
+    if workers <= 1 or len(sizes) <= 1:
+        for seed, size in zip(seeds, sizes, strict=True):
+            fold(_monte_carlo_chunk(*args, seed, size, engine))
+    else:
+        pool_size = min(workers, len(sizes))
+        jobs = iter(zip(seeds, sizes, strict=True))
+        with ProcessPoolExecutor(max_workers=pool_size) as pool:
+            pending: deque[Any] = deque()
+            for seed, size in itertools.islice(jobs, 2 * pool_size):
+                pending.append(pool.submit(_monte_carlo_chunk, *args, seed, size, engine))
+            while pending:
+                fold(pending.popleft().result())
+                for seed, size in itertools.islice(jobs, 1):
+                    pending.append(pool.submit(_monte_carlo_chunk, *args, seed, size, engine))
+    return total
+
+
+def _monte_carlo_settings(finance_cfg: dict[str, Any], assumptions: dict[str, Any]) -> dict[str, Any]:
+    settings = dict(DEFAULT_MONTE_CARLO_SETTINGS)
+    settings.update(finance_cfg.get("monte_carlo") or {})
+    drivers = set(settings["distributions"])
+    unknown = drivers - {"price_multiplier", "capex_multiplier"} - (set(assumptions) - set(SHARED_ASSUMPTIONS))
+    if unknown:
+        raise SystemExit(f"finance.monte_carlo.distributions has unknown drivers: {sorted(unknown)}")
+    return settings
+
+
+def _case_key(assumptions: dict[str, Any], overrides: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    """Sorted ``(input, value)`` pairs for one case, with numbers as rounded floats.
+
+    Equal cases normalize to the same key however they were spelled (``1`` vs ``1.0``, key
+    order, float noise from building ranges), so the sweep cache sees them as one.
+    """
+    merged = {"price_multiplier": 1.0, "capex_multiplier": 1.0, "contract_type": "contracted"}
+    merged.update(assumptions)
+    merged.update(overrides)
+    return tuple(sorted((k, v if isinstance(v, str) else round(float(v), 12)) for k, v in merged.items()))
+
+
+def sweep_cases(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    overrides: list[dict[str, Any]],
+    capture_by_year: tuple[float, ...] | None = None,
+    engine: str = "auto",
+    cache: dict[tuple[tuple[str, Any], ...], dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """Results (``CASE_RESULTS`` plus ``irr_status``) for ``assumptions`` with each set of ``overrides``.
+
+    Cases are normalized by ``_case_key``; the ones not yet in ``cache`` go to ``evaluate_cases``
+    as one grid per ``SHARED_ASSUMPTIONS`` value, and the results are stored in ``cache``. The
+    base case, tornado ends and factorial grid points that coincide are evaluated once as long
+    as the sweeps share a cache.
+    """
+    cache = {} if cache is None else cache
+    keys = [_case_key(assumptions, o) for o in overrides]
+    grids: dict[tuple[Any, ...], list[tuple[tuple[str, Any], ...]]] = {}
+    for key in dict.fromkeys(k for k in keys if k not in cache):
+        grids.setdefault(tuple(dict(key).get(n) for n in SHARED_ASSUMPTIONS), []).append(key)
+    for grid in grids.values():
+        params = [dict(key) for key in grid]
+        first = params[0]
+        varying = [n for n in first if n in CASE_KEYS or any(p[n] != first[n] for p in params)]
+        fixed = {n: v for n, v in first.items() if n not in varying}
+        cases = {n: [p[n] for p in params] for n in varying}
+        results = evaluate_cases(base_capture, fixed, cases, engine=engine, capture_by_year=capture_by_year)
+        for i, key in enumerate(grid):
+            cache[key] = {k: results[k][i] for k in CASE_RESULTS + ("irr_status",)}
+    return [dict(cache[k]) for k in keys]
+
+
+def sweep_case(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    overrides: dict[str, Any],
+    capture_by_year: tuple[float, ...] | None = None,
+    engine: str = "auto",
+    cache: dict[tuple[tuple[str, Any], ...], dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """``sweep_cases`` for a single case."""
+    return sweep_cases(base_capture, assumptions, [overrides], capture_by_year, engine, cache)[0]
+
+
+def _driver_end(driver: dict[str, Any], end: str) -> dict[str, Any]:
+    # A driver moves one ``input`` to a value, or several inputs together given as a mapping.
+    value = driver[end]
+    return dict(value) if isinstance(value, dict) else {driver["input"]: value}
+
+
+def _format_inputs(inputs: dict[str, Any]) -> str:
+    return ";".join(f"{k}={v}" for k, v in inputs.items())
+
+
+def _check_inputs(names: Any, assumptions: dict[str, Any]) -> None:
+    unknown = set(names) - set(CASE_KEYS) - set(assumptions)
+    if unknown:
+        raise SystemExit(f"finance.sensitivity has unknown inputs: {sorted(unknown)}")
+
+
+def tornado(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    base: dict[str, Any],
+    drivers: list[dict[str, Any]],
+    capture_by_year: tuple[float, ...] | None = None,
+    engine: str = "auto",
+    cache: dict[tuple[tuple[str, Any], ...], dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """One row per driver: NPV at its low and high end with every other input at ``base``.
+
+    A driver's ``low``/``high`` is a value for its ``input``, or an ``{input: value}`` mapping
+    for inputs that move together. The base case and every end are valued in one
+    ``sweep_cases`` call. Rows are sorted by swing (|NPV high - NPV low|), widest first, as a
+    tornado chart draws them.
+    """
+    ends = [(_driver_end(d, "low"), _driver_end(d, "high")) for d in drivers]
+    _check_inputs([n for pair in ends for end in pair for n in end] + list(base), assumptions)
+    cases = [base] + [{**base, **end} for pair in ends for end in pair]
+    npvs = [r["npv"] for r in sweep_cases(base_capture, assumptions, cases, capture_by_year, engine, cache)]
+    base_npv = npvs[0]
+    rows = []
+    for i, (driver, (low, high)) in enumerate(zip(drivers, ends, strict=True)):
+        npv_low, npv_high = npvs[1 + 2 * i], npvs[2 + 2 * i]
+        inputs = driver.get("input") or ";".join(dict.fromkeys([*low, *high]))
+        rows.append(
+            {
+                "driver": driver.get("name", inputs),
+                "input": inputs,
+                "low_value": driver["low"] if "input" in driver else _format_inputs(low),
+                "high_value": driver["high"] if "input" in driver else _format_inputs(high),
+                "npv_low": npv_low,
+                "npv_high": npv_high,
+                "delta_low": npv_low - base_npv,
+                "delta_high": npv_high - base_npv,
+                "swing": abs(npv_high - npv_low),
+            }
+        )
+    return sorted(rows, key=lambda r: -r["swing"])
+
+
+def factorial_sweep(
+    base_capture: float,
+    assumptions: dict[str, Any],
+    base: dict[str, Any],
+    values: dict[str, list[Any]],
+    capture_by_year: tuple[float, ...] | None = None,
+    engine: str = "auto",
+    cache: dict[tuple[tuple[str, Any], ...], dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """Every combination of ``values`` (input -> list of values) on top of ``base``, in one grid.
+
+    Combinations follow the order of ``values``, with the last input varying fastest.
+    """
+    _check_inputs(list(values) + list(base), assumptions)
+    names = list(values)
+    combos = [dict(zip(names, combo, strict=True)) for combo in itertools.product(*(values[n] for n in names))]
+    results = sweep_cases(base_capture, assumptions, [{**base, **c} for c in combos], capture_by_year, engine, cache)
+    return [{"inputs": c, **r} for c, r in zip(combos, results, strict=True)]
+
+
 def _write_sensitivity_chart(rows: list[dict[str, str]], out_path: Path) -> None:
-    width, height = 900, 300
+    """Tornado chart: per driver, bars from the base NPV out to its low- and high-value NPVs."""
     left = 240
-    top = 30
-    bar_h = 30
-    gap = 12
+    top = 50
+    bar_h = 26
+    gap = 14
+    width = 900
+    height = top + len(rows) * (bar_h + gap) + 20
 
-    values = [float(r["delta_npv_musd"]) for r in rows]
+    values = [float(r[k]) for r in rows for k in ("delta_low_musd", "delta_high_musd")]
     v_abs = max(abs(v) for v in values) if values else 1.0
     scale = 260 / v_abs if v_abs else 1.0
     zero_x = left + 260
@@ -160,16 +969,26 @@ def _write_sensitivity_chart(rows: list[dict[str, str]], out_path: Path) -> None
         f.write(f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}'>\n")
         f.write("<rect x='0' y='0' width='100%' height='100%' fill='white'/>\n")
         f.write("<text x='20' y='20' font-size='16' font-family='Arial'>Finance Sensitivity (Delta NPV, MUSD)</text>\n")
-        f.write(f"<line x1='{zero_x}' y1='{top-8}' x2='{zero_x}' y2='{height-20}' stroke='#333'/>\n")
+        f.write("<rect x='20' y='30' width='10' height='10' fill='#B55000'/>\n")
+        f.write("<text x='36' y='39' font-size='11' font-family='Arial'>low value</text>\n")
+        f.write("<rect x='110' y='30' width='10' height='10' fill='#1E7A50'/>\n")
+        f.write("<text x='126' y='39' font-size='11' font-family='Arial'>high value</text>\n")
+        f.write(f"<line x1='{zero_x}' y1='{top-8}' x2='{zero_x}' y2='{height-10}' stroke='#333'/>\n")
         for i, row in enumerate(rows):
             y = top + i * (bar_h + gap)
-            delta = float(row["delta_npv_musd"])
-            w = abs(delta) * scale
-            x = zero_x - w if delta < 0 else zero_x
-            color = "#B55000" if delta < 0 else "#1E7A50"
-            f.write(f"<text x='20' y='{y+20}' font-size='12' font-family='Arial'>{row['driver']}</text>\n")
-            f.write(f"<rect x='{x:.2f}' y='{y}' width='{w:.2f}' height='{bar_h}' fill='{color}'/>\n")
-            f.write(f"<text x='{x + w + 8:.2f}' y='{y+20}' font-size='11' font-family='Arial'>{delta:.2f}</text>\n")
+            label = f"{row['driver']} ({row['low_value']} / {row['high_value']})"
+            f.write(f"<text x='20' y='{y+17}' font-size='12' font-family='Arial'>{label}</text>\n")
+            for key, color in (("delta_low_musd", "#B55000"), ("delta_high_musd", "#1E7A50")):
+                delta = float(row[key])
+                w = abs(delta) * scale
+                x = zero_x - w if delta < 0 else zero_x
+                text_x = x - 8 if delta < 0 else x + w + 8
+                anchor = "end" if delta < 0 else "start"
+                f.write(f"<rect x='{x:.2f}' y='{y}' width='{w:.2f}' height='{bar_h}' fill='{color}' opacity='0.85'/>\n")
+                f.write(
+                    f"<text x='{text_x:.2f}' y='{y+17}' font-size='11' font-family='Arial' "
+                    f"text-anchor='{anchor}'>{delta:.2f}</text>\n"
+                )
         f.write("</svg>\n")
 
 
@@ -180,45 +999,63 @@ def run_finance() -> None:
     summary_path = Path(cfg["finance_output"]["summary_csv"])
     sensitivity_path = Path(cfg["finance_output"]["sensitivity_csv"])
     sensitivity_chart_path = Path(cfg["finance_output"]["sensitivity_chart_svg"])
+    sweep_path = Path(cfg["finance_output"].get("sweep_csv", "data/marts/ercot_finance_sweep.csv"))
     log_path = cfg["reports"]["metadata_log"]
 
     assumptions = cfg["finance_assumptions"]
+    engine = resolve_engine(str(cfg.get("finance", {}).get("engine", "auto")), "finance")
     base_capture = _read_metric(metrics_path, "solar_capture_price_usd_mwh")
+    capture_by_year = _capture_by_year(cfg, engine)
 
     price_cases = [("low", 0.85), ("base", 1.00), ("high", 1.15)]
     capex_cases = [("low", 0.90), ("base", 1.00), ("high", 1.10)]
     contract_cases = ["merchant", "contracted"]
 
+    # The whole contract x price x capex grid is evaluated in one call.
+    grid = [
+        (contract_type, price_name, price_mult, capex_name, capex_mult)
+        for contract_type in contract_cases
+        for price_name, price_mult in price_cases
+        for capex_name, capex_mult in capex_cases
+    ]
+    results = evaluate_cases(
+        base_capture,
+        assumptions,
+        {
+            "contract_type": [g[0] for g in grid],
+            "price_multiplier": [g[2] for g in grid],
+            "capex_multiplier": [g[4] for g in grid],
+        },
+        engine=engine,
+        capture_by_year=capture_by_year,
+    )
+
     scenario_rows: list[dict[str, str]] = []
-    scenario_id = 1
     base_npv_musd = 0.0
-
-    for contract_type in contract_cases:
-        for price_name, price_mult in price_cases:
-            for capex_name, capex_mult in capex_cases:
-                r = _build_case(base_capture, assumptions, price_mult, capex_mult, contract_type=contract_type)
-                npv_musd = r["npv"] / 1_000_000.0
-                after_tax_npv_musd = r["after_tax_npv"] / 1_000_000.0
-                if contract_type == "contracted" and price_name == "base" and capex_name == "base":
-                    base_npv_musd = npv_musd
-                scenario_rows.append(
-                    {
-                        "scenario_id": str(scenario_id),
-                        "contract_type": contract_type,
-                        "price_case": price_name,
-                        "capex_case": capex_name,
-                        "price_multiplier": f"{price_mult:.2f}",
-                        "capex_multiplier": f"{capex_mult:.2f}",
-                        "npv_musd": f"{npv_musd:.4f}",
-                        "after_tax_npv_musd": f"{after_tax_npv_musd:.4f}",
-                        "irr": f"{r['irr']:.4f}",
-                        "min_dscr": f"{r['min_dscr']:.4f}",
-                        "avg_dscr": f"{r['avg_dscr']:.4f}",
-                        "lcoe_usd_mwh": f"{r['lcoe']:.4f}",
-                        "year1_revenue_musd": f"{(r['year1_revenue'] / 1_000_000.0):.4f}",
-                    }
-                )
-                scenario_id += 1
+    for i, (contract_type, price_name, price_mult, capex_name, capex_mult) in enumerate(grid):
+        r = {k: results[k][i] for k in CASE_RESULTS}
+        npv_musd = r["npv"] / 1_000_000.0
+        after_tax_npv_musd = r["after_tax_npv"] / 1_000_000.0
+        if contract_type == "contracted" and price_name == "base" and capex_name == "base":
+            base_npv_musd = npv_musd
+        scenario_rows.append(
+            {
+                "scenario_id": str(i + 1),
+                "contract_type": contract_type,
+                "price_case": price_name,
+                "capex_case": capex_name,
+                "price_multiplier": f"{price_mult:.2f}",
+                "capex_multiplier": f"{capex_mult:.2f}",
+                "npv_musd": f"{npv_musd:.4f}",
+                "after_tax_npv_musd": f"{after_tax_npv_musd:.4f}",
+                "irr": f"{r['irr']:.4f}",
+                "irr_status": results["irr_status"][i],
+                "min_dscr": f"{r['min_dscr']:.4f}",
+                "avg_dscr": f"{r['avg_dscr']:.4f}",
+                "lcoe_usd_mwh": f"{r['lcoe']:.4f}",
+                "year1_revenue_musd": f"{(r['year1_revenue'] / 1_000_000.0):.4f}",
+            }
+        )
 
     scenarios_path.parent.mkdir(parents=True, exist_ok=True)
     with scenarios_path.open("w", encoding="utf-8", newline="") as f:
@@ -242,30 +1079,58 @@ def run_finance() -> None:
         writer.writerow({"metric": "base_min_dscr", "value": base_row["min_dscr"]})
         writer.writerow({"metric": "base_lcoe_usd_mwh", "value": base_row["lcoe_usd_mwh"]})
 
-    sens_inputs = [
-        ("Price -10%", 0.90, 1.00),
-        ("Price +10%", 1.10, 1.00),
-        ("Capex -10%", 1.00, 0.90),
-        ("Capex +10%", 1.00, 1.10),
-        ("Price -10% & Capex +10%", 0.90, 1.10),
-    ]
+    sens_cfg = {**DEFAULT_SENSITIVITY, **(cfg.get("finance", {}).get("sensitivity") or {})}
+    sens_base = dict(sens_cfg["base"] or {})
+    # One cache across the tornado and the factorial sweeps, so shared cases are valued once.
+    case_cache: dict[tuple[tuple[str, Any], ...], dict[str, Any]] = {}
+    base_sweep_npv = sweep_case(base_capture, assumptions, sens_base, capture_by_year, engine, case_cache)["npv"]
+    drivers = list(sens_cfg["drivers"] or [])
     sensitivity_rows: list[dict[str, str]] = []
-    for name, p_mult, c_mult in sens_inputs:
-        r = _build_case(base_capture, assumptions, p_mult, c_mult, contract_type="contracted")
-        npv_musd = r["npv"] / 1_000_000.0
+    for r in tornado(base_capture, assumptions, sens_base, drivers, capture_by_year, engine, case_cache):
         sensitivity_rows.append(
             {
-                "driver": name,
-                "npv_musd": f"{npv_musd:.4f}",
-                "delta_npv_musd": f"{(npv_musd - base_npv_musd):.4f}",
+                "driver": r["driver"],
+                "input": r["input"],
+                "low_value": str(r["low_value"]),
+                "high_value": str(r["high_value"]),
+                "npv_low_musd": f"{r['npv_low'] / 1_000_000.0:.4f}",
+                "npv_high_musd": f"{r['npv_high'] / 1_000_000.0:.4f}",
+                "delta_low_musd": f"{r['delta_low'] / 1_000_000.0:.4f}",
+                "delta_high_musd": f"{r['delta_high'] / 1_000_000.0:.4f}",
+                "swing_musd": f"{r['swing'] / 1_000_000.0:.4f}",
             }
         )
 
     with sensitivity_path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["driver", "npv_musd", "delta_npv_musd"])
+        writer = csv.DictWriter(f, fieldnames=SENSITIVITY_COLUMNS)
         writer.writeheader()
         writer.writerows(sensitivity_rows)
 
+    sweep_rows: list[dict[str, str]] = []
+    for grid_spec in sens_cfg["factorial"] or []:
+        sweep = factorial_sweep(
+            base_capture, assumptions, sens_base, grid_spec["values"], capture_by_year, engine, case_cache
+        )
+        for i, r in enumerate(sweep, start=1):
+            sweep_rows.append(
+                {
+                    "sweep": str(grid_spec["name"]),
+                    "case_id": str(i),
+                    "inputs": _format_inputs(r["inputs"]),
+                    "npv_musd": f"{r['npv'] / 1_000_000.0:.4f}",
+                    "after_tax_npv_musd": f"{r['after_tax_npv'] / 1_000_000.0:.4f}",
+                    "irr": f"{r['irr']:.4f}",
+                    "irr_status": r["irr_status"],
+                    "min_dscr": f"{r['min_dscr']:.4f}",
+                    "lcoe_usd_mwh": f"{r['lcoe']:.4f}",
+                    "delta_npv_musd": f"{(r['npv'] - base_sweep_npv) / 1_000_000.0:.4f}",
+                }
+            )
+    with sweep_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(sweep_rows)
+
     sensitivity_chart_path.parent.mkdir(parents=True, exist_ok=True)
     _write_sensitivity_chart(sensitivity_rows, sensitivity_chart_path)
 
@@ -273,7 +1138,11 @@ def run_finance() -> None:
         log_path,
         (
             "finance:"
+            f"engine={engine} "
+            f"revenue_mode={'annual' if capture_by_year is None else 'hourly'} "
             f"scenarios={len(scenario_rows)} "
+            f"tornado_drivers={len(sensitivity_rows)} sweep_cases={len(sweep_rows)} "
+            f"cached_cases={len(case_cache)} "
             f"base_npv_musd={base_npv_musd:.3f} "
             f"base_after_tax_npv_musd={float(base_row['after_tax_npv_musd']):.3f} "
             f"base_irr={float(base_row['irr']):.3f}"
@@ -281,5 +1150,56 @@ def run_finance() -> None:
     )
 
 
+def run_finance_monte_carlo() -> None:
+    cfg = load_config()
+    metrics_path = Path(cfg["markets_output"]["metrics_csv"])
+    out_path = Path(cfg["finance_output"].get("monte_carlo_csv", "data/marts/ercot_finance_monte_carlo.csv"))
+    log_path = cfg["reports"]["metadata_log"]
+
+    finance_cfg = cfg.get("finance", {})
+    assumptions = cfg["finance_assumptions"]
+    engine = resolve_engine(str(finance_cfg.get("engine", "auto")), "finance")
+    settings = _monte_carlo_settings(finance_cfg, assumptions)
+    workers = resolve_workers(int(settings["workers"]))
+    base_capture = _read_metric(metrics_path, "solar_capture_price_usd_mwh")
+    capture_by_year = _capture_by_year(cfg, engine)
+
+    total = monte_carlo(base_capture, assumptions, settings, engine, workers, capture_by_year)
+    draws = total["draws"]
+    digests = total["digests"]
+    breach_probability = total["breaches"] / draws
+    rows = [
+        ("draws", str(draws)),
+        ("chunks", str(total["chunks"])),
+        ("seed", str(int(settings["seed"]))),
+        ("contract_type", str(settings["contract_type"])),
+        ("npv_musd_mean", f"{total['npv_musd_sum'] / draws:.4f}"),
+    ]
+    for name in MONTE_CARLO_RESULTS:
+        for q in MONTE_CARLO_QUANTILES:
+            rows.append((f"{name}_p{round(q * 100)}", f"{tdigest_quantile(digests[name], q):.4f}"))
+    rows += [
+        ("irr_resolved_share", f"{digests['irr']['count'] / draws:.4f}"),
+        ("dscr_covenant", f"{float(settings['dscr_covenant']):.4f}"),
+        ("dscr_breach_probability", f"{breach_probability:.4f}"),
+    ]
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["metric", "value"])
+        writer.writeheader()
+        writer.writerows({"metric": k, "value": v} for k, v in rows)
+
+    log_metadata(
+        log_path,
+        (
+            "finance_monte_carlo:"
+            f"engine={engine} draws={draws} chunks={total['chunks']} workers={workers} "
+            f"npv_musd_p50={tdigest_quantile(digests['npv_musd'], 0.5):.3f} "
+            f"dscr_breach_probability={breach_probability:.4f}"
+        ),
+    )
+
+
 if __name__ == "__main__":
     run_finance()
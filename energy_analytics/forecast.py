@@ -1,21 +1,67 @@
 from __future__ import annotations
 
+import copy
 import csv
+import hashlib
+import json
 import math
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from multiprocessing import shared_memory
 from pathlib import Path
+from typing import Any
 
 from energy_analytics.config import load_config
+from energy_analytics.engines import percentile, resolve_engine, resolve_workers
 from energy_analytics.metadata import log_metadata
+from energy_analytics.provenance import sha256_file
+from energy_analytics.sampling import draw, draw_numpy
+from energy_analytics.sketches import p2_init, p2_update, p2_value, pinball_loss
 
-BACKTEST_COLUMNS = [
-    "timestamp_utc",
-    "actual_load_mw",
-    "naive_forecast_mw",
-    "weather_forecast_mw",
-    "naive_abs_pct_error",
-    "weather_abs_pct_error",
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional accelerator; the pure-Python path is always available.
+    np = None
+
+DAY_AHEAD_METRIC_COLUMNS = ["horizon_h", "model", "issues", "rmse_mw", "mape"]
+
+SEGMENT_COLUMNS = ["dimension", "segment", "model", "hours", "rmse_mw", "mape"]
+SEGMENT_DIMENSIONS = ("hour_of_day", "month", "temperature_band")
+
+SCENARIO_COLUMNS = [
+    "scenario",
+    "year",
+    "avg_load_mw",
+    "peak_load_mw",
+    "annual_growth_rate",
+    "avg_load_mw_p10",
+    "avg_load_mw_p90",
+    "percentile",
 ]
 
+DEFAULT_MODELS = ["naive_24h", "weather_linear", "weather_multi", "naive_168h", "hour_profile"]
+PANEL_FIELDS = ("load_mw", "temperature_f", "hour", "weekday", "month")
+QUANTILES = (0.1, 0.5, 0.9)
+# Scenario rows report these percentiles of the simulated annual average and peak load.
+SCENARIO_PERCENTILES = {"low": 10.0, "base": 50.0, "high": 90.0}
+DEFAULT_SCENARIO_SETTINGS: dict[str, Any] = {
+    "years": 7,
+    "draws": 20000,
+    "seed": 42,
+    "growth": {"distribution": "triangular", "low": 0.01, "mode": 0.03, "high": 0.06},
+    "growth_volatility": 0.005,
+    "peak_ratio": {"distribution": "normal", "mean": 1.18, "std": 0.02},
+}
+# Bump when the persisted backtest state layout changes so stale caches are ignored.
+CACHE_VERSION = 3
+
+DEGREE_HOUR_BASE_F = 65.0
+# Feature layout: intercept, HDH, CDH, hour-of-day dummies 1-23, weekday dummies 1-6, lag-24 load (GW).
+MULTI_FEATURE_COUNT = 33
+MULTI_RIDGE = 1e-4
+
 
 def _linear_fit(x: list[float], y: list[float]) -> tuple[float, float]:
     n = len(x)
@@ -32,6 +78,207 @@ def _linear_fit(x: list[float], y: list[float]) -> tuple[float, float]:
     return (a, b)
 
 
+def _fit_stats() -> dict[str, float]:
+    # Running sufficient statistics for a one-regressor least-squares fit, kept as
+    # centered co-moments (Welford) so long panels do not lose precision to cancellation.
+    return {"n": 0.0, "x_mean": 0.0, "y_mean": 0.0, "sxx": 0.0, "sxy": 0.0}
+
+
+def _fit_add(stats: dict[str, float], x: float, y: float) -> None:
+    stats["n"] += 1.0
+    dx = x - stats["x_mean"]
+    stats["x_mean"] += dx / stats["n"]
+    stats["y_mean"] += (y - stats["y_mean"]) / stats["n"]
+    stats["sxx"] += dx * (x - stats["x_mean"])
+    stats["sxy"] += dx * (y - stats["y_mean"])
+
+
+def _fit_remove(stats: dict[str, float], x: float, y: float) -> None:
+    # Exact inverse of _fit_add, used to slide a fixed-size training window.
+    n = stats["n"] - 1.0
+    if n <= 0:
+        stats.update(_fit_stats())
+        return
+    x_mean = stats["x_mean"] - (x - stats["x_mean"]) / n
+    dx = x - x_mean
+    stats["sxx"] -= dx * (x - stats["x_mean"])
+    stats["sxy"] -= dx * (y - stats["y_mean"])
+    stats["x_mean"] = x_mean
+    stats["y_mean"] -= (y - stats["y_mean"]) / n
+    stats["n"] = n
+
+
+def _fit_coefficients(stats: dict[str, float]) -> tuple[float, float]:
+    if stats["n"] == 0:
+        return (0.0, 0.0)
+    if stats["sxx"] <= 0:
+        return (stats["y_mean"], 0.0)
+    b = stats["sxy"] / stats["sxx"]
+    a = stats["y_mean"] - b * stats["x_mean"]
+    return (a, b)
+
+
+def _weather_linear_forecasts(
+    temps: list[float], loads: list[float], start: int, window: int = 0, stats: dict[str, float] | None = None
+) -> list[float]:
+    """Temperature regression forecasts for hours ``start..n-1``.
+
+    Each forecast uses only hours before it, matching a refit of ``_linear_fit`` on
+    ``rows[:i]`` (or ``rows[i - window:i]`` when ``window`` > 0), but updates the fit in
+    O(1) per hour instead of refitting. ``stats`` already trained on the hours before
+    ``start`` skips that pretraining; it is updated in place through hour n-1.
+    """
+    if stats is None:
+        stats = _fit_stats()
+    if stats["n"] == 0:
+        for j in range(max(0, start - window) if window else 0, start):
+            _fit_add(stats, temps[j], loads[j])
+
+    out: list[float] = []
+    for i in range(start, len(loads)):
+        a, b = _fit_coefficients(stats)
+        out.append(a + (b * temps[i]))
+        _fit_add(stats, temps[i], loads[i])
+        if window and i - window >= 0:
+            _fit_remove(stats, temps[i - window], loads[i - window])
+    return out
+
+
+def _multi_feature_row(temp: float, hour: int, weekday: int, lag_load: float) -> list[tuple[int, float]]:
+    """Sparse (index, value) feature vector; dummies keep at most six entries non-zero."""
+    x = [(0, 1.0)]
+    if temp < DEGREE_HOUR_BASE_F:
+        x.append((1, DEGREE_HOUR_BASE_F - temp))
+    elif temp > DEGREE_HOUR_BASE_F:
+        x.append((2, temp - DEGREE_HOUR_BASE_F))
+    if hour:
+        x.append((2 + hour, 1.0))
+    if weekday:
+        x.append((25 + weekday, 1.0))
+    x.append((32, lag_load / 1000.0))
+    return x
+
+
+def _rls_state(dim: int, ridge: float) -> dict[str, Any]:
+    # Recursive least squares: ``p`` tracks (X'X + ridge*I)^-1 and ``theta`` the coefficients,
+    # so each observation is a rank-one update instead of re-solving the normal equations.
+    return {
+        "n": 0,
+        "theta": [0.0] * dim,
+        "p": [[(1.0 / ridge) if r == c else 0.0 for c in range(dim)] for r in range(dim)],
+    }
+
+
+def _rls_update(state: dict[str, Any], x: list[tuple[int, float]], y: float, sign: float = 1.0) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) one observation via Sherman-Morrison."""
+    p = state["p"]
+    theta = state["theta"]
+    px = [sum(row[c] * v for c, v in x) for row in p]
+    denom = 1.0 + sign * sum(px[c] * v for c, v in x)
+    err = y - sum(theta[c] * v for c, v in x)
+    k = [v / denom for v in px]
+    state["theta"] = [t + sign * kj * err for t, kj in zip(theta, k, strict=True)]
+    for r, kr in enumerate(k):
+        if kr:
+            p[r] = [a - sign * kr * b for a, b in zip(p[r], px, strict=True)]
+    state["n"] += int(sign)
+
+
+def _weather_multi_forecasts(
+    panel: dict[str, list[float]],
+    start: int,
+    fallback: list[float],
+    window: int = 0,
+    state: dict[str, Any] | None = None,
+) -> list[float]:
+    """Multi-feature forecasts for hours ``start..n-1`` over an expanding or ``window``-hour history.
+
+    Until the model holds ``MULTI_FEATURE_COUNT`` training hours the forecast falls back
+    to ``fallback`` (the single-regressor weather forecast for the same hours). A ``state``
+    from ``_rls_state`` already trained on the hours before ``start`` is updated in place.
+    """
+    loads = panel["load_mw"]
+    if state is None:
+        state = _rls_state(MULTI_FEATURE_COUNT, MULTI_RIDGE)
+    pretrain = state["n"] == 0
+    first = max(24, start - window) if window else (24 if pretrain else start)
+    rows = [
+        _multi_feature_row(panel["temperature_f"][i], int(panel["hour"][i]), int(panel["weekday"][i]), loads[i - 24])
+        for i in range(first, len(loads))
+    ]
+    if pretrain:
+        for j in range(first, start):
+            _rls_update(state, rows[j - first], loads[j])
+
+    out: list[float] = []
+    for i in range(start, len(loads)):
+        x = rows[i - first]
+        if state["n"] >= MULTI_FEATURE_COUNT:
+            out.append(sum(state["theta"][c] * v for c, v in x))
+        else:
+            out.append(fallback[i - start])
+        _rls_update(state, x, loads[i])
+        if window and i - window >= 24:
+            _rls_update(state, rows[i - window - first], loads[i - window], sign=-1.0)
+    return out
+
+
+def _multi_feature_matrix_numpy(panel: dict[str, list[float]]) -> np.ndarray:
+    temps = np.asarray(panel["temperature_f"], dtype=np.float64)
+    hours = np.asarray(panel["hour"], dtype=np.int64)
+    weekdays = np.asarray(panel["weekday"], dtype=np.int64)
+    loads = np.asarray(panel["load_mw"], dtype=np.float64)
+    n = len(loads)
+    x = np.zeros((n, MULTI_FEATURE_COUNT), dtype=np.float64)
+    idx = np.arange(n)
+    x[:, 0] = 1.0
+    x[:, 1] = np.clip(DEGREE_HOUR_BASE_F - temps, 0.0, None)
+    x[:, 2] = np.clip(temps - DEGREE_HOUR_BASE_F, 0.0, None)
+    x[idx[hours > 0], 2 + hours[hours > 0]] = 1.0
+    x[idx[weekdays > 0], 25 + weekdays[weekdays > 0]] = 1.0
+    x[24:, 32] = loads[:-24] / 1000.0
+    return x
+
+
+def _weather_multi_forecasts_numpy(
+    panel: dict[str, list[float]],
+    start: int,
+    fallback: list[float],
+    window: int = 0,
+    state: dict[str, Any] | None = None,
+) -> list[float]:
+    x = _multi_feature_matrix_numpy(panel)
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    if state is None:
+        state = _rls_state(MULTI_FEATURE_COUNT, MULTI_RIDGE)
+    pretrain = state["n"] == 0
+    p = np.asarray(state["p"], dtype=np.float64)
+    theta = np.asarray(state["theta"], dtype=np.float64)
+    seen = int(state["n"])
+
+    def _update(xi: np.ndarray, yi: float, sign: float = 1.0) -> None:
+        nonlocal p, theta, seen
+        px = p @ xi
+        k = px / (1.0 + sign * (xi @ px))
+        theta = theta + sign * k * (yi - xi @ theta)
+        p = p - sign * np.outer(k, px)
+        seen += int(sign)
+
+    if pretrain:
+        for j in range(max(24, start - window) if window else 24, start):
+            _update(x[j], y[j])
+
+    out = np.empty(len(y) - start)
+    for i in range(start, len(y)):
+        out[i - start] = (x[i] @ theta) if seen >= MULTI_FEATURE_COUNT else fallback[i - start]
+        _update(x[i], y[i])
+        if window and i - window >= 24:
+            _update(x[i - window], y[i - window], sign=-1.0)
+    # Persist in the same plain-list layout as the pure-Python RLS state.
+    state.update({"n": seen, "theta": theta.tolist(), "p": p.tolist()})
+    return out.tolist()
+
+
 def _rmse(actual: list[float], pred: list[float]) -> float:
     if not actual:
         return 0.0
@@ -46,14 +293,1087 @@ def _mape(actual: list[float], pred: list[float]) -> float:
     return sum(abs((a - p) / a) for a, p in pairs) / len(pairs)
 
 
+def _ape(actual: float, pred: float) -> float:
+    return abs((actual - pred) / actual) if actual else 0.0
+
+
+def _panel_columns(rows: list[dict[str, str]]) -> dict[str, list[float]]:
+    cols: dict[str, list[float]] = {field: [] for field in PANEL_FIELDS}
+    for r in rows:
+        ts = r["timestamp_utc"]
+        cols["load_mw"].append(float(r["load_mw"]))
+        cols["temperature_f"].append(float(r["temperature_f"]))
+        cols["hour"].append(float(ts[11:13]))
+        cols["weekday"].append(float(date(int(ts[0:4]), int(ts[5:7]), int(ts[8:10])).weekday()))
+        cols["month"].append(float(ts[5:7]))
+    return cols
+
+
+def _naive_model(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    loads = panel["load_mw"]
+    return list(loads[start - 24 : len(loads) - 24])
+
+
+def _naive_model_numpy(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    return y[start - 24 : len(y) - 24].tolist()
+
+
+def _naive_weekly_model(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    # Same hour last week; the first week falls back to the same hour yesterday.
+    loads = panel["load_mw"]
+    return [loads[i - 168] if i >= 168 else loads[i - 24] for i in range(start, len(loads))]
+
+
+def _naive_weekly_model_numpy(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    idx = np.arange(start, len(y))
+    return y[np.where(idx >= 168, idx - 168, idx - 24)].tolist()
+
+
+def _profile_state() -> dict[str, list[float]]:
+    return {"sums": [0.0] * 24, "counts": [0.0] * 24}
+
+
+def _hour_profile_model(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    # Mean load for the same hour of day over the training history; unseen hours fall back to yesterday.
+    loads = panel["load_mw"]
+    hours = [int(h) for h in panel["hour"]]
+    state = {} if state is None else state
+    profile = state.setdefault("profile", _profile_state())
+    sums = profile["sums"]
+    counts = profile["counts"]
+    if not any(counts):
+        for j in range(max(0, start - window) if window else 0, start):
+            sums[hours[j]] += loads[j]
+            counts[hours[j]] += 1
+    out: list[float] = []
+    for i in range(start, len(loads)):
+        h = hours[i]
+        out.append(sums[h] / counts[h] if counts[h] else loads[i - 24])
+        sums[h] += loads[i]
+        counts[h] += 1
+        if window and i - window >= 0:
+            sums[hours[i - window]] -= loads[i - window]
+            counts[hours[i - window]] -= 1
+    return out
+
+
+def _hour_profile_model_numpy(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    hours = np.asarray(panel["hour"], dtype=np.int64)
+    state = {} if state is None else state
+    profile = state.setdefault("profile", _profile_state())
+    # Only hours from the first one any test hour can train on are accumulated; an expanding
+    # history carries everything earlier in the running per-hour totals.
+    base = max(0, start - window) if window else start
+    yb = y[base:]
+    hb = hours[base:]
+    onehot = hb[:, None] == np.arange(24)[None, :]
+    vals = np.where(onehot, yb[:, None], 0.0)
+    # Inclusive cumulative sums per hour bucket with a leading zero row: row k totals the first k hours.
+    sums = np.concatenate((np.zeros((1, 24)), np.cumsum(vals, axis=0)))
+    counts = np.concatenate((np.zeros((1, 24)), np.cumsum(onehot, axis=0)))
+    if not window:
+        if not any(profile["counts"]):
+            profile["sums"] = np.bincount(hours[:start], weights=y[:start], minlength=24).tolist()
+            profile["counts"] = np.bincount(hours[:start], minlength=24).astype(np.float64).tolist()
+        sums += np.asarray(profile["sums"])[None, :]
+        counts += np.asarray(profile["counts"])[None, :]
+    rel = np.arange(start, len(y)) - base
+    h = hb[rel]
+    s = sums[rel, h]
+    c = counts[rel, h]
+    if window:
+        lo = np.maximum(rel - window, 0)
+        s = s - sums[lo, h]
+        c = c - counts[lo, h]
+        tail_h = hours[max(0, len(y) - window) :]
+        profile["sums"] = np.bincount(tail_h, weights=y[max(0, len(y) - window) :], minlength=24).tolist()
+        profile["counts"] = np.bincount(tail_h, minlength=24).astype(np.float64).tolist()
+    else:
+        profile["sums"] = sums[-1].tolist()
+        profile["counts"] = counts[-1].tolist()
+    return np.where(c > 0, s / np.maximum(c, 1), y[start - 24 : len(y) - 24]).tolist()
+
+
+def _weather_linear_model(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    state = {} if state is None else state
+    stats = state.setdefault("stats", _fit_stats())
+    return _weather_linear_forecasts(list(panel["temperature_f"]), list(panel["load_mw"]), start, window, stats)
+
+
+def _fit_stats_numpy(x: np.ndarray, y: np.ndarray) -> dict[str, float]:
+    # Same fields as the Welford state, computed in two passes over the block.
+    if not x.size:
+        return _fit_stats()
+    x_mean = float(x.mean())
+    y_mean = float(y.mean())
+    dx = x - x_mean
+    return {
+        "n": float(x.size),
+        "x_mean": x_mean,
+        "y_mean": y_mean,
+        "sxx": float(dx @ dx),
+        "sxy": float(dx @ (y - y_mean)),
+    }
+
+
+def _weather_linear_model_numpy(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    """Vectorized ``_weather_linear_forecasts`` built from cumulative sums.
+
+    Values are shifted by a reference observation before accumulating so the raw power
+    sums stay small and the centered co-moments do not cancel catastrophically. An
+    expanding history merges the running fit before ``start`` with the new hours using
+    the pairwise co-moment update, so earlier hours are never re-read.
+    """
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    x = np.asarray(panel["temperature_f"], dtype=np.float64)
+    state = {} if state is None else state
+    n_total = len(y)
+
+    if window:
+        # Training window for test hour i is [lo, i) with lo = i - window; prefix sums with a
+        # leading zero give any such window as a difference of two entries.
+        base = max(0, start - window)
+        xs = x[base:] - x[base]
+        ys = y[base:] - y[base]
+        rel = np.arange(start, n_total) - base
+        lo = np.maximum(rel - window, 0)
+
+        def _prefix(v: np.ndarray) -> np.ndarray:
+            cs = np.concatenate(([0.0], np.cumsum(v)))
+            return cs[rel] - cs[lo]
+
+        n = (rel - lo).astype(np.float64)
+        sx = _prefix(xs)
+        sy = _prefix(ys)
+        sxx = _prefix(xs * xs) - (sx * sx) / n
+        sxy = _prefix(xs * ys) - (sx * sy) / n
+        x_mean = x[base] + sx / n
+        y_mean = y[base] + sy / n
+        tail = max(0, n_total - window)
+        state["stats"] = _fit_stats_numpy(x[tail:], y[tail:])
+    else:
+        prior = state.get("stats") or _fit_stats()
+        if prior["n"] == 0:
+            prior = _fit_stats_numpy(x[:start], y[:start])
+        xb = x[start:]
+        yb = y[start:]
+        if not xb.size:
+            state["stats"] = prior
+            return []
+        # Row k of each prefix covers the first k new hours.
+        xs = xb - xb[0]
+        ys = yb - yb[0]
+
+        def _prefix(v: np.ndarray) -> np.ndarray:
+            return np.concatenate(([0.0], np.cumsum(v)))
+
+        k = np.arange(xb.size + 1, dtype=np.float64)
+        kk = np.maximum(k, 1.0)
+        sx = _prefix(xs)
+        sy = _prefix(ys)
+        mean_x = np.where(k > 0, xb[0] + sx / kk, prior["x_mean"])
+        mean_y = np.where(k > 0, yb[0] + sy / kk, prior["y_mean"])
+        n = prior["n"] + k
+        dx = mean_x - prior["x_mean"]
+        dy = mean_y - prior["y_mean"]
+        scale = prior["n"] * k / n
+        sxx = prior["sxx"] + (_prefix(xs * xs) - sx * sx / kk) + dx * dx * scale
+        sxy = prior["sxy"] + (_prefix(xs * ys) - sx * sy / kk) + dx * dy * scale
+        x_mean = prior["x_mean"] + dx * k / n
+        y_mean = prior["y_mean"] + dy * k / n
+        state["stats"] = {
+            "n": float(n[-1]),
+            "x_mean": float(x_mean[-1]),
+            "y_mean": float(y_mean[-1]),
+            "sxx": float(sxx[-1]),
+            "sxy": float(sxy[-1]),
+        }
+        sxx, sxy, x_mean, y_mean = sxx[:-1], sxy[:-1], x_mean[:-1], y_mean[:-1]
+
+    b = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+    return ((y_mean - b * x_mean) + b * x[start:]).tolist()
+
+
+def _weather_multi_model(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    state = {} if state is None else state
+    fallback = _weather_linear_model(panel, start, window, state.setdefault("fallback", {}))
+    rls = state.setdefault("rls", _rls_state(MULTI_FEATURE_COUNT, MULTI_RIDGE))
+    return _weather_multi_forecasts(panel, start, fallback=fallback, window=window, state=rls)
+
+
+def _weather_multi_model_numpy(
+    panel: dict[str, list[float]], start: int, window: int = 0, state: dict[str, Any] | None = None
+) -> list[float]:
+    state = {} if state is None else state
+    fallback = _weather_linear_model_numpy(panel, start, window, state.setdefault("fallback", {}))
+    rls = state.setdefault("rls", _rls_state(MULTI_FEATURE_COUNT, MULTI_RIDGE))
+    return _weather_multi_forecasts_numpy(panel, start, fallback=fallback, window=window, state=rls)
+
+
+# Model name -> column/metric prefix and engine implementations. Each implementation maps
+# (panel columns, first test hour, training window hours or 0 for expanding, state dict) to
+# one-step-ahead forecasts for hours start..n-1. The state dict holds the model's fitted
+# statistics as plain JSON-friendly values: an empty dict trains on the hours before ``start``,
+# and on return it holds the fit through hour n-1, so a later call can resume from there.
+MODELS: dict[str, dict[str, Any]] = {
+    "naive_24h": {"prefix": "naive", "python": _naive_model, "numpy": _naive_model_numpy},
+    "weather_linear": {"prefix": "weather", "python": _weather_linear_model, "numpy": _weather_linear_model_numpy},
+    "weather_multi": {"prefix": "multi", "python": _weather_multi_model, "numpy": _weather_multi_model_numpy},
+    "naive_168h": {"prefix": "weekly", "python": _naive_weekly_model, "numpy": _naive_weekly_model_numpy},
+    "hour_profile": {"prefix": "profile", "python": _hour_profile_model, "numpy": _hour_profile_model_numpy},
+}
+
+
+def _backtest_columns(models: list[str]) -> list[str]:
+    prefixes = [MODELS[m]["prefix"] for m in models] + ["ensemble"]
+    return (
+        ["timestamp_utc", "actual_load_mw"]
+        + [f"{p}_forecast_mw" for p in prefixes]
+        + [f"{p}_abs_pct_error" for p in prefixes]
+        + [f"ensemble_p{round(q * 100)}_mw" for q in QUANTILES]
+    )
+
+
+def metric_names(models: list[str]) -> list[str]:
+    """Rows the forecast metrics mart always holds for ``models``, their ensemble included."""
+    prefixes = [MODELS[m]["prefix"] for m in models] + ["ensemble"]
+    return [f"{p}_rmse_mw" for p in prefixes] + [f"{p}_mape" for p in prefixes] + ["best_model", "pinball_loss_mean"]
+
+
+def _quantile_forecasts(
+    actual: list[float], point: list[float], sketches: list[dict[str, Any]] | None = None
+) -> tuple[dict[float, list[float]], list[float]]:
+    """Quantile bands around ``point`` from streaming P-square sketches of past residuals.
+
+    Each hour reads the current residual quantiles (O(1)), then folds in its own residual,
+    so the full residual history is never stored or sorted. Passed-in ``sketches`` (one per
+    entry of ``QUANTILES``) carry earlier residuals and are updated in place.
+    """
+    if sketches is None:
+        sketches = [p2_init(q) for q in QUANTILES]
+    bands: dict[float, list[float]] = {q: [] for q in QUANTILES}
+    for a, p in zip(actual, point, strict=True):
+        # Independent marker sets can cross by a hair; sorting keeps the bands ordered.
+        offsets = sorted(p2_value(sk) for sk in sketches)
+        for q, off in zip(QUANTILES, offsets, strict=True):
+            bands[q].append(p + off)
+        for sk in sketches:
+            p2_update(sk, a - p)
+    return bands, sorted(p2_value(sk) for sk in sketches)
+
+
+def _model_worker(
+    shm_name: str, model: str, slot: int, n: int, start: int, engine: str, window: int, state: dict[str, Any]
+) -> dict[str, Any]:
+    """Process-pool entry point: read the panel from shared memory, write forecasts back into it.
+
+    The model's (small) fitted state travels by pickle and comes back as the return value.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    m = n - start
+    base = len(PANEL_FIELDS) * n
+    try:
+        # Copy the columns out and release each view at once: a model that raises must not
+        # leave views on the block, or close() fails with BufferError and hides its traceback.
+        with shm.buf[: 8 * base].cast("d") as src:
+            cols = np.array(src, dtype=np.float64) if engine == "numpy" else src.tolist()
+        panel = {field: cols[k * n : (k + 1) * n] for k, field in enumerate(PANEL_FIELDS)}
+        forecasts = MODELS[model][engine](panel, start, window, state)
+        with shm.buf[8 * (base + slot * m) : 8 * (base + (slot + 1) * m)].cast("d") as out:
+            out[:] = array("d", forecasts)
+    finally:
+        shm.close()
+    return state
+
+
+def _run_models(
+    panel: dict[str, list[float]],
+    models: list[str],
+    start: int,
+    engine: str,
+    workers: int,
+    window: int,
+    states: dict[str, dict[str, Any]],
+) -> dict[str, list[float]]:
+    """Backtest every model, in-process or concurrently across a process pool.
+
+    Parallel runs place the panel columns in one shared-memory float64 buffer followed by an
+    output slot per model, so workers neither unpickle the panel nor pickle forecasts back.
+    ``states`` maps each model to its fitted state and is updated in place.
+    """
+    if workers <= 1 or len(models) <= 1:
+        return {model: MODELS[model][engine](panel, start, window, states.setdefault(model, {})) for model in models}
+
+    n = len(panel["load_mw"])
+    m = n - start
+    base = len(PANEL_FIELDS) * n
+    size = 8 * (base + len(models) * m)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        # The view is released on every exit, so a failing worker's error is not masked by close().
+        with shm.buf[:size].cast("d") as view:
+            for k, field in enumerate(PANEL_FIELDS):
+                view[k * n : (k + 1) * n] = array("d", panel[field])
+            with ProcessPoolExecutor(max_workers=min(workers, len(models))) as pool:
+                futures = {
+                    model: pool.submit(
+                        _model_worker, shm.name, model, slot, n, start, engine, window, states.get(model, {})
+                    )
+                    for slot, model in enumerate(models)
+                }
+                for model, fut in futures.items():
+                    states[model] = fut.result()
+            out = {model: view[base + slot * m : base + (slot + 1) * m].tolist() for slot, model in enumerate(models)}
+    finally:
+        shm.close()
+        shm.unlink()
+    return out
+
+
+def _ensemble_weights(sse: list[float]) -> list[float]:
+    # Inverse-MSE weights; models with zero error so far share all the weight.
+    exact = [1.0 if s == 0 else 0.0 for s in sse]
+    if any(exact):
+        return [e / sum(exact) for e in exact]
+    inv = [1.0 / s for s in sse]
+    total = sum(inv)
+    return [v / total for v in inv]
+
+
+def _ensemble_forecasts(
+    actual: list[float], preds: list[list[float]], sse: list[float] | None = None
+) -> tuple[list[float], list[float]]:
+    """Inverse-MSE weighted combination using only errors observed before each hour.
+
+    ``sse`` carries each model's squared-error total from earlier hours and is updated in place.
+    """
+    if sse is None:
+        sse = [0.0] * len(preds)
+    out: list[float] = []
+    for t, a in enumerate(actual):
+        w = _ensemble_weights(sse)
+        out.append(sum(wj * p[t] for wj, p in zip(w, preds, strict=True)))
+        for j, p in enumerate(preds):
+            sse[j] += (a - p[t]) ** 2
+    return out, _ensemble_weights(sse)
+
+
+def _ensemble_forecasts_numpy(
+    actual: list[float], preds: list[list[float]], sse: list[float] | None = None
+) -> tuple[list[float], list[float]]:
+    if sse is None:
+        sse = [0.0] * len(preds)
+    a = np.asarray(actual, dtype=np.float64)
+    p = np.asarray(preds, dtype=np.float64).reshape(len(preds), a.size)
+    sq = (p - a[None, :]) ** 2
+    cum = np.asarray(sse, dtype=np.float64)[:, None] + np.cumsum(sq, axis=1)
+    prior = cum - sq
+    exact = prior == 0
+    any_exact = exact.any(axis=0)
+    inv = np.where(any_exact[None, :], exact.astype(np.float64), 1.0 / np.where(exact, 1.0, prior))
+    w = inv / inv.sum(axis=0, keepdims=True)
+    if a.size:
+        sse[:] = cum[:, -1].tolist()
+    return (w * p).sum(axis=0).tolist(), _ensemble_weights(sse)
+
+
+def _score_state(prefixes: list[str]) -> dict[str, Any]:
+    # Running error totals behind every metric, so scores extend to appended hours without
+    # re-reading earlier ones.
+    return {
+        "errors": {prefix: {"n": 0, "sse": 0.0, "ape_sum": 0.0, "ape_n": 0} for prefix in prefixes},
+        "pinball_sum": {f"p{round(q * 100)}": 0.0 for q in QUANTILES},
+        "covered": 0,
+        "n": 0,
+        # dimension -> segment key -> prefix -> [hours, sse, ape_sum, ape_hours]
+        "segments": {dim: {} for dim in SEGMENT_DIMENSIONS},
+    }
+
+
+def _score_add(acc: dict[str, Any], actual: list[float], pred: list[float]) -> None:
+    for a, p in zip(actual, pred, strict=True):
+        acc["sse"] += (a - p) ** 2
+        if a != 0:
+            acc["ape_sum"] += abs((a - p) / a)
+            acc["ape_n"] += 1
+    acc["n"] += len(actual)
+
+
+def _score_add_numpy(acc: dict[str, Any], actual: list[float], pred: list[float]) -> None:
+    a = np.asarray(actual, dtype=np.float64)
+    p = np.asarray(pred, dtype=np.float64)
+    nonzero = a != 0
+    acc["sse"] += float(np.sum((a - p) ** 2))
+    acc["ape_sum"] += float(np.sum(np.abs((a[nonzero] - p[nonzero]) / a[nonzero])))
+    acc["ape_n"] += int(nonzero.sum())
+    acc["n"] += int(a.size)
+
+
+def _segment_keys(panel: dict[str, list[float]], i: int, band_f: float) -> tuple[str, str, str]:
+    return (
+        str(int(panel["hour"][i])),
+        str(int(panel["month"][i])),
+        f"{math.floor(panel['temperature_f'][i] / band_f) * band_f:g}",
+    )
+
+
+def _segment_add(
+    segments: dict[str, dict[str, Any]],
+    panel: dict[str, list[float]],
+    start: int,
+    series: dict[str, list[float]],
+    prefixes: list[str],
+    band_f: float,
+) -> None:
+    """Fold hours ``start..`` into per-segment error totals in one pass over the rows.
+
+    Rows accumulate into joint (hour, month, band) cells, a few thousand at most, which are
+    rolled up into each dimension once at the end instead of three updates per row.
+    """
+    actual = series["actual"]
+    preds = [series[p] for p in prefixes]
+    joint: dict[tuple[str, str, str], list[list[float]]] = {}
+    for k, a in enumerate(actual):
+        key = _segment_keys(panel, start + k, band_f)
+        cell = joint.get(key)
+        if cell is None:
+            cell = joint[key] = [[0, 0.0, 0.0, 0] for _ in prefixes]
+        for acc, pred in zip(cell, preds, strict=True):
+            err = a - pred[k]
+            acc[0] += 1
+            acc[1] += err * err
+            if a:
+                acc[2] += abs(err / a)
+                acc[3] += 1
+    for key, cell in joint.items():
+        for dim, seg in zip(SEGMENT_DIMENSIONS, key, strict=True):
+            entry = segments[dim].setdefault(seg, {p: [0, 0.0, 0.0, 0] for p in prefixes})
+            for p, acc in zip(prefixes, cell, strict=True):
+                total = entry[p]
+                for j in range(4):
+                    total[j] += acc[j]
+
+
+def _segment_add_numpy(
+    segments: dict[str, dict[str, Any]],
+    panel: dict[str, list[float]],
+    start: int,
+    series: dict[str, list[float]],
+    prefixes: list[str],
+    band_f: float,
+) -> None:
+    a = np.asarray(series["actual"], dtype=np.float64)
+    if not a.size:
+        return
+    err = np.asarray([series[p] for p in prefixes], dtype=np.float64) - a[None, :]
+    nonzero = a != 0
+    stats = np.stack(
+        (
+            np.ones_like(err),
+            err * err,
+            np.abs(np.divide(err, a, out=np.zeros_like(err), where=nonzero)),
+            np.broadcast_to(nonzero, err.shape).astype(np.float64),
+        )
+    )
+    temps = np.asarray(panel["temperature_f"], dtype=np.float64)[start:]
+    dim_keys = (
+        np.asarray(panel["hour"], dtype=np.float64)[start:],
+        np.asarray(panel["month"], dtype=np.float64)[start:],
+        np.floor(temps / band_f) * band_f,
+    )
+    for dim, keys in zip(SEGMENT_DIMENSIONS, dim_keys, strict=True):
+        labels, inv = np.unique(keys, return_inverse=True)
+        g = len(labels)
+        # One bincount per statistic over (prefix, segment) cells of the whole batch.
+        cell = (inv[None, :] + g * np.arange(len(prefixes))[:, None]).ravel()
+        totals = np.stack([np.bincount(cell, weights=st.ravel(), minlength=g * len(prefixes)) for st in stats])
+        totals = totals.reshape(4, len(prefixes), g)
+        group = segments[dim]
+        for j, label in enumerate(labels):
+            key = str(int(label)) if dim != "temperature_band" else f"{label:g}"
+            entry = group.setdefault(key, {p: [0, 0.0, 0.0, 0] for p in prefixes})
+            for pi, p in enumerate(prefixes):
+                acc = entry[p]
+                acc[0] += int(totals[0, pi, j])
+                acc[1] += float(totals[1, pi, j])
+                acc[2] += float(totals[2, pi, j])
+                acc[3] += int(totals[3, pi, j])
+
+
+def _segment_rows(segments: dict[str, dict[str, Any]], prefixes: list[str], band_f: float) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for dim in SEGMENT_DIMENSIONS:
+        for key in sorted(segments[dim], key=float):
+            label = f"{key}-{float(key) + band_f:g}F" if dim == "temperature_band" else key
+            for p in prefixes:
+                n, sse, ape_sum, ape_n = segments[dim][key][p]
+                out.append(
+                    {
+                        "dimension": dim,
+                        "segment": label,
+                        "prefix": p,
+                        "hours": n,
+                        "rmse": math.sqrt(sse / n) if n else 0.0,
+                        "mape": ape_sum / ape_n if ape_n else 0.0,
+                    }
+                )
+    return out
+
+
+def _best_model(metrics: dict[str, float], candidates: list[str]) -> str:
+    return min(candidates, key=lambda prefix: metrics[f"{prefix}_rmse"])
+
+
+def run_backtest(
+    panel: dict[str, list[float]],
+    start: int = 24,
+    engine: str = "auto",
+    models: list[str] | None = None,
+    workers: int = 1,
+    window: int = 0,
+    state: dict[str, Any] | None = None,
+    temperature_band_f: float = 10.0,
+) -> dict[str, Any]:
+    """Backtest ``models`` (default: all registered), add their ensemble, and score everything.
+
+    ``window`` > 0 trains each model on only the last ``window`` hours before every test hour.
+    Errors are also broken down by hour of day, month and ``temperature_band_f``-wide bands.
+    Passing the ``state`` of an earlier result for a prefix of ``panel`` resumes at the first
+    hour it has not seen: ``series`` then covers only the new hours while ``metrics`` cover all.
+    """
+    engine = resolve_engine(engine, "forecast")
+    models = list(models or DEFAULT_MODELS)
+    unknown = [m for m in models if m not in MODELS]
+    if unknown:
+        raise SystemExit(f"Unsupported forecast.models entries: {unknown}; expected {sorted(MODELS)}")
+    prefixes = [MODELS[m]["prefix"] for m in models] + ["ensemble"]
+    if state is None:
+        state = {
+            "next_hour": start,
+            "models": {},
+            "ensemble_sse": [0.0] * len(models),
+            "sketches": [p2_init(q) for q in QUANTILES],
+            "scores": _score_state(prefixes),
+        }
+    else:
+        state = copy.deepcopy(state)
+        start = int(state["next_hour"])
+
+    forecasts = _run_models(
+        panel, models, start, engine, resolve_workers(workers, len(models)), window, state["models"]
+    )
+    actual = list(panel["load_mw"][start:])
+    series: dict[str, list[float]] = {"actual": actual}
+    for model in models:
+        series[MODELS[model]["prefix"]] = forecasts[model]
+    ensemble_fn = _ensemble_forecasts_numpy if engine == "numpy" else _ensemble_forecasts
+    series["ensemble"], weights = ensemble_fn(actual, [forecasts[m] for m in models], state["ensemble_sse"])
+
+    scores = state["scores"]
+    score_fn = _score_add_numpy if engine == "numpy" else _score_add
+    metrics: dict[str, float] = {}
+    for prefix in prefixes:
+        pred = series[prefix]
+        series[f"{prefix}_ape"] = [_ape(a, p) for a, p in zip(actual, pred, strict=True)]
+        acc = scores["errors"][prefix]
+        score_fn(acc, actual, pred)
+        metrics[f"{prefix}_rmse"] = math.sqrt(acc["sse"] / acc["n"]) if acc["n"] else 0.0
+        metrics[f"{prefix}_mape"] = acc["ape_sum"] / acc["ape_n"] if acc["ape_n"] else 0.0
+
+    bands, residual_quantiles = _quantile_forecasts(actual, series["ensemble"], state["sketches"])
+    scores["n"] += len(actual)
+    for q in QUANTILES:
+        key = f"p{round(q * 100)}"
+        series[key] = bands[q]
+        for a, p in zip(actual, bands[q], strict=True):
+            scores["pinball_sum"][key] += pinball_loss(a, p, q)
+        metrics[f"pinball_loss_{key}"] = scores["pinball_sum"][key] / scores["n"] if scores["n"] else 0.0
+    metrics["pinball_loss_mean"] = sum(metrics[f"pinball_loss_p{round(q * 100)}"] for q in QUANTILES) / len(QUANTILES)
+    scores["covered"] += sum(
+        1 for a, lo, hi in zip(actual, bands[QUANTILES[0]], bands[QUANTILES[-1]], strict=True) if lo <= a <= hi
+    )
+    metrics["p10_p90_coverage"] = scores["covered"] / scores["n"] if scores["n"] else 0.0
+    segment_fn = _segment_add_numpy if engine == "numpy" else _segment_add
+    segment_fn(scores["segments"], panel, start, series, prefixes, temperature_band_f)
+    state["next_hour"] = len(panel["load_mw"])
+
+    # Tie-break order: weather_linear ahead of naive_24h as before, then registry order.
+    ranked = sorted(prefixes, key=lambda p: (p != "weather", p != "naive"))
+    best_prefix = _best_model(metrics, ranked)
+    prefix_to_model = {MODELS[m]["prefix"]: m for m in models}
+    return {
+        "engine": engine,
+        "models": models,
+        "window": window,
+        "start": start,
+        "series": series,
+        "metrics": metrics,
+        "ensemble_weights": dict(zip(models, weights, strict=True)),
+        "residual_quantiles": dict(zip(QUANTILES, residual_quantiles, strict=True)),
+        "best_model": prefix_to_model.get(best_prefix, best_prefix),
+        "segments": _segment_rows(scores["segments"], prefixes, temperature_band_f),
+        "state": state,
+    }
+
+
+def _day_ahead_issues(hours: list[float], n: int, issue_hour: int, start: int = 24) -> list[int]:
+    # Issue rows are every 24 hours from the first ``issue_hour`` row at or after ``start`` whose
+    # 24 target hours all fall inside the panel.
+    first = next((i for i in range(start, n) if int(hours[i]) == issue_hour), n)
+    return list(range(first, n - 23, 24))
+
+
+def _day_ahead_naive(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: list[float]
+) -> list[list[float]]:
+    loads = panel["load_mw"]
+    return [[loads[t + h - 24] for h in range(24)] for t in issues]
+
+
+def _day_ahead_weekly(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: list[float]
+) -> list[list[float]]:
+    loads = panel["load_mw"]
+    return [[loads[t + h - 168] if t + h >= 168 else loads[t + h - 24] for h in range(24)] for t in issues]
+
+
+def _day_ahead_profile(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: list[float]
+) -> list[list[float]]:
+    loads = panel["load_mw"]
+    hours = [int(h) for h in panel["hour"]]
+    sums = [0.0] * 24
+    counts = [0.0] * 24
+    out: list[list[float]] = []
+    j = 0
+    for t in issues:
+        while j < t:
+            sums[hours[j]] += loads[j]
+            counts[hours[j]] += 1
+            if window and j - window >= 0:
+                sums[hours[j - window]] -= loads[j - window]
+                counts[hours[j - window]] -= 1
+            j += 1
+        out.append([sums[hours[i]] / counts[hours[i]] if counts[hours[i]] else loads[i - 24] for i in range(t, t + 24)])
+    return out
+
+
+def _day_ahead_weather(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: list[float]
+) -> list[list[float]]:
+    loads = panel["load_mw"]
+    temp_obs = panel["temperature_f"]
+    stats = _fit_stats()
+    out: list[list[float]] = []
+    j = 0
+    for t in issues:
+        while j < t:
+            _fit_add(stats, temp_obs[j], loads[j])
+            if window and j - window >= 0:
+                _fit_remove(stats, temp_obs[j - window], loads[j - window])
+            j += 1
+        a, b = _fit_coefficients(stats)
+        out.append([a + b * temps[i] for i in range(t, t + 24)])
+    return out
+
+
+def _day_ahead_multi(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: list[float]
+) -> list[list[float]]:
+    loads = panel["load_mw"]
+    hours = panel["hour"]
+    weekdays = panel["weekday"]
+    fallback = _day_ahead_weather(panel, issues, window, temps)
+    state = _rls_state(MULTI_FEATURE_COUNT, MULTI_RIDGE)
+
+    def _row(i: int, temp: float) -> list[tuple[int, float]]:
+        return _multi_feature_row(temp, int(hours[i]), int(weekdays[i]), loads[i - 24])
+
+    out: list[list[float]] = []
+    j = 24
+    for d, t in enumerate(issues):
+        while j < t:
+            _rls_update(state, _row(j, panel["temperature_f"][j]), loads[j])
+            if window and j - window >= 24:
+                _rls_update(state, _row(j - window, panel["temperature_f"][j - window]), loads[j - window], sign=-1.0)
+            j += 1
+        if state["n"] >= MULTI_FEATURE_COUNT:
+            out.append([sum(state["theta"][c] * v for c, v in _row(i, temps[i])) for i in range(t, t + 24)])
+        else:
+            out.append(fallback[d])
+    return out
+
+
+def _day_ahead_targets_numpy(issues: list[int]) -> np.ndarray:
+    return np.asarray(issues, dtype=np.int64)[:, None] + np.arange(24)[None, :]
+
+
+def _issue_blocks_numpy(values: np.ndarray, issues: list[int]) -> tuple[np.ndarray, int]:
+    """Rows before the last issue as 24-hour blocks that end exactly on issue rows.
+
+    Issues are 24 rows apart, so front-padding with zero rows aligns every issue on a block
+    boundary; per-block totals then give any issue's training sums by prefix differences.
+    """
+    pad = -issues[0] % 24
+    head = np.zeros((pad,) + values.shape[1:])
+    return np.concatenate((head, values[: issues[-1]])).reshape((-1, 24) + values.shape[1:]), pad
+
+
+def _issue_sums_numpy(block_sums: np.ndarray, issues: list[int], pad: int, window: int) -> np.ndarray:
+    # Totals over each issue's training rows [t - window, t) (or [0, t)) from per-block totals.
+    cs = np.concatenate((np.zeros((1,) + block_sums.shape[1:]), np.cumsum(block_sums, axis=0)))
+    b = (np.asarray(issues, dtype=np.int64) + pad) // 24
+    lo = np.maximum(b - window // 24, 0) if window else np.zeros_like(b)
+    return cs[b] - cs[lo]
+
+
+def _day_ahead_naive_numpy(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: np.ndarray
+) -> np.ndarray:
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    return y[_day_ahead_targets_numpy(issues) - 24]
+
+
+def _day_ahead_weekly_numpy(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: np.ndarray
+) -> np.ndarray:
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    tgt = _day_ahead_targets_numpy(issues)
+    return y[np.where(tgt >= 168, tgt - 168, tgt - 24)]
+
+
+def _day_ahead_profile_numpy(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: np.ndarray
+) -> np.ndarray:
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    hours = np.asarray(panel["hour"], dtype=np.int64)
+    onehot = (hours[:, None] == np.arange(24)[None, :]).astype(np.float64)
+    blocks, pad = _issue_blocks_numpy(np.concatenate((onehot * y[:, None], onehot), axis=1), issues)
+    totals = _issue_sums_numpy(blocks.sum(axis=1), issues, pad, window)
+    tgt = _day_ahead_targets_numpy(issues)
+    s = np.take_along_axis(totals[:, :24], hours[tgt], axis=1)
+    c = np.take_along_axis(totals[:, 24:], hours[tgt], axis=1)
+    return np.where(c > 0, s / np.maximum(c, 1.0), y[tgt - 24])
+
+
+def _day_ahead_weather_numpy(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: np.ndarray
+) -> np.ndarray:
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    x = np.asarray(panel["temperature_f"], dtype=np.float64)
+    # Shifted by the first observation so raw power sums stay small (see _weather_linear_model_numpy).
+    xs = x - x[0]
+    ys = y - y[0]
+    blocks, pad = _issue_blocks_numpy(np.stack((np.ones_like(xs), xs, ys, xs * xs, xs * ys), axis=1), issues)
+    n, sx, sy, sxx, sxy = _issue_sums_numpy(blocks.sum(axis=1), issues, pad, window).T
+    n = np.maximum(n, 1.0)
+    sxx = sxx - sx * sx / n
+    sxy = sxy - sx * sy / n
+    b = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+    a = y[0] + sy / n - b * (x[0] + sx / n)
+    return a[:, None] + b[:, None] * temps[_day_ahead_targets_numpy(issues)]
+
+
+def _day_ahead_multi_numpy(
+    panel: dict[str, list[float]], issues: list[int], window: int, temps: np.ndarray
+) -> np.ndarray:
+    """Ridge fits for every issue from one batched solve of per-issue normal equations.
+
+    Equivalent to snapshotting the recursive least-squares state at each issue: both give
+    (X'X + ridge*I)^-1 X'y over that issue's training rows.
+    """
+    y = np.asarray(panel["load_mw"], dtype=np.float64)
+    x = _multi_feature_matrix_numpy(panel)
+    trainable = (np.arange(len(y)) >= 24).astype(np.float64)
+    xb, pad = _issue_blocks_numpy(x * trainable[:, None], issues)
+    yb, _ = _issue_blocks_numpy(y * trainable, issues)
+    cb, _ = _issue_blocks_numpy(trainable, issues)
+    gram = _issue_sums_numpy(np.einsum("bri,brj->bij", xb, xb), issues, pad, window)
+    moment = _issue_sums_numpy(np.einsum("bri,br->bi", xb, yb), issues, pad, window)
+    seen = _issue_sums_numpy(cb.sum(axis=1), issues, pad, window)
+    theta = np.linalg.solve(gram + MULTI_RIDGE * np.eye(MULTI_FEATURE_COUNT), moment[:, :, None])[:, :, 0]
+
+    fc_panel = dict(panel)
+    fc_panel["temperature_f"] = temps
+    tgt = _day_ahead_targets_numpy(issues)
+    pred = np.einsum("dhi,di->dh", _multi_feature_matrix_numpy(fc_panel)[tgt], theta)
+    fallback = _day_ahead_weather_numpy(panel, issues, window, temps)
+    return np.where((seen >= MULTI_FEATURE_COUNT)[:, None], pred, fallback)
+
+
+DAY_AHEAD_MODELS: dict[str, dict[str, Any]] = {
+    "naive_24h": {"python": _day_ahead_naive, "numpy": _day_ahead_naive_numpy},
+    "weather_linear": {"python": _day_ahead_weather, "numpy": _day_ahead_weather_numpy},
+    "weather_multi": {"python": _day_ahead_multi, "numpy": _day_ahead_multi_numpy},
+    "naive_168h": {"python": _day_ahead_weekly, "numpy": _day_ahead_weekly_numpy},
+    "hour_profile": {"python": _day_ahead_profile, "numpy": _day_ahead_profile_numpy},
+}
+
+
+def _day_ahead_ensemble(actual: list[list[float]], preds: list[list[list[float]]]) -> list[list[float]]:
+    # Each issue weights models by inverse MSE over all earlier issues; their 24 targets all
+    # precede the next issue, so every error used is observed by issue time.
+    sse = [0.0] * len(preds)
+    out: list[list[float]] = []
+    for d, day in enumerate(actual):
+        w = _ensemble_weights(sse)
+        out.append([sum(wj * p[d][h] for wj, p in zip(w, preds, strict=True)) for h in range(24)])
+        for j, p in enumerate(preds):
+            sse[j] += sum((a - f) ** 2 for a, f in zip(day, p[d], strict=True))
+    return out
+
+
+def _day_ahead_ensemble_numpy(actual: np.ndarray, preds: np.ndarray) -> np.ndarray:
+    # preds is (models, issues, 24); actual is (issues, 24).
+    sq = ((preds - actual[None, :, :]) ** 2).sum(axis=2)
+    prior = np.cumsum(sq, axis=1) - sq
+    exact = prior == 0
+    any_exact = exact.any(axis=0)
+    inv = np.where(any_exact[None, :], exact.astype(np.float64), 1.0 / np.where(exact, 1.0, prior))
+    w = inv / inv.sum(axis=0, keepdims=True)
+    return (w[:, :, None] * preds).sum(axis=0)
+
+
+def run_day_ahead_backtest(
+    panel: dict[str, list[float]],
+    issue_hour: int = 10,
+    engine: str = "auto",
+    models: list[str] | None = None,
+    window: int = 0,
+    temperature_forecast: list[float] | None = None,
+) -> dict[str, Any]:
+    """Backtest 24-hour-ahead forecasts issued once a day at ``issue_hour``.
+
+    An issue at row t uses loads observed before t and forecasts rows t..t+23 (horizons 1-24)
+    from ``temperature_forecast`` (default: observed temperature, i.e. a perfect forecast).
+    Returns per-issue (issues x 24) forecasts and RMSE/MAPE by horizon for every model.
+    """
+    engine = resolve_engine(engine, "forecast")
+    models = list(models or DEFAULT_MODELS)
+    unknown = [m for m in models if m not in DAY_AHEAD_MODELS]
+    if unknown:
+        raise SystemExit(f"Unsupported forecast.models entries: {unknown}; expected {sorted(DAY_AHEAD_MODELS)}")
+    if window % 24:
+        raise SystemExit("Day-ahead backtests need a training window in whole days")
+    loads = panel["load_mw"]
+    issues = _day_ahead_issues(panel["hour"], len(loads), issue_hour)
+    temps = list(temperature_forecast if temperature_forecast is not None else panel["temperature_f"])
+    prefixes = [MODELS[m]["prefix"] for m in models] + ["ensemble"]
+
+    if engine == "numpy" and issues:
+        tgt = _day_ahead_targets_numpy(issues)
+        actual = np.asarray(loads, dtype=np.float64)[tgt]
+        temp_arr = np.asarray(temps, dtype=np.float64)
+        stacked = np.stack([DAY_AHEAD_MODELS[m]["numpy"](panel, issues, window, temp_arr) for m in models])
+        forecasts = dict(zip(prefixes, list(stacked) + [_day_ahead_ensemble_numpy(actual, stacked)], strict=True))
+        nonzero = actual != 0
+        counts = np.maximum(nonzero.sum(axis=0), 1)
+        metrics = {}
+        for p, f in forecasts.items():
+            e = f - actual
+            rel = np.abs(np.divide(e, actual, out=np.zeros_like(e), where=nonzero))
+            metrics[p] = {"rmse": np.sqrt(np.mean(e**2, axis=0)).tolist(), "mape": (rel.sum(axis=0) / counts).tolist()}
+        series = {p: f.tolist() for p, f in forecasts.items()}
+        series["actual"] = actual.tolist()
+    else:
+        actual_rows = [[loads[t + h] for h in range(24)] for t in issues]
+        preds = [DAY_AHEAD_MODELS[m]["python"](panel, issues, window, temps) for m in models]
+        series = dict(zip(prefixes, preds + [_day_ahead_ensemble(actual_rows, preds)], strict=True))
+        metrics = {}
+        for p in prefixes:
+            by_h = [[row[h] for row in series[p]] for h in range(24)]
+            act_h = [[row[h] for row in actual_rows] for h in range(24)]
+            metrics[p] = {
+                "rmse": [_rmse(a, f) for a, f in zip(act_h, by_h, strict=True)],
+                "mape": [_mape(a, f) for a, f in zip(act_h, by_h, strict=True)],
+            }
+        series["actual"] = actual_rows
+
+    return {
+        "engine": engine,
+        "models": models,
+        "window": window,
+        "issue_hour": issue_hour,
+        "issues": issues,
+        "series": series,
+        "horizon_metrics": metrics,
+    }
+
+
+def _simulate_scenarios(base_load: float, settings: dict[str, Any], engine: str) -> dict[str, list[list[float]]]:
+    """Monte Carlo annual average/peak load paths summarized to ``SCENARIO_PERCENTILES``.
+
+    Each path draws one structural growth rate, adds independent yearly growth noise
+    (``growth_volatility``), and draws a peak-to-average ratio per year. Returns per-year
+    percentile values as ``{"avg": [[...per year] per percentile], "peak": ...}``.
+    """
+    years = int(settings["years"])
+    draws = int(settings["draws"])
+    pcts = list(SCENARIO_PERCENTILES.values())
+    vol = float(settings.get("growth_volatility", 0.0))
+    if engine == "numpy":
+        rng = np.random.default_rng(int(settings["seed"]))
+        growth = draw_numpy(settings["growth"], rng, (draws, 1)) + rng.normal(0.0, vol, (draws, years))
+        avg = base_load * np.cumprod(1.0 + growth, axis=1)
+        peak = avg * draw_numpy(settings["peak_ratio"], rng, (draws, years))
+        # One percentile pass over the stacked (avg, peak) x draws x years array.
+        bands = np.percentile(np.stack((avg, peak)), pcts, axis=1)
+        return {"avg": bands[:, 0, :].tolist(), "peak": bands[:, 1, :].tolist()}
+
+    rng_py = random.Random(int(settings["seed"]))
+    avg_by_year: list[list[float]] = [[] for _ in range(years)]
+    peak_by_year: list[list[float]] = [[] for _ in range(years)]
+    for _ in range(draws):
+        g = draw(settings["growth"], rng_py)
+        level = base_load
+        for k in range(years):
+            level *= 1.0 + g + rng_py.gauss(0.0, vol)
+            avg_by_year[k].append(level)
+            peak_by_year[k].append(level * draw(settings["peak_ratio"], rng_py))
+    for col in avg_by_year + peak_by_year:
+        col.sort()
+    return {
+        "avg": [[percentile(col, p) for col in avg_by_year] for p in pcts],
+        "peak": [[percentile(col, p) for col in peak_by_year] for p in pcts],
+    }
+
+
+def _scenario_settings(forecast_cfg: dict[str, Any]) -> dict[str, Any]:
+    settings = dict(DEFAULT_SCENARIO_SETTINGS)
+    settings.update(forecast_cfg.get("scenarios") or {})
+    return settings
+
+
+def _write_scenarios(
+    path: Path,
+    base_year_load: float,
+    start_year: int,
+    residual_band: tuple[float, float],
+    settings: dict[str, Any],
+    engine: str,
+) -> int:
+    bands = _simulate_scenarios(base_year_load, settings, engine)
+    # Hourly ensemble residual quantiles, as a share of the base level, give each projection a band.
+    rel_p10 = residual_band[0] / base_year_load if base_year_load else 0.0
+    rel_p90 = residual_band[1] / base_year_load if base_year_load else 0.0
+
+    scenario_rows: list[dict[str, str]] = []
+    for k, (scen, pct) in enumerate(SCENARIO_PERCENTILES.items()):
+        for n, (projected, peak) in enumerate(zip(bands["avg"][k], bands["peak"][k], strict=True), start=1):
+            growth = (projected / base_year_load) ** (1.0 / n) - 1.0 if base_year_load > 0 and projected > 0 else 0.0
+            scenario_rows.append(
+                {
+                    "scenario": scen,
+                    "year": str(start_year + n - 1),
+                    "avg_load_mw": f"{projected:.2f}",
+                    "peak_load_mw": f"{peak:.2f}",
+                    "annual_growth_rate": f"{growth:.4f}",
+                    "avg_load_mw_p10": f"{projected * (1 + rel_p10):.2f}",
+                    "avg_load_mw_p90": f"{projected * (1 + rel_p90):.2f}",
+                    "percentile": f"{pct:g}",
+                }
+            )
+
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=SCENARIO_COLUMNS,
+        )
+        writer.writeheader()
+        writer.writerows(scenario_rows)
+    return len(scenario_rows)
+
+
+def _cache_key(engine: str, models: list[str], window: int, start: int, band_f: float) -> str:
+    settings = {
+        "version": CACHE_VERSION,
+        "engine": engine,
+        "models": models,
+        "window": window,
+        "start": start,
+        "temperature_band_f": band_f,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _load_cache(path: Path, key: str) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+    return cache if cache.get("config_key") == key else None
+
+
 def run_forecast() -> None:
     cfg = load_config()
     panel_path = Path(cfg["curated_output"]["panel_csv"])
     backtest_path = Path(cfg["forecast_output"]["backtest_csv"])
     metrics_path = Path(cfg["forecast_output"]["backtest_metrics_csv"])
     scenarios_path = Path(cfg["forecast_output"]["scenarios_csv"])
+    segments_path = Path(cfg["forecast_output"]["segments_csv"])
+    cache_ref = cfg["forecast_output"].get("cache_json")
     log_path = cfg["reports"]["metadata_log"]
 
+    forecast_cfg = cfg.get("forecast", {})
+    engine = resolve_engine(str(forecast_cfg.get("engine", "auto")), "forecast")
+    models = list(forecast_cfg.get("models") or DEFAULT_MODELS)
+    window = int(forecast_cfg.get("training_window_days", 0)) * 24
+    band_f = float(forecast_cfg.get("temperature_band_f", 10.0))
+    if band_f <= 0:
+        raise SystemExit("forecast.temperature_band_f must be > 0")
+
+    # The cache holds each model's fitted state plus running metric totals for the panel it
+    # last saw. An identical panel skips the stage; a panel that only appended hours resumes
+    # the walk-forward at the first new hour.
+    cache_path = Path(cache_ref) if cache_ref else None
+    cache_key = _cache_key(engine, models, window, start=24, band_f=band_f)
+    scenario_settings = _scenario_settings(forecast_cfg)
+    scenario_key = hashlib.sha256(json.dumps([engine, scenario_settings], sort_keys=True).encode("utf-8")).hexdigest()
+    panel_sha = sha256_file(panel_path)
+    panel_bytes = panel_path.stat().st_size
+    cache = _load_cache(cache_path, cache_key) if cache_path else None
+    if cache and not all(p.exists() for p in (backtest_path, metrics_path, scenarios_path, segments_path)):
+        cache = None
+    if cache and cache["panel_sha256"] == panel_sha:
+        # Scenario settings are not part of the backtest key; re-simulate if only they changed.
+        if cache.get("scenario_key") != scenario_key:
+            _write_scenarios(scenarios_path, **cache["scenario_inputs"], settings=scenario_settings, engine=engine)
+            cache["scenario_key"] = scenario_key
+            cache_path.write_text(json.dumps(cache), encoding="utf-8")
+        log_metadata(
+            log_path,
+            f"forecast:cache=hit panel_rows={cache['panel_rows']} best_model={cache['best_model']}",
+        )
+        return
+    resume = bool(
+        cache
+        and panel_bytes > cache["panel_bytes"]
+        and sha256_file(panel_path, limit=cache["panel_bytes"]) == cache["panel_sha256"]
+    )
+
     rows: list[dict[str, str]] = []
     with panel_path.open("r", encoding="utf-8", newline="") as f:
         rows = list(csv.DictReader(f))
@@ -61,102 +1381,180 @@ def run_forecast() -> None:
     if len(rows) < 36:
         raise SystemExit("Forecast requires at least 36 hourly observations")
 
-    actual_vals: list[float] = []
-    naive_vals: list[float] = []
-    weather_vals: list[float] = []
-    backtest_rows: list[dict[str, str]] = []
+    panel = _panel_columns(rows)
+    result = run_backtest(
+        panel,
+        start=24,
+        engine=engine,
+        models=models,
+        workers=int(forecast_cfg.get("workers", 0)),
+        window=window,
+        state=cache["state"] if resume else None,
+        temperature_band_f=band_f,
+    )
+    series = result["series"]
+    metrics = result["metrics"]
+    prefixes = [MODELS[m]["prefix"] for m in result["models"]] + ["ensemble"]
 
-    for i in range(24, len(rows)):
-        train = rows[:i]
-        test = rows[i]
-
-        actual = float(test["load_mw"])
-        naive = float(rows[i - 24]["load_mw"])
-
-        x = [float(r["temperature_f"]) for r in train]
-        y = [float(r["load_mw"]) for r in train]
-        a, b = _linear_fit(x, y)
-        weather = a + (b * float(test["temperature_f"]))
-
-        ape_naive = abs((actual - naive) / actual) if actual else 0.0
-        ape_weather = abs((actual - weather) / actual) if actual else 0.0
-
-        actual_vals.append(actual)
-        naive_vals.append(naive)
-        weather_vals.append(weather)
-
-        backtest_rows.append(
-            {
-                "timestamp_utc": test["timestamp_utc"],
-                "actual_load_mw": f"{actual:.4f}",
-                "naive_forecast_mw": f"{naive:.4f}",
-                "weather_forecast_mw": f"{weather:.4f}",
-                "naive_abs_pct_error": f"{ape_naive:.6f}",
-                "weather_abs_pct_error": f"{ape_weather:.6f}",
-            }
-        )
+    backtest_rows: list[dict[str, str]] = []
+    for offset, i in enumerate(range(result["start"], len(rows))):
+        row = {"timestamp_utc": rows[i]["timestamp_utc"], "actual_load_mw": f"{series['actual'][offset]:.4f}"}
+        for prefix in prefixes:
+            row[f"{prefix}_forecast_mw"] = f"{series[prefix][offset]:.4f}"
+            row[f"{prefix}_abs_pct_error"] = f"{series[f'{prefix}_ape'][offset]:.6f}"
+        for q in QUANTILES:
+            row[f"ensemble_p{round(q * 100)}_mw"] = f"{series[f'p{round(q * 100)}'][offset]:.4f}"
+        backtest_rows.append(row)
 
     backtest_path.parent.mkdir(parents=True, exist_ok=True)
-    with backtest_path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=BACKTEST_COLUMNS)
-        writer.writeheader()
+    with backtest_path.open("a" if resume else "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_backtest_columns(result["models"]))
+        if not resume:
+            writer.writeheader()
         writer.writerows(backtest_rows)
 
-    naive_rmse = _rmse(actual_vals, naive_vals)
-    weather_rmse = _rmse(actual_vals, weather_vals)
-    naive_mape = _mape(actual_vals, naive_vals)
-    weather_mape = _mape(actual_vals, weather_vals)
-
     with metrics_path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=["metric", "value"])
         writer.writeheader()
-        writer.writerow({"metric": "naive_rmse_mw", "value": f"{naive_rmse:.6f}"})
-        writer.writerow({"metric": "weather_rmse_mw", "value": f"{weather_rmse:.6f}"})
-        writer.writerow({"metric": "naive_mape", "value": f"{naive_mape:.6f}"})
-        writer.writerow({"metric": "weather_mape", "value": f"{weather_mape:.6f}"})
-        writer.writerow(
-            {
-                "metric": "best_model",
-                "value": "weather_linear" if weather_rmse <= naive_rmse else "naive_24h",
-            }
-        )
-
-    # Long-run scenario projection from recent mean load with annual growth assumptions.
-    recent = [float(r["load_mw"]) for r in rows[-24:]]
-    base_year_load = sum(recent) / len(recent)
-    scenario_growth = {"low": 0.01, "base": 0.03, "high": 0.06}
-    start_year = int(rows[-1]["timestamp_utc"][0:4]) + 1
+        for prefix in prefixes:
+            writer.writerow({"metric": f"{prefix}_rmse_mw", "value": f"{metrics[f'{prefix}_rmse']:.6f}"})
+        for prefix in prefixes:
+            writer.writerow({"metric": f"{prefix}_mape", "value": f"{metrics[f'{prefix}_mape']:.6f}"})
+        writer.writerow({"metric": "best_model", "value": result["best_model"]})
+        for model, weight in result["ensemble_weights"].items():
+            writer.writerow({"metric": f"ensemble_weight_{model}", "value": f"{weight:.6f}"})
+        for q in QUANTILES:
+            name = f"pinball_loss_p{round(q * 100)}"
+            writer.writerow({"metric": name, "value": f"{metrics[name]:.6f}"})
+        writer.writerow({"metric": "pinball_loss_mean", "value": f"{metrics['pinball_loss_mean']:.6f}"})
+        writer.writerow({"metric": "p10_p90_coverage", "value": f"{metrics['p10_p90_coverage']:.6f}"})
 
-    scenario_rows: list[dict[str, str]] = []
-    for scen, g in scenario_growth.items():
-        for year in range(start_year, start_year + 7):
-            n = year - start_year + 1
-            projected = base_year_load * ((1 + g) ** n)
-            peak = projected * 1.18
-            scenario_rows.append(
+    prefix_to_model = {MODELS[m]["prefix"]: m for m in result["models"]}
+    with segments_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SEGMENT_COLUMNS)
+        writer.writeheader()
+        for seg in result["segments"]:
+            writer.writerow(
                 {
-                    "scenario": scen,
-                    "year": str(year),
-                    "avg_load_mw": f"{projected:.2f}",
-                    "peak_load_mw": f"{peak:.2f}",
-                    "annual_growth_rate": f"{g:.4f}",
+                    "dimension": seg["dimension"],
+                    "segment": seg["segment"],
+                    "model": prefix_to_model.get(seg["prefix"], seg["prefix"]),
+                    "hours": str(seg["hours"]),
+                    "rmse_mw": f"{seg['rmse']:.6f}",
+                    "mape": f"{seg['mape']:.6f}",
                 }
             )
 
-    with scenarios_path.open("w", encoding="utf-8", newline="") as f:
+    # Long-run Monte Carlo projection from recent mean load.
+    recent = panel["load_mw"][-24:]
+    scenario_inputs = {
+        "base_year_load": sum(recent) / len(recent),
+        "start_year": int(rows[-1]["timestamp_utc"][0:4]) + 1,
+        "residual_band": [result["residual_quantiles"][QUANTILES[0]], result["residual_quantiles"][QUANTILES[-1]]],
+    }
+    _write_scenarios(scenarios_path, **scenario_inputs, settings=scenario_settings, engine=engine)
+
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "config_key": cache_key,
+            "panel_sha256": panel_sha,
+            "panel_bytes": panel_bytes,
+            "panel_rows": len(rows),
+            "best_model": result["best_model"],
+            "metrics": metrics,
+            "scenario_key": scenario_key,
+            "scenario_inputs": scenario_inputs,
+            "state": result["state"],
+        }
+        cache_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    log_metadata(
+        log_path,
+        (
+            "forecast:"
+            f"engine={result['engine']} "
+            f"cache={'resume' if resume else 'miss' if cache_path else 'off'} "
+            f"backtest_rows={len(backtest_rows)} "
+            f"models={len(result['models'])} window_hours={result['window']} "
+            f"naive_rmse={metrics.get('naive_rmse', 0.0):.2f} weather_rmse={metrics.get('weather_rmse', 0.0):.2f} "
+            f"ensemble_rmse={metrics['ensemble_rmse']:.2f} best_model={result['best_model']} "
+            f"pinball_mean={metrics['pinball_loss_mean']:.2f}"
+        ),
+    )
+
+
+def run_day_ahead() -> None:
+    cfg = load_config()
+    panel_path = Path(cfg["curated_output"]["panel_csv"])
+    forecasts_path = Path(cfg["forecast_output"]["day_ahead_csv"])
+    metrics_path = Path(cfg["forecast_output"]["day_ahead_metrics_csv"])
+    log_path = cfg["reports"]["metadata_log"]
+
+    with panel_path.open("r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    if len(rows) < 48:
+        raise SystemExit("Day-ahead forecast requires at least 48 hourly observations")
+
+    forecast_cfg = cfg.get("forecast", {})
+    day_ahead_cfg = forecast_cfg.get("day_ahead", {})
+    temp_col = str(day_ahead_cfg.get("temperature_column", "temperature_f"))
+    if temp_col not in rows[0]:
+        raise SystemExit(f"forecast.day_ahead.temperature_column={temp_col} is not a panel column")
+    result = run_day_ahead_backtest(
+        _panel_columns(rows),
+        issue_hour=int(day_ahead_cfg.get("issue_hour", 10)),
+        engine=str(forecast_cfg.get("engine", "auto")),
+        models=forecast_cfg.get("models"),
+        window=int(forecast_cfg.get("training_window_days", 0)) * 24,
+        temperature_forecast=[float(r[temp_col]) for r in rows],
+    )
+    series = result["series"]
+    prefixes = [MODELS[m]["prefix"] for m in result["models"]] + ["ensemble"]
+
+    forecasts_path.parent.mkdir(parents=True, exist_ok=True)
+    with forecasts_path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(
             f,
-            fieldnames=["scenario", "year", "avg_load_mw", "peak_load_mw", "annual_growth_rate"],
+            fieldnames=["issue_timestamp_utc", "target_timestamp_utc", "horizon_h", "actual_load_mw"]
+            + [f"{p}_forecast_mw" for p in prefixes],
         )
         writer.writeheader()
-        writer.writerows(scenario_rows)
+        for d, t in enumerate(result["issues"]):
+            for h in range(24):
+                row = {
+                    "issue_timestamp_utc": rows[t]["timestamp_utc"],
+                    "target_timestamp_utc": rows[t + h]["timestamp_utc"],
+                    "horizon_h": str(h + 1),
+                    "actual_load_mw": f"{series['actual'][d][h]:.4f}",
+                }
+                for p in prefixes:
+                    row[f"{p}_forecast_mw"] = f"{series[p][d][h]:.4f}"
+                writer.writerow(row)
 
+    prefix_to_model = {MODELS[m]["prefix"]: m for m in result["models"]}
+    with metrics_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=DAY_AHEAD_METRIC_COLUMNS)
+        writer.writeheader()
+        for h in range(24):
+            for p in prefixes:
+                writer.writerow(
+                    {
+                        "horizon_h": str(h + 1),
+                        "model": prefix_to_model.get(p, p),
+                        "issues": str(len(result["issues"])),
+                        "rmse_mw": f"{result['horizon_metrics'][p]['rmse'][h]:.6f}",
+                        "mape": f"{result['horizon_metrics'][p]['mape'][h]:.6f}",
+                    }
+                )
+
+    ens = result["horizon_metrics"]["ensemble"]["rmse"]
     log_metadata(
         log_path,
         (
-            "forecast:"
-            f"backtest_rows={len(backtest_rows)} "
-            f"naive_rmse={naive_rmse:.2f} weather_rmse={weather_rmse:.2f}"
+            "forecast_day_ahead:"
+            f"engine={result['engine']} issue_hour={result['issue_hour']} issues={len(result['issues'])} "
+            f"temperature_column={temp_col} ensemble_rmse_h1={ens[0]:.2f} ensemble_rmse_h24={ens[-1]:.2f}"
         ),
     )
 
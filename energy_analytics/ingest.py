@@ -10,6 +10,8 @@ from energy_analytics.provenance import build_manifest_record, now_utc_iso, writ
 from energy_analytics.sources import fetch_real_dataset_to_csv
 
 DATASETS = ("load", "price", "weather", "queue")
+# Ingested only when a source is configured for the run's mode.
+OPTIONAL_DATASETS = ("nodal",)
 
 
 def _copy_sample(sample_path: Path, out_path: Path) -> tuple[str, str]:
@@ -42,7 +44,14 @@ def run_ingest(mode_override: str | None = None) -> None:
     contracts = load_contracts(ingest_cfg.get("contracts_path", "config/schema_contracts.yml"))
     manifest_records: list[dict[str, object]] = []
 
-    for dataset in DATASETS:
+    datasets = list(DATASETS)
+    for dataset in OPTIONAL_DATASETS:
+        if dataset in real_src or (mode != "real" and dataset in sample_src):
+            datasets.append(dataset)
+        else:
+            log_metadata(log_path, f"ingest:skip dataset={dataset} mode={mode} reason=no source configured")
+
+    for dataset in datasets:
         out_path = Path(raw_dst[dataset])
         source_type = ""
         source_ref = ""
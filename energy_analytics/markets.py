@@ -1,64 +1,37 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
+import json
+import math
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 from pathlib import Path
+from typing import Any
 
 from energy_analytics.config import load_config
+from energy_analytics.engines import resolve_engine, resolve_workers
 from energy_analytics.metadata import log_metadata
+from energy_analytics.profiles import (
+    DATA_FILE,
+    HOURS_PER_YEAR,
+    PROFILE_SHAPES,
+    SOLAR_SHAPE_24,
+    WIND_SHAPE_24,
+    open_library,
+    profile_weights,
+    year_block,
+)
+from energy_analytics.provenance import sha256_file
+from energy_analytics.sketches import tdigest_add, tdigest_init, tdigest_merge, tdigest_quantile
+from energy_analytics.timeparts import DEFAULT_PEAK_BLOCK, time_parts
 
-SOLAR_SHAPE_24 = [
-    0.0,
-    0.0,
-    0.0,
-    0.0,
-    0.0,
-    0.02,
-    0.08,
-    0.20,
-    0.40,
-    0.62,
-    0.80,
-    0.92,
-    1.0,
-    0.96,
-    0.84,
-    0.62,
-    0.35,
-    0.12,
-    0.03,
-    0.0,
-    0.0,
-    0.0,
-    0.0,
-    0.0,
-]
-
-WIND_SHAPE_24 = [
-    0.70,
-    0.72,
-    0.74,
-    0.76,
-    0.73,
-    0.68,
-    0.60,
-    0.54,
-    0.50,
-    0.46,
-    0.44,
-    0.42,
-    0.40,
-    0.41,
-    0.43,
-    0.48,
-    0.56,
-    0.64,
-    0.72,
-    0.78,
-    0.82,
-    0.80,
-    0.76,
-    0.72,
-]
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional accelerator; the pure-Python path is always available.
+    np = None
 
 HOURLY_COLUMNS = [
     "timestamp_utc",
@@ -73,68 +46,561 @@ HOURLY_COLUMNS = [
     "is_negative_price_hour",
 ]
 
+CAPTURE_COLUMNS = [
+    "profile",
+    "resolution",
+    "hours",
+    "generation_weight",
+    "capture_price_usd_mwh",
+    "capture_ratio",
+]
+
+QUANTILE_COLUMNS = ["region", "hub", "month", "series", "hours", "p50", "p90", "p95", "p99"]
+REPORT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+PARTITION_METRIC_COLUMNS = ["region", "hub", "metric", "value"]
+
+NEGATIVE_PRICE_COLUMNS = ["region", "hub", "dimension", "segment", "events", "negative_hours", "share"]
+
+CUBE_COLUMNS = ["region", "hub", "month", "season", "block", "metric", "value"]
+CUBE_BLOCKS = ("on_peak", "off_peak")
+# Additive sums kept per (month, block) cell; each cell also carries [min price, max price].
+CUBE_SUMS = (
+    "hours",
+    "price_sum",
+    "negative_hours",
+    "congestion_sum",
+    "solar_weight",
+    "solar_revenue",
+    "wind_weight",
+    "wind_revenue",
+)
+SEASON_MONTHS = {"winter": (12, 1, 2), "spring": (3, 4, 5), "summer": (6, 7, 8), "fall": (9, 10, 11)}
+SEASONS = {month: season for season, months in SEASON_MONTHS.items() for month in months}
+
+CACHE_VERSION = 3
+
+# Rolling-mean windows (hours) for congestion proxies; the first is the headline `congestion_proxy`.
+DEFAULT_ROLLING_WINDOWS = [24, 168, 720]
+
+
+def _rolling_means(
+    values: list[float],
+    windows: list[int],
+    history: list[float] | None = None,
+    sums: dict[int, float] | None = None,
+) -> dict[int, list[float]]:
+    """Trailing means over each window in one O(n) pass.
+
+    Each window keeps a running sum: the entering value is added and the value that drops
+    out of the window subtracted, so cost does not depend on window length. Early hours
+    average over however many values exist so far.
+
+    To continue an earlier pass, give the values that preceded ``values`` as ``history``
+    (the last ``max(windows)`` or all of them) and its running ``sums``, which are updated
+    in place; the means then match a single pass over the whole series exactly.
+    """
+    history = history or []
+    if sums is None:
+        sums = {}
+    for w in windows:
+        sums.setdefault(w, 0.0)
+    series = history + values
+    base = len(history)
+    out: dict[int, list[float]] = {w: [] for w in windows}
+    for i in range(base, len(series)):
+        v = series[i]
+        for w in windows:
+            sums[w] += v
+            if i >= w:
+                sums[w] -= series[i - w]
+            out[w].append(sums[w] / min(i + 1, w))
+    return out
+
+
+def _price_buckets(
+    prices: list[float], hour_of_day: list[int], years: list[int], hour_of_year: list[int], engine: str
+) -> dict[str, Any]:
+    """Reduce a price history to hour-of-day and per-year hour-of-year sums and counts.
+
+    Buckets from disjoint slices of the history add up with ``_merge_buckets``, so partitions
+    can be reduced independently and capture prices taken from the combined totals.
+    """
+    buckets: dict[str, Any] = {"hod_sums": [0.0] * 24, "hod_counts": [0.0] * 24, "hoy": {}}
+    if engine == "numpy" and prices:
+        p = np.asarray(prices, dtype=np.float64)
+        hod = np.asarray(hour_of_day, dtype=np.int64)
+        buckets["hod_sums"] = np.bincount(hod, weights=p, minlength=24).tolist()
+        buckets["hod_counts"] = np.bincount(hod, minlength=24).astype(np.float64).tolist()
+        y = np.asarray(years, dtype=np.int64)
+        hoy = np.asarray(hour_of_year, dtype=np.int64)
+        for year in np.unique(y).tolist():
+            mask = y == year
+            buckets["hoy"][year] = [
+                np.bincount(hoy[mask], weights=p[mask], minlength=HOURS_PER_YEAR).tolist(),
+                np.bincount(hoy[mask], minlength=HOURS_PER_YEAR).astype(np.float64).tolist(),
+            ]
+        return buckets
+    for price, h, year, k in zip(prices, hour_of_day, years, hour_of_year, strict=True):
+        buckets["hod_sums"][h] += price
+        buckets["hod_counts"][h] += 1
+        sums, counts = buckets["hoy"].setdefault(year, [[0.0] * HOURS_PER_YEAR, [0.0] * HOURS_PER_YEAR])
+        sums[k] += price
+        counts[k] += 1
+    return buckets
+
+
+def _merge_buckets(into: dict[str, Any], other: dict[str, Any]) -> None:
+    into["hod_sums"] = [a + b for a, b in zip(into["hod_sums"], other["hod_sums"], strict=True)]
+    into["hod_counts"] = [a + b for a, b in zip(into["hod_counts"], other["hod_counts"], strict=True)]
+    for year, (sums, counts) in other["hoy"].items():
+        if year not in into["hoy"]:
+            into["hoy"][year] = [list(sums), list(counts)]
+            continue
+        mine = into["hoy"][year]
+        mine[0] = [a + b for a, b in zip(mine[0], sums, strict=True)]
+        mine[1] = [a + b for a, b in zip(mine[1], counts, strict=True)]
+
+
+def _weighted_totals(
+    weights: Any, sums: list[float], counts: list[float], engine: str
+) -> tuple[list[float], list[float]]:
+    """Profile-matrix x bucket-vector products: (sum w*price, sum w*hours) per profile row."""
+    if engine == "numpy":
+        w = np.asarray(weights, dtype=np.float64) if isinstance(weights, list) else weights
+        return (w @ np.asarray(sums)).tolist(), (w @ np.asarray(counts)).tolist()
+    num = [sum(w * v for w, v in zip(row, sums, strict=True)) for row in weights]
+    den = [sum(w * c for w, c in zip(row, counts, strict=True)) for row in weights]
+    return num, den
+
+
+def _capture_from_buckets(
+    shapes: dict[str, list[float]], buckets: dict[str, Any], engine: str
+) -> dict[str, dict[str, Any]]:
+    hours = sum(buckets["hod_counts"])
+    avg_price = sum(buckets["hod_sums"]) / hours if hours else 0.0
+    by_resolution: dict[int, list[str]] = {}
+    for name, shape in shapes.items():
+        if len(shape) not in (24, HOURS_PER_YEAR):
+            raise SystemExit(f"Profile {name} has {len(shape)} values; expected 24 or {HOURS_PER_YEAR}")
+        by_resolution.setdefault(len(shape), []).append(name)
+
+    out: dict[str, dict[str, Any]] = {}
+    for size, names in by_resolution.items():
+        if size == 24:
+            sums, counts = buckets["hod_sums"], buckets["hod_counts"]
+        else:
+            # Hour-of-year shapes apply to every year alike, so the years' buckets are pooled.
+            sums, counts = [0.0] * HOURS_PER_YEAR, [0.0] * HOURS_PER_YEAR
+            for year_sums, year_counts in buckets["hoy"].values():
+                sums = [a + b for a, b in zip(sums, year_sums, strict=True)]
+                counts = [a + b for a, b in zip(counts, year_counts, strict=True)]
+        num, den = _weighted_totals([shapes[n] for n in names], sums, counts, engine)
+        for name, nu, de in zip(names, num, den, strict=True):
+            capture = nu / de if de else 0.0
+            out[name] = {
+                "resolution": size,
+                "hours": int(hours),
+                "generation_weight": de,
+                "capture_price": capture,
+                "capture_ratio": capture / avg_price if avg_price else 0.0,
+            }
+    return out
+
+
+def _library_capture_from_buckets(
+    lib: dict[str, Any], buckets: dict[str, Any], engine: str
+) -> dict[str, dict[str, Any]]:
+    num: dict[str, float] = {}
+    den: dict[str, float] = {}
+    hours: dict[str, float] = {}
+    price_sum: dict[str, float] = {}
+    for year, (sums, counts) in sorted(buckets["hoy"].items()):
+        names, block = year_block(lib, year)
+        if not names:
+            continue
+        if engine != "numpy":
+            block = (
+                block.tolist()
+                if np is not None
+                else [block[k * HOURS_PER_YEAR : (k + 1) * HOURS_PER_YEAR] for k in range(len(names))]
+            )
+        year_num, year_den = _weighted_totals(block, sums, counts, engine)
+        year_hours = sum(counts)
+        year_prices = sum(sums)
+        for name, nu, de in zip(names, year_num, year_den, strict=True):
+            num[name] = num.get(name, 0.0) + float(nu)
+            den[name] = den.get(name, 0.0) + float(de)
+            hours[name] = hours.get(name, 0.0) + year_hours
+            price_sum[name] = price_sum.get(name, 0.0) + year_prices
+
+    out: dict[str, dict[str, Any]] = {}
+    for name in sorted(num):
+        capture = num[name] / den[name] if den[name] else 0.0
+        avg_price = price_sum[name] / hours[name] if hours[name] else 0.0
+        out[name] = {
+            "resolution": HOURS_PER_YEAR,
+            "hours": int(hours[name]),
+            "generation_weight": den[name],
+            "capture_price": capture,
+            "capture_ratio": capture / avg_price if avg_price else 0.0,
+        }
+    return out
+
+
+def capture_prices(
+    shapes: dict[str, list[float]],
+    prices: list[float],
+    hour_of_day: list[int],
+    hour_of_year: list[int],
+    engine: str = "auto",
+) -> dict[str, dict[str, Any]]:
+    """Capture price and ratio for every generation shape against one price history.
 
-def _hour(ts: str) -> int:
-    return int(ts[11:13])
+    Prices are first reduced to per-bucket totals (24 hour-of-day or 8760 hour-of-year
+    buckets), so all profiles of a resolution are priced by one profile-matrix x bucket-vector
+    product whose cost does not grow with the length of the history.
+    """
+    engine = resolve_engine(engine, "markets")
+    buckets = _price_buckets(prices, hour_of_day, [0] * len(prices), hour_of_year, engine)
+    return _capture_from_buckets(shapes, buckets, engine)
+
+
+def library_capture_prices(
+    lib: dict[str, Any],
+    prices: list[float],
+    years: list[int],
+    hour_of_year: list[int],
+    engine: str = "auto",
+) -> dict[str, dict[str, Any]]:
+    """Capture prices for every profile in a memory-mapped library, keyed by profile year.
+
+    Each year's prices are reduced to 8760 hour-of-year sums and counts and multiplied by
+    that year's contiguous block of profile weights, read in place from the mapped file.
+    A profile missing for some year simply does not cover that year's hours.
+    """
+    engine = resolve_engine(engine, "markets")
+    buckets = _price_buckets(prices, [0] * len(prices), years, hour_of_year, engine)
+    return _library_capture_from_buckets(lib, buckets, engine)
 
 
 def _moving_average(values: list[float], window: int) -> list[float]:
-    out: list[float] = []
-    for i in range(len(values)):
-        start = max(0, i - window + 1)
-        chunk = values[start : i + 1]
-        out.append(sum(chunk) / len(chunk))
+    return _rolling_means(values, [window])[window]
+
+
+def _hourly_columns(windows: list[int]) -> list[str]:
+    # The first window drives congestion_proxy; each further window adds its own column.
+    return HOURLY_COLUMNS + [f"congestion_proxy_{w}h" for w in windows[1:]]
+
+
+def _quantile_rows(parts: list[dict[str, Any]], overall: dict[str, dict]) -> list[dict[str, str]]:
+    keyed = [
+        ((part["region"], part["hub"], month), by_series)
+        for part in parts
+        for month, by_series in sorted(part["digests"].items())
+    ]
+    out: list[dict[str, str]] = []
+    for (region, hub, month), by_series in keyed + [(("ALL", "ALL", "ALL"), overall)]:
+        for series, digest in by_series.items():
+            row = {"region": region, "hub": hub, "month": month, "series": series, "hours": str(int(digest["count"]))}
+            for q in REPORT_QUANTILES:
+                row[f"p{round(q * 100)}"] = f"{tdigest_quantile(digest, q):.4f}"
+            out.append(row)
     return out
 
 
-def _quantile(values: list[float], q: float) -> float:
-    if not values:
-        return 0.0
-    s = sorted(values)
-    idx = int(round((len(s) - 1) * q))
-    return s[idx]
+def _negative_runs(prices: list[float], engine: str) -> tuple[list[int], list[int]]:
+    """Start index and length of every run of consecutive negative prices.
 
+    The numpy path run-length encodes the sign mask from the edges of its first difference,
+    so cost is a few array passes however long the series; the pure-Python path groups the
+    mask with ``itertools.groupby`` rather than stepping a per-hour state machine.
+    """
+    if engine == "numpy":
+        neg = (np.asarray(prices, dtype=np.float64) < 0).astype(np.int8)
+        edges = np.diff(np.concatenate(([0], neg, [0])))
+        starts = np.flatnonzero(edges == 1)
+        return starts.tolist(), (np.flatnonzero(edges == -1) - starts).tolist()
+    starts: list[int] = []
+    lengths: list[int] = []
+    pos = 0
+    for is_neg, group in groupby(p < 0 for p in prices):
+        size = sum(1 for _ in group)
+        if is_neg:
+            starts.append(pos)
+            lengths.append(size)
+        pos += size
+    return starts, lengths
 
-def run_markets() -> None:
-    cfg = load_config()
-    panel_path = Path(cfg["curated_output"]["panel_csv"])
-    hourly_out = Path(cfg["markets_output"]["hourly_csv"])
-    metrics_out = Path(cfg["markets_output"]["metrics_csv"])
-    findings_out = Path(cfg["markets_output"]["findings_md"])
-    log_path = cfg["reports"]["metadata_log"]
 
-    rows: list[dict[str, str]] = []
-    with panel_path.open("r", encoding="utf-8", newline="") as f:
-        for row in csv.DictReader(f):
-            rows.append(row)
+def _empty_negative_runs() -> dict[str, Any]:
+    return {
+        "lengths": {},
+        "month_events": {},
+        "month_hours": {},
+        "hod_events": [0] * 24,
+        "hod_hours": [0] * 24,
+        "open": 0,
+    }
+
+
+def _add_negative_runs(
+    runs: dict[str, Any], prices: list[float], months: list[str], hours_of_day: list[int], engine: str
+) -> None:
+    """Fold a chunk of prices into ``runs`` in place.
+
+    A run still going at the end of the chunk stays ``open`` and is extended by the next
+    chunk, so events and durations do not depend on where the history was split. Events
+    count toward the month and hour of day in which they start.
+    """
+    starts, lengths = _negative_runs(prices, engine)
+    carried = runs["open"]
+    runs["open"] = 0
+    if carried and not (starts and starts[0] == 0):
+        runs["lengths"][carried] = runs["lengths"].get(carried, 0) + 1
+    for k, (start, length) in enumerate(zip(starts, lengths, strict=True)):
+        total = length
+        if k == 0 and carried and start == 0:
+            total += carried
+        else:
+            runs["month_events"][months[start]] = runs["month_events"].get(months[start], 0) + 1
+            runs["hod_events"][hours_of_day[start]] += 1
+        if start + length == len(prices):
+            runs["open"] = total
+        else:
+            runs["lengths"][total] = runs["lengths"].get(total, 0) + 1
+
+    if engine == "numpy":
+        idx = np.flatnonzero(np.asarray(prices, dtype=np.float64) < 0)
+        hod_hours = np.bincount(np.asarray(hours_of_day, dtype=np.int64)[idx], minlength=24).tolist()
+        idx = idx.tolist()
+    else:
+        idx = [i for i, p in enumerate(prices) if p < 0]
+        hod_hours = [0] * 24
+        for i in idx:
+            hod_hours[hours_of_day[i]] += 1
+    runs["hod_hours"] = [a + b for a, b in zip(runs["hod_hours"], hod_hours, strict=True)]
+    for month, count in Counter(months[i] for i in idx).items():
+        runs["month_hours"][month] = runs["month_hours"].get(month, 0) + count
+
+
+def _merge_negative_runs(into: dict[str, Any], other: dict[str, Any]) -> None:
+    """Add ``other`` to ``into``; runs still open in ``other`` are closed at its last hour."""
+    lengths = dict(other["lengths"])
+    if other["open"]:
+        lengths[other["open"]] = lengths.get(other["open"], 0) + 1
+    for length, count in lengths.items():
+        into["lengths"][length] = into["lengths"].get(length, 0) + count
+    for key in ("month_events", "month_hours"):
+        for month, count in other[key].items():
+            into[key][month] = into[key].get(month, 0) + count
+    for key in ("hod_events", "hod_hours"):
+        into[key] = [a + b for a, b in zip(into[key], other[key], strict=True)]
+
+
+def _add_cube(
+    cube: dict[str, list[float]],
+    months: list[str],
+    on_peak: list[bool],
+    prices: list[float],
+    congestion: list[float],
+    solar: list[float],
+    wind: list[float],
+    engine: str,
+) -> None:
+    """Fold hours into ``cube`` (``"YYYY-MM|block"`` -> ``CUBE_SUMS`` + [min, max]) in place.
+
+    Every hour gets a flat cell index (month slot * 2 + block), and each metric is summed into
+    an array preallocated for the chunk's cells: one ``np.bincount`` per metric with numpy, a
+    single loop over the hours without. Cells merge by addition, so chunks and partitions
+    fold together in any order.
+    """
+    keys = sorted(set(months))
+    if not keys:
+        return
+    slot = {m: i for i, m in enumerate(keys)}
+    cells = [slot[m] * 2 + (0 if peak else 1) for m, peak in zip(months, on_peak, strict=True)]
+    size = len(keys) * 2
+    columns = [
+        [1.0] * len(prices),
+        prices,
+        [1.0 if p < 0 else 0.0 for p in prices],
+        congestion,
+        solar,
+        [w * p for w, p in zip(solar, prices, strict=True)],
+        wind,
+        [w * p for w, p in zip(wind, prices, strict=True)],
+    ]
+    if engine == "numpy":
+        idx = np.asarray(cells, dtype=np.int64)
+        p = np.asarray(prices, dtype=np.float64)
+        sums = [np.bincount(idx, weights=np.asarray(col, dtype=np.float64), minlength=size).tolist() for col in columns]
+        lo = np.full(size, np.inf)
+        hi = np.full(size, -np.inf)
+        np.minimum.at(lo, idx, p)
+        np.maximum.at(hi, idx, p)
+        lows, highs = lo.tolist(), hi.tolist()
+    else:
+        sums = [[0.0] * size for _ in columns]
+        lows = [math.inf] * size
+        highs = [-math.inf] * size
+        for i, c in enumerate(cells):
+            for acc, col in zip(sums, columns, strict=True):
+                acc[c] += col[i]
+            price = prices[i]
+            if price < lows[c]:
+                lows[c] = price
+            if price > highs[c]:
+                highs[c] = price
+    for month, i in slot.items():
+        for b, block in enumerate(CUBE_BLOCKS):
+            c = i * 2 + b
+            if sums[0][c]:
+                _merge_cube_cell(cube, f"{month}|{block}", [col[c] for col in sums] + [lows[c], highs[c]])
+
+
+def _merge_cube_cell(cube: dict[str, list[float]], key: str, cell: list[float]) -> None:
+    have = cube.get(key)
+    if have is None:
+        cube[key] = list(cell)
+        return
+    n = len(CUBE_SUMS)
+    for k in range(n):
+        have[k] += cell[k]
+    have[n] = min(have[n], cell[n])
+    have[n + 1] = max(have[n + 1], cell[n + 1])
+
+
+def _cube_rows(acc: dict[str, Any]) -> list[dict[str, str]]:
+    """Month x block x metric rows for one accumulator."""
+    out: list[dict[str, str]] = []
+    for key, cell in sorted(acc["cube"].items()):
+        month, block = key.split("|")
+        sums = dict(zip(CUBE_SUMS, cell, strict=True))
+        hours = sums["hours"]
+        avg_price = sums["price_sum"] / hours
+        metrics = [
+            ("hours", hours),
+            ("avg_price_usd_mwh", avg_price),
+            ("min_price_usd_mwh", cell[-2]),
+            ("max_price_usd_mwh", cell[-1]),
+            ("negative_price_hours", sums["negative_hours"]),
+            ("negative_price_share", sums["negative_hours"] / hours),
+            ("congestion_proxy_mean", sums["congestion_sum"] / hours),
+        ]
+        for name in ("solar", "wind"):
+            weight = sums[f"{name}_weight"]
+            capture = sums[f"{name}_revenue"] / weight if weight else 0.0
+            metrics.append((f"{name}_capture_price_usd_mwh", capture))
+            metrics.append((f"{name}_capture_ratio", capture / avg_price if avg_price else 0.0))
+        season = SEASONS[int(month[5:7])]
+        for name, val in metrics:
+            out.append(
+                {
+                    "region": acc["region"],
+                    "hub": acc["hub"],
+                    "month": month,
+                    "season": season,
+                    "block": block,
+                    "metric": name,
+                    "value": f"{val:.6f}",
+                }
+            )
+    return out
+
 
+def _empty_partition(region: str, hub: str) -> dict[str, Any]:
+    return {
+        "region": region,
+        "hub": hub,
+        "hours": 0,
+        "price_sum": 0.0,
+        "negative_hours": 0,
+        "congestion_sum": 0.0,
+        "window_sums": {},
+        "rolling_sums": {},
+        "negative_runs": _empty_negative_runs(),
+        "cube": {},
+        "digests": {},
+        "buckets": {"hod_sums": [0.0] * 24, "hod_counts": [0.0] * 24, "hoy": {}},
+        "tail": [],
+    }
+
+
+def _thaw_partition(state: dict[str, Any]) -> dict[str, Any]:
+    """Restore integer keys that a JSON round trip turned into strings."""
+    state["window_sums"] = {int(w): v for w, v in state["window_sums"].items()}
+    state["rolling_sums"] = {int(w): v for w, v in state["rolling_sums"].items()}
+    state["negative_runs"]["lengths"] = {int(n): v for n, v in state["negative_runs"]["lengths"].items()}
+    state["buckets"]["hoy"] = {int(y): v for y, v in state["buckets"]["hoy"].items()}
+    return state
+
+
+def _market_partition(
+    region: str, hub: str, rows: list[dict[str, str]], settings: dict[str, Any], state: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Enrich one (region, hub) price series and reduce it to mergeable accumulators.
+
+    Runs in a pool worker: rolling windows stay inside the partition, quantiles go to
+    per-month t-digests, and capture inputs to hour buckets, all of which merge across
+    partitions without revisiting hours. Each worker maps the profile library itself, so
+    every process shares the same page-cached file.
+
+    ``state`` is a previous return value (without ``enriched``) for the hours before
+    ``rows``; its price tail and running sums continue the rolling windows, so only the new
+    hours are processed.
+    """
+    windows = settings["windows"]
+    compression = settings["compression"]
+    engine = settings["engine"]
+    acc = state if state is not None else _empty_partition(region, hub)
+    tail = acc["tail"]
     prices = [float(r["price_usd_mwh"]) for r in rows]
-    rolling_price = _moving_average(prices, window=24)
+    rolling = _rolling_means(prices, windows, tail, acc["rolling_sums"])
+    rolling_price = rolling[windows[0]]
+    extra_congestion = {w: [abs(p - m) for p, m in zip(prices, rolling[w], strict=True)] for w in windows[1:]}
+    calendar = time_parts([r["timestamp_utc"] for r in rows], settings.get("peak_block", DEFAULT_PEAK_BLOCK))
+    hours_of_day = calendar["hour"]
+    years = calendar["year"]
+    hours_of_year = calendar["hour_of_year"]
+    months = calendar["month"]
+
+    library = open_library(Path(settings["library_dir"])) if settings["library_dir"] else None
+    hourly_shapes: dict[tuple[str, int], Any] = {}
+    if library is not None:
+        for name in ("solar", "wind"):
+            for year in sorted(set(years)):
+                if f"{name}@{year}" in library["index"]["entries"]:
+                    hourly_shapes[(name, year)] = profile_weights(library, name, year)
 
     enriched: list[dict[str, str]] = []
-    solar_num = 0.0
-    solar_den = 0.0
-    wind_num = 0.0
-    wind_den = 0.0
     negative_hours = 0
-    congestion_values: list[float] = []
-
+    congestion_sum = 0.0
+    congestion_series: list[float] = []
+    solar_series: list[float] = []
+    wind_series: list[float] = []
+    digests = acc["digests"]
     for idx, row in enumerate(rows):
-        hr = _hour(row["timestamp_utc"])
-        price = float(row["price_usd_mwh"])
-        solar_p = SOLAR_SHAPE_24[hr]
-        wind_p = WIND_SHAPE_24[hr]
-        solar_w = solar_p * price
-        wind_w = wind_p * price
+        hr = hours_of_day[idx]
+        price = prices[idx]
+        solar_lib = hourly_shapes.get(("solar", years[idx]))
+        wind_lib = hourly_shapes.get(("wind", years[idx]))
+        solar_p = float(solar_lib[hours_of_year[idx]]) if solar_lib is not None else SOLAR_SHAPE_24[hr]
+        wind_p = float(wind_lib[hours_of_year[idx]]) if wind_lib is not None else WIND_SHAPE_24[hr]
         congestion = abs(price - rolling_price[idx])
         is_neg = 1 if price < 0 else 0
 
-        solar_num += solar_w
-        solar_den += solar_p
-        wind_num += wind_w
-        wind_den += wind_p
         negative_hours += is_neg
-        congestion_values.append(congestion)
+        congestion_sum += congestion
+        congestion_series.append(congestion)
+        solar_series.append(solar_p)
+        wind_series.append(wind_p)
+        part = digests.get(months[idx])
+        if part is None:
+            part = {"price": tdigest_init(compression), "congestion": tdigest_init(compression)}
+            digests[months[idx]] = part
+        tdigest_add(part["price"], price)
+        tdigest_add(part["congestion"], congestion)
 
         enriched.append(
             {
@@ -144,34 +610,330 @@ def run_markets() -> None:
                 "price_usd_mwh": f"{price:.4f}",
                 "solar_profile": f"{solar_p:.4f}",
                 "wind_profile": f"{wind_p:.4f}",
-                "solar_weighted_price": f"{solar_w:.4f}",
-                "wind_weighted_price": f"{wind_w:.4f}",
+                "solar_weighted_price": f"{solar_p * price:.4f}",
+                "wind_weighted_price": f"{wind_p * price:.4f}",
                 "congestion_proxy": f"{congestion:.4f}",
                 "is_negative_price_hour": str(is_neg),
+                **{f"congestion_proxy_{w}h": f"{extra_congestion[w][idx]:.4f}" for w in windows[1:]},
             }
         )
 
-    avg_price = sum(prices) / len(prices) if prices else 0.0
-    solar_capture = (solar_num / solar_den) if solar_den else 0.0
-    wind_capture = (wind_num / wind_den) if wind_den else 0.0
+    acc["hours"] += len(rows)
+    acc["price_sum"] += sum(prices)
+    acc["negative_hours"] += negative_hours
+    acc["congestion_sum"] += congestion_sum
+    for w in windows[1:]:
+        acc["window_sums"][w] = acc["window_sums"].get(w, 0.0) + sum(extra_congestion[w])
+    _merge_buckets(acc["buckets"], _price_buckets(prices, hours_of_day, years, hours_of_year, engine))
+    _add_negative_runs(acc["negative_runs"], prices, months, hours_of_day, engine)
+    _add_cube(
+        acc["cube"],
+        calendar["local_month"],
+        calendar["on_peak"],
+        prices,
+        congestion_series,
+        solar_series,
+        wind_series,
+        engine,
+    )
+    acc["tail"] = (tail + prices)[-max(windows) :]
+    acc["enriched"] = enriched
+    return acc
+
+
+def _merge_partitions(parts: list[dict[str, Any]], compression: float) -> dict[str, Any]:
+    """Fold partition accumulators into one ALL/ALL accumulator; inputs are left unchanged."""
+    merged = _empty_partition("ALL", "ALL")
+    merged["month_hours"] = {}
+    merged["digests"]["ALL"] = {"price": tdigest_init(compression), "congestion": tdigest_init(compression)}
+    for part in parts:
+        for key in ("hours", "price_sum", "negative_hours", "congestion_sum"):
+            merged[key] += part[key]
+        for w, total in part["window_sums"].items():
+            merged["window_sums"][w] = merged["window_sums"].get(w, 0.0) + total
+        for by_series in part["digests"].values():
+            for series, digest in by_series.items():
+                tdigest_merge(merged["digests"]["ALL"][series], digest)
+        _merge_buckets(merged["buckets"], part["buckets"])
+        _merge_negative_runs(merged["negative_runs"], part["negative_runs"])
+        for key, cell in part["cube"].items():
+            _merge_cube_cell(merged["cube"], key, cell)
+        for month, hours in _month_hours(part).items():
+            merged["month_hours"][month] = merged["month_hours"].get(month, 0) + hours
+    return merged
+
+
+def _month_hours(acc: dict[str, Any]) -> dict[str, int]:
+    """Hours per ``YYYY-MM``; partitions read them off their monthly digests."""
+    if "month_hours" in acc:
+        return acc["month_hours"]
+    return {month: int(by_series["price"]["count"]) for month, by_series in acc["digests"].items()}
+
+
+def _run_lengths(runs: dict[str, Any]) -> dict[int, int]:
+    lengths = dict(runs["lengths"])
+    if runs["open"]:
+        lengths[runs["open"]] = lengths.get(runs["open"], 0) + 1
+    return lengths
+
 
+def _negative_rows(acc: dict[str, Any]) -> list[dict[str, str]]:
+    """Run-length histogram, monthly events and hour-of-day incidence for one accumulator."""
+    runs = acc["negative_runs"]
+    lengths = _run_lengths(runs)
+    events = sum(lengths.values())
+    hod_counts = acc["buckets"]["hod_counts"]
+    keyed: list[tuple[str, str, int, int, float]] = []
+    for length, count in sorted(lengths.items()):
+        keyed.append(("run_length_h", str(length), count, length * count, count / events if events else 0.0))
+    for month, hours in sorted(_month_hours(acc).items()):
+        neg = runs["month_hours"].get(month, 0)
+        keyed.append(("month", month, runs["month_events"].get(month, 0), neg, neg / hours if hours else 0.0))
+    for h in range(24):
+        neg = runs["hod_hours"][h]
+        keyed.append(("hour_of_day", str(h), runs["hod_events"][h], neg, neg / hod_counts[h] if hod_counts[h] else 0.0))
+    return [
+        {
+            "region": acc["region"],
+            "hub": acc["hub"],
+            "dimension": dimension,
+            "segment": segment,
+            "events": str(count),
+            "negative_hours": str(neg),
+            "share": f"{share:.6f}",
+        }
+        for dimension, segment, count, neg, share in keyed
+    ]
+
+
+def _home_partition(parts: list[dict[str, Any]], merged: dict[str, Any], region: str, hub: str) -> dict[str, Any]:
+    """The configured hub's accumulator (any region if ``region`` is empty); ``merged`` if absent."""
+    for acc in parts:
+        if acc["hub"] == hub and region in ("", acc["region"]):
+            return acc
+    return merged
+
+
+def _partition_metrics(
+    acc: dict[str, Any], shapes: dict[str, list[float]], library: dict[str, Any] | None, engine: str
+) -> tuple[list[tuple[str, float]], dict[str, dict[str, Any]]]:
+    """Metric rows and capture results for one accumulator (a partition or the merged total)."""
+    library_captures = _library_capture_from_buckets(library, acc["buckets"], engine) if library else {}
+    captures = _capture_from_buckets(
+        {name: shape for name, shape in shapes.items() if name not in library_captures}, acc["buckets"], engine
+    )
+    captures.update(library_captures)
+
+    if len(acc["digests"]) == 1:
+        overall = next(iter(acc["digests"].values()))
+    else:
+        compression = next(iter(next(iter(acc["digests"].values())).values()))["compression"]
+        overall = {"price": tdigest_init(compression), "congestion": tdigest_init(compression)}
+        for by_series in acc["digests"].values():
+            for series, digest in by_series.items():
+                tdigest_merge(overall[series], digest)
+
+    hours = acc["hours"]
+    avg_price = acc["price_sum"] / hours if hours else 0.0
+    solar_capture = captures["solar"]["capture_price"]
+    wind_capture = captures["wind"]["capture_price"]
     metrics = [
         ("avg_price_usd_mwh", avg_price),
         ("solar_capture_price_usd_mwh", solar_capture),
         ("wind_capture_price_usd_mwh", wind_capture),
         ("solar_capture_ratio", (solar_capture / avg_price) if avg_price else 0.0),
         ("wind_capture_ratio", (wind_capture / avg_price) if avg_price else 0.0),
-        ("negative_price_hours", float(negative_hours)),
-        ("total_hours", float(len(rows))),
-        ("negative_price_share", (negative_hours / len(rows)) if rows else 0.0),
-        ("congestion_proxy_mean", (sum(congestion_values) / len(congestion_values)) if congestion_values else 0.0),
-        ("congestion_proxy_p95", _quantile(congestion_values, 0.95)),
+        ("negative_price_hours", float(acc["negative_hours"])),
+        ("total_hours", float(hours)),
+        ("negative_price_share", (acc["negative_hours"] / hours) if hours else 0.0),
+        ("congestion_proxy_mean", (acc["congestion_sum"] / hours) if hours else 0.0),
+        ("congestion_proxy_p95", tdigest_quantile(overall["congestion"], 0.95)),
     ]
+    for q in REPORT_QUANTILES:
+        metrics.append((f"price_usd_mwh_p{round(q * 100)}", tdigest_quantile(overall["price"], q)))
+    for q in (0.5, 0.9, 0.99):
+        metrics.append((f"congestion_proxy_p{round(q * 100)}", tdigest_quantile(overall["congestion"], q)))
+    for w, total in acc["window_sums"].items():
+        metrics.append((f"congestion_proxy_{w}h_mean", (total / hours) if hours else 0.0))
+    lengths = _run_lengths(acc["negative_runs"])
+    events = sum(lengths.values())
+    months = len(_month_hours(acc))
+    metrics += [
+        ("negative_price_events", float(events)),
+        ("negative_price_longest_run_h", float(max(lengths, default=0))),
+        ("negative_price_mean_run_h", (acc["negative_hours"] / events) if events else 0.0),
+        ("negative_price_events_per_month", (events / months) if months else 0.0),
+    ]
+    return metrics, captures
+
+
+def _run_partitions(
+    groups: dict[tuple[str, str], list[dict[str, str]]],
+    settings: dict[str, Any],
+    workers: int,
+    states: dict[tuple[str, str], dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """Run every (region, hub) partition, in-process or across a process pool.
+
+    Partitions are submitted largest first, so long series start early and the small ones
+    fill in around them instead of leaving one straggler on an otherwise idle pool.
+    ``states`` resumes partitions from earlier accumulators; a partition with no new rows
+    is passed through unchanged. Results come back sorted by (region, hub).
+    """
+    states = states or {}
+    order = sorted(groups, key=lambda k: (-len(groups[k]), k))
+    if workers <= 1:
+        parts = [_market_partition(*key, groups[key], settings, states.get(key)) for key in order]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_market_partition, *key, groups[key], settings, states.get(key)) for key in order]
+            parts = [fut.result() for fut in futures]
+    parts += [{**state, "enriched": []} for key, state in states.items() if key not in groups]
+    return sorted(parts, key=lambda p: (p["region"], p["hub"]))
+
+
+def _cache_key(settings: dict[str, Any], shapes: dict[str, list[float]], library_sha: str, home: list[str]) -> str:
+    # ``home`` is the configured (region, hub) whose partition feeds the legacy metrics mart.
+    payload = {
+        "version": CACHE_VERSION,
+        "home": home,
+        "windows": settings["windows"],
+        "compression": settings["compression"],
+        "engine": settings["engine"],
+        "peak_block": settings["peak_block"],
+        "shapes": shapes,
+        "library_sha256": library_sha,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _load_cache(path: Path, key: str) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+    return cache if cache.get("config_key") == key else None
 
+
+def _read_panel_rows(path: Path, offset: int = 0) -> list[dict[str, str]]:
+    """Panel rows after byte ``offset`` (0 reads them all); the header always comes from line one."""
+    with path.open("rb") as f:
+        header = f.readline()
+        if offset:
+            f.seek(offset)
+        body = f.read()
+    return list(csv.DictReader(io.StringIO((header + body).decode("utf-8"), newline="")))
+
+
+def run_markets() -> None:
+    cfg = load_config()
+    panel_path = Path(cfg["curated_output"]["panel_csv"])
+    hourly_out = Path(cfg["markets_output"]["hourly_csv"])
+    metrics_out = Path(cfg["markets_output"]["metrics_csv"])
+    partition_metrics_out = Path(cfg["markets_output"]["partition_metrics_csv"])
+    quantiles_out = Path(cfg["markets_output"]["quantiles_csv"])
+    capture_out = Path(cfg["markets_output"]["capture_csv"])
+    negative_out = Path(cfg["markets_output"]["negative_prices_csv"])
+    cube_out = Path(cfg["markets_output"]["cube_csv"])
+    findings_out = Path(cfg["markets_output"]["findings_md"])
+    log_path = cfg["reports"]["metadata_log"]
+
+    cache_ref = cfg["markets_output"].get("cache_json")
+
+    markets_cfg = cfg.get("markets", {})
+    windows = [int(w) for w in markets_cfg.get("rolling_windows_h", DEFAULT_ROLLING_WINDOWS)]
+    if not windows or min(windows) <= 0:
+        raise SystemExit("markets.rolling_windows_h must list positive window lengths")
+    # Quantiles come from mergeable t-digests per (region, hub, month), so no full value list is kept.
+    compression = float(markets_cfg.get("quantile_compression", 200))
+    engine = resolve_engine(str(markets_cfg.get("engine", "auto")), "markets")
+    peak = {**DEFAULT_PEAK_BLOCK, **(markets_cfg.get("peak_block") or {})}
+    if not 0 <= int(peak["start_hour"]) < int(peak["end_hour"]) <= 24:
+        raise SystemExit("markets.peak_block needs 0 <= start_hour < end_hour <= 24")
+    # Site shapes come from the memory-mapped profile library when `make profiles` has built one.
+    library_dir = Path(cfg.get("profile_library", {}).get("dir", "data/profiles"))
+    library = open_library(library_dir)
+    settings = {
+        "windows": windows,
+        "compression": compression,
+        "engine": engine,
+        "peak_block": peak,
+        "library_dir": str(library_dir) if library is not None else "",
+    }
+    shapes = dict(PROFILE_SHAPES)
+    shapes.update(markets_cfg.get("profiles") or {})
+
+    # The cache holds every partition's accumulators and price tail for the panel it last
+    # saw. An identical panel skips the stage; a panel that only appended hours reads and
+    # enriches just the appended bytes and folds them into the saved accumulators.
+    cache_path = Path(cache_ref) if cache_ref else None
+    library_sha = sha256_file(library_dir / DATA_FILE) if library is not None else ""
+    home = [str(cfg.get("region", "")), str(cfg["hub"])]
+    cache_key = _cache_key(settings, shapes, library_sha, home)
+    panel_sha = sha256_file(panel_path)
+    panel_bytes = panel_path.stat().st_size
+    outputs = (
+        hourly_out,
+        metrics_out,
+        partition_metrics_out,
+        quantiles_out,
+        capture_out,
+        negative_out,
+        cube_out,
+        findings_out,
+    )
+    cache = _load_cache(cache_path, cache_key) if cache_path else None
+    if cache and not all(p.exists() for p in outputs):
+        cache = None
+    if cache and cache["panel_sha256"] == panel_sha:
+        log_metadata(log_path, f"markets:cache=hit hours={cache['panel_rows']} partitions={len(cache['partitions'])}")
+        return
+    resume = bool(
+        cache
+        and panel_bytes > cache["panel_bytes"]
+        and sha256_file(panel_path, limit=cache["panel_bytes"]) == cache["panel_sha256"]
+    )
+    states = {(s["region"], s["hub"]): _thaw_partition(s) for s in cache["partitions"]} if resume else {}
+
+    # Each (region, hub) is its own price series; rows keep panel order within a partition.
+    rows = _read_panel_rows(panel_path, cache["panel_bytes"] if resume else 0)
+    groups: dict[tuple[str, str], list[dict[str, str]]] = {}
+    positions: dict[tuple[str, str], list[int]] = {}
+    for pos, row in enumerate(rows):
+        groups.setdefault((row["region"], row["hub"]), []).append(row)
+        positions.setdefault((row["region"], row["hub"]), []).append(pos)
+
+    workers = resolve_workers(int(markets_cfg.get("workers", 0)), len(groups))
+    parts = _run_partitions(groups, settings, workers, states)
+    merged = _merge_partitions(parts, compression)
+
+    # The single-series marts (metrics, captures, findings) describe the configured region/hub,
+    # which finance prices its project at; the pooled ALL/ALL view lives in the partition mart.
+    primary = _home_partition(parts, merged, *home)
+    metrics, captures = _partition_metrics(primary, shapes, library, engine)
+    partition_rows: list[dict[str, str]] = []
+    for acc in parts + [merged]:
+        part_metrics = metrics if acc is primary else _partition_metrics(acc, shapes, library, engine)[0]
+        for name, val in part_metrics:
+            partition_rows.append({"region": acc["region"], "hub": acc["hub"], "metric": name, "value": f"{val:.6f}"})
+
+    solar_capture = captures["solar"]["capture_price"]
+    wind_capture = captures["wind"]["capture_price"]
+    negative_hours = primary["negative_hours"]
+    total_hours = merged["hours"]
+
+    # Enriched rows go back into panel order, so appending new hours matches a full rewrite.
+    enriched: list[dict[str, str]] = [{}] * len(rows)
+    for part in parts:
+        for pos, row in zip(positions.get((part["region"], part["hub"]), []), part.pop("enriched"), strict=True):
+            enriched[pos] = row
     hourly_out.parent.mkdir(parents=True, exist_ok=True)
-    with hourly_out.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=HOURLY_COLUMNS)
-        writer.writeheader()
+    with hourly_out.open("a" if resume else "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_hourly_columns(windows))
+        if not resume:
+            writer.writeheader()
         writer.writerows(enriched)
 
     metrics_out.parent.mkdir(parents=True, exist_ok=True)
@@ -181,6 +943,43 @@ def run_markets() -> None:
         for name, val in metrics:
             writer.writerow({"metric": name, "value": f"{val:.6f}"})
 
+    with partition_metrics_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=PARTITION_METRIC_COLUMNS)
+        writer.writeheader()
+        writer.writerows(partition_rows)
+
+    with capture_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CAPTURE_COLUMNS)
+        writer.writeheader()
+        for name, cap in captures.items():
+            writer.writerow(
+                {
+                    "profile": name,
+                    "resolution": str(cap["resolution"]),
+                    "hours": str(cap["hours"]),
+                    "generation_weight": f"{cap['generation_weight']:.4f}",
+                    "capture_price_usd_mwh": f"{cap['capture_price']:.6f}",
+                    "capture_ratio": f"{cap['capture_ratio']:.6f}",
+                }
+            )
+
+    with negative_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=NEGATIVE_PRICE_COLUMNS)
+        writer.writeheader()
+        for acc in parts + [merged]:
+            writer.writerows(_negative_rows(acc))
+
+    with cube_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CUBE_COLUMNS)
+        writer.writeheader()
+        for acc in parts + [merged]:
+            writer.writerows(_cube_rows(acc))
+
+    with quantiles_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=QUANTILE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(_quantile_rows(parts, merged["digests"]["ALL"]))
+
     findings_out.parent.mkdir(parents=True, exist_ok=True)
     insights = [
         (
@@ -193,7 +992,7 @@ def run_markets() -> None:
         ),
         (
             "Negative-price risk",
-            f"Negative-price hours are {negative_hours} of {len(rows)} ({metrics[7][1]*100:.1f}%).",
+            f"Negative-price hours are {negative_hours} of {primary['hours']} ({metrics[7][1]*100:.1f}%).",
         ),
     ]
     with findings_out.open("w", encoding="utf-8") as f:
@@ -202,11 +1001,27 @@ def run_markets() -> None:
         f.write("2. " + insights[1][0] + ": " + insights[1][1] + "\n")
         f.write("3. " + insights[2][0] + ": " + insights[2][1] + "\n")
 
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "config_key": cache_key,
+            "panel_sha256": panel_sha,
+            "panel_bytes": panel_bytes,
+            "panel_rows": total_hours,
+            "partitions": parts,
+        }
+        cache_path.write_text(json.dumps(payload), encoding="utf-8")
+
     log_metadata(
         log_path,
         (
             "markets:"
-            f"hours={len(rows)} "
+            f"cache={'resume' if resume else 'miss' if cache_path else 'off'} "
+            f"hours={total_hours} "
+            f"new_hours={len(rows)} "
+            f"partitions={len(parts)} "
+            f"metrics_partition={primary['region']}/{primary['hub']} "
+            f"workers={workers} "
             f"solar_capture={solar_capture:.3f} "
             f"wind_capture={wind_capture:.3f} "
             f"negative_hours={negative_hours}"
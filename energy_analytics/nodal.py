@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from energy_analytics.config import load_config
+from energy_analytics.engines import percentile, resolve_engine, resolve_workers
+from energy_analytics.metadata import log_metadata
+from energy_analytics.provenance import sha256_file
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional accelerator; the pure-Python path is always available.
+    np = None
+
+STORE_VERSION = 1
+DATA_FILE = "prices.f32"
+INDEX_FILE = "index.json"
+
+BASIS_COLUMNS = [
+    "settlement_point",
+    "hub",
+    "hours",
+    "mean_price_usd_mwh",
+    "mean_basis_usd_mwh",
+    "mean_abs_basis_usd_mwh",
+    "std_basis_usd_mwh",
+    "min_basis_usd_mwh",
+    "p05_basis_usd_mwh",
+    "p50_basis_usd_mwh",
+    "p95_basis_usd_mwh",
+    "max_basis_usd_mwh",
+    "congested_share",
+    "negative_basis_share",
+]
+
+
+def _axis_sha(timestamps: list[str]) -> str:
+    return hashlib.sha256("\n".join(timestamps).encode("utf-8")).hexdigest()
+
+
+def _write_index(root: Path, nodes: list[str], timestamps: list[str], source_sha: str) -> dict[str, Any]:
+    index = {
+        "version": STORE_VERSION,
+        "dtype": "<f4",
+        "nodes": nodes,
+        "timestamps": timestamps,
+        "axis_sha256": _axis_sha(timestamps),
+        "source_sha256": source_sha,
+    }
+    (root / INDEX_FILE).write_text(json.dumps(index), encoding="utf-8")
+    return index
+
+
+def write_store(
+    root: Path, nodes: list[str], timestamps: list[str], series: Iterable[list[float]], source_sha: str = ""
+) -> dict[str, Any]:
+    """Write one price series per node (in ``nodes`` order) as a node-major float32 matrix.
+
+    Each node's hours are one contiguous little-endian record, so a chunk of nodes is one
+    slice of the file. Missing hours are NaN.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    with (root / DATA_FILE).open("wb") as f:
+        for values in series:
+            if len(values) != len(timestamps):
+                raise SystemExit(f"Nodal series has {len(values)} hours; expected {len(timestamps)}")
+            record = array("f", values)
+            if sys.byteorder != "little":
+                record.byteswap()
+            record.tofile(f)
+    return _write_index(root, nodes, timestamps, source_sha)
+
+
+def build_store(csv_path: Path, root: Path, timestamps: list[str]) -> dict[str, Any]:
+    """Transpose long-format ``timestamp_utc,settlement_point,price_usd_mwh`` rows into the store.
+
+    Two streaming passes: the first collects settlement points, the second writes each price
+    straight into its (node, hour) slot of a NaN-filled, memory-mapped file. Memory stays at
+    the node and hour indexes however many rows the file holds. Rows for hours outside
+    ``timestamps`` are dropped; a repeated (node, hour) keeps the last price.
+    """
+    nodes: set[str] = set()
+    with csv_path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            nodes.add(row["settlement_point"])
+    ordered = sorted(nodes)
+    hours = len(timestamps)
+    root.mkdir(parents=True, exist_ok=True)
+    blank = array("f", [math.nan]) * hours
+    if sys.byteorder != "little":
+        blank.byteswap()
+    with (root / DATA_FILE).open("wb") as f:
+        for _ in ordered:
+            blank.tofile(f)
+    if ordered and hours:
+        slot = {name: i * hours for i, name in enumerate(ordered)}
+        hour_of = {ts: h for h, ts in enumerate(timestamps)}
+        pack = struct.Struct("<f").pack_into
+        with (root / DATA_FILE).open("r+b") as raw, csv_path.open("r", encoding="utf-8", newline="") as f:
+            buf = mmap.mmap(raw.fileno(), 0)
+            for row in csv.DictReader(f):
+                h = hour_of.get(row["timestamp_utc"])
+                if h is not None:
+                    pack(buf, 4 * (slot[row["settlement_point"]] + h), float(row["price_usd_mwh"]))
+            buf.flush()
+            buf.close()
+    return _write_index(root, ordered, timestamps, sha256_file(csv_path))
+
+
+def open_store(root: Path) -> dict[str, Any] | None:
+    """Memory-map a nodal store read-only; ``None`` if ``root`` holds no store.
+
+    ``values`` is a flat float32 view (ndarray with numpy, memoryview without); node ``i``
+    occupies ``values[i * hours : (i + 1) * hours]``.
+    """
+    index_path = root / INDEX_FILE
+    if not index_path.exists():
+        return None
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    if index.get("version") != STORE_VERSION:
+        raise SystemExit(f"Unsupported nodal store at {root}; rerun `make nodal`")
+    hours = len(index["timestamps"])
+    size = len(index["nodes"]) * hours * 4
+    store: dict[str, Any] = {"root": str(root), "index": index, "hours": hours, "buffer": None, "values": None}
+    if size == 0:
+        store["values"] = np.zeros(0, dtype="<f4") if np is not None else array("f")
+        return store
+    with (root / DATA_FILE).open("rb") as f:
+        buf = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+    store["buffer"] = buf
+    if np is not None:
+        store["values"] = np.frombuffer(buf, dtype="<f4")
+    elif sys.byteorder == "little":
+        store["values"] = memoryview(buf).cast("f")
+    else:
+        values = array("f")
+        values.frombytes(buf[:])
+        values.byteswap()
+        store["values"] = values
+    return store
+
+
+def _stats_row(node: str, hub: str, node_mean: float, basis: list[float], threshold: float) -> dict[str, str]:
+    n = len(basis)
+    mean = sum(basis) / n
+    ordered = sorted(basis)
+    stats = {
+        "mean_price_usd_mwh": node_mean,
+        "mean_basis_usd_mwh": mean,
+        "mean_abs_basis_usd_mwh": sum(abs(b) for b in basis) / n,
+        "std_basis_usd_mwh": math.sqrt(sum((b - mean) ** 2 for b in basis) / n),
+        "min_basis_usd_mwh": ordered[0],
+        "p05_basis_usd_mwh": percentile(ordered, 5),
+        "p50_basis_usd_mwh": percentile(ordered, 50),
+        "p95_basis_usd_mwh": percentile(ordered, 95),
+        "max_basis_usd_mwh": ordered[-1],
+        "congested_share": sum(1 for b in basis if abs(b) >= threshold) / n,
+        "negative_basis_share": sum(1 for b in basis if b < 0) / n,
+    }
+    return {"settlement_point": node, "hub": hub, "hours": str(n), **{k: _fmt(k, v) for k, v in stats.items()}}
+
+
+def _fmt(column: str, value: float) -> str:
+    # Prices come from single-precision storage, so USD columns keep four decimals.
+    return f"{value:.6f}" if column.endswith("_share") else f"{value:.4f}"
+
+
+def _basis_chunk(
+    root: str, start: int, stop: int, hub: str, hub_prices: list[float], threshold: float, engine: str
+) -> list[dict[str, str]]:
+    """Basis statistics for nodes ``start:stop`` of the store, against ``hub_prices``.
+
+    Runs in a pool worker: the store is mapped again in each process and only this chunk's
+    rows are touched, so peak memory is one ``(chunk, hours)`` block however many nodes the
+    store holds. Hours a node did not report (NaN) are left out of its statistics.
+    """
+    store = open_store(Path(root))
+    nodes = store["index"]["nodes"][start:stop]
+    hours = store["hours"]
+    block = store["values"][start * hours : stop * hours]
+    out: list[dict[str, str]] = []
+    if engine == "numpy":
+        prices = np.asarray(block, dtype=np.float64).reshape(len(nodes), hours)
+        basis = prices - np.asarray(hub_prices, dtype=np.float64)[None, :]
+        valid = ~np.isnan(basis)
+        counts = valid.sum(axis=1)
+        filled = np.where(valid, basis, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = filled.sum(axis=1) / counts
+            node_mean = np.where(valid, prices, 0.0).sum(axis=1) / counts
+            mean_abs = np.abs(filled).sum(axis=1) / counts
+            std = np.sqrt(np.where(valid, (basis - mean[:, None]) ** 2, 0.0).sum(axis=1) / counts)
+            congested = (valid & (np.abs(filled) >= threshold)).sum(axis=1) / counts
+            negative = (valid & (filled < 0)).sum(axis=1) / counts
+            pct = np.nanpercentile(basis, [0, 5, 50, 95, 100], axis=1) if basis.size else np.zeros((5, 0))
+        for i, node in enumerate(nodes):
+            if not counts[i]:
+                continue
+            stats = [
+                node_mean[i],
+                mean[i],
+                mean_abs[i],
+                std[i],
+                *(pct[k, i] for k in range(5)),
+                congested[i],
+                negative[i],
+            ]
+            out.append(
+                {
+                    "settlement_point": node,
+                    "hub": hub,
+                    "hours": str(int(counts[i])),
+                    **{col: _fmt(col, float(v)) for col, v in zip(BASIS_COLUMNS[3:], stats, strict=True)},
+                }
+            )
+        return out
+    for i, node in enumerate(nodes):
+        series = block[i * hours : (i + 1) * hours]
+        pairs = [(float(p), h) for p, h in zip(series, hub_prices, strict=True) if not math.isnan(p)]
+        if not pairs:
+            continue
+        node_mean = sum(p for p, _ in pairs) / len(pairs)
+        out.append(_stats_row(node, hub, node_mean, [p - h for p, h in pairs], threshold))
+    return out
+
+
+def nodal_basis(
+    root: Path, hub: str, hub_prices: list[float], threshold: float, chunk_nodes: int, engine: str, workers: int
+) -> list[dict[str, str]]:
+    """Per-node basis statistics, computed in chunks of ``chunk_nodes`` across a process pool.
+
+    Rows come back in store (settlement point) order; nodes with no reported hours are
+    skipped.
+    """
+    store = open_store(root)
+    if store is None:
+        return []
+    count = len(store["index"]["nodes"])
+    chunks = [(start, min(start + chunk_nodes, count)) for start in range(0, count, chunk_nodes)]
+    args = (hub, hub_prices, threshold, engine)
+    if workers <= 1 or len(chunks) <= 1:
+        results = [_basis_chunk(str(root), start, stop, *args) for start, stop in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            futures = [pool.submit(_basis_chunk, str(root), start, stop, *args) for start, stop in chunks]
+            results = [fut.result() for fut in futures]
+    return [row for chunk in results for row in chunk]
+
+
+def run_nodal() -> None:
+    cfg = load_config()
+    panel_path = Path(cfg["curated_output"]["panel_csv"])
+    nodal_raw = Path(cfg["raw_output"].get("nodal", "data/raw/ercot_nodal_prices.csv"))
+    basis_out = Path(cfg["nodal_output"]["basis_csv"])
+    log_path = cfg["reports"]["metadata_log"]
+
+    nodal_cfg = cfg.get("nodal", {})
+    if not nodal_raw.exists():
+        log_metadata(log_path, f"nodal:skipped reason=no nodal prices at {nodal_raw}")
+        return
+    engine = resolve_engine(str(nodal_cfg.get("engine", "auto")), "nodal")
+    chunk_nodes = int(nodal_cfg.get("chunk_nodes", 256))
+    if chunk_nodes <= 0:
+        raise SystemExit("nodal.chunk_nodes must be > 0")
+    threshold = float(nodal_cfg.get("congestion_threshold_usd_mwh", 5.0))
+    hub = nodal_cfg.get("hub") or cfg["hub"]
+    root = Path(nodal_cfg.get("store_dir", "data/curated/nodal"))
+
+    # The hour axis is the hub's panel hours, so every basis is node price minus hub price.
+    timestamps: list[str] = []
+    hub_prices: list[float] = []
+    with panel_path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["hub"] == hub:
+                timestamps.append(row["timestamp_utc"])
+                hub_prices.append(float(row["price_usd_mwh"]))
+    if not timestamps:
+        raise SystemExit(f"Nodal basis needs {hub} prices in {panel_path}")
+
+    # The columnar store is rebuilt only when the raw nodal file or the hour axis changed.
+    store = open_store(root)
+    rebuilt = not (
+        store is not None
+        and store["index"]["source_sha256"] == sha256_file(nodal_raw)
+        and store["index"]["axis_sha256"] == _axis_sha(timestamps)
+    )
+    if rebuilt:
+        store = None  # release the old mapping before its file is rewritten
+        build_store(nodal_raw, root, timestamps)
+
+    workers = resolve_workers(int(nodal_cfg.get("workers", 0)))
+    rows = nodal_basis(root, hub, hub_prices, threshold, chunk_nodes, engine, workers)
+
+    basis_out.parent.mkdir(parents=True, exist_ok=True)
+    with basis_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BASIS_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    widest = max(rows, key=lambda r: float(r["mean_abs_basis_usd_mwh"]), default=None)
+    log_metadata(
+        log_path,
+        (
+            "nodal:"
+            f"engine={engine} hub={hub} nodes={len(rows)} hours={len(timestamps)} "
+            f"chunk_nodes={chunk_nodes} workers={workers} store={'rebuilt' if rebuilt else 'reused'} "
+            f"widest={widest['settlement_point'] if widest else ''}"
+        ),
+    )
+
+
+if __name__ == "__main__":
+    run_nodal()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import csv
+import json
+import mmap
+import sys
+from array import array
+from pathlib import Path
+from typing import Any
+
+from energy_analytics.config import load_config
+from energy_analytics.metadata import log_metadata
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional accelerator; the pure-Python path is always available.
+    np = None
+
+SOLAR_SHAPE_24 = [
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.02,
+    0.08,
+    0.20,
+    0.40,
+    0.62,
+    0.80,
+    0.92,
+    1.0,
+    0.96,
+    0.84,
+    0.62,
+    0.35,
+    0.12,
+    0.03,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+]
+
+WIND_SHAPE_24 = [
+    0.70,
+    0.72,
+    0.74,
+    0.76,
+    0.73,
+    0.68,
+    0.60,
+    0.54,
+    0.50,
+    0.46,
+    0.44,
+    0.42,
+    0.40,
+    0.41,
+    0.43,
+    0.48,
+    0.56,
+    0.64,
+    0.72,
+    0.78,
+    0.82,
+    0.80,
+    0.76,
+    0.72,
+]
+
+# Built-in hour-of-day shapes; markets.profiles adds 24-value (hour of day) or 8760-value
+# (hour of year) shapes by name.
+PROFILE_SHAPES = {"solar": SOLAR_SHAPE_24, "wind": WIND_SHAPE_24}
+HOURS_PER_YEAR = 8760
+LIBRARY_VERSION = 1
+DATA_FILE = "profiles.f32"
+INDEX_FILE = "index.json"
+
+
+def _key(profile_id: str, year: int) -> str:
+    return f"{profile_id}@{year}"
+
+
+def _expand(name: str, shape: list[float]) -> list[float]:
+    """Hour-of-year weights; 24-value shapes repeat every day."""
+    if len(shape) == HOURS_PER_YEAR:
+        return [float(v) for v in shape]
+    if len(shape) == 24:
+        return [float(shape[h % 24]) for h in range(HOURS_PER_YEAR)]
+    raise SystemExit(f"Profile {name} has {len(shape)} values; expected 24 or {HOURS_PER_YEAR}")
+
+
+def write_library(root: Path, shapes: dict[tuple[str, int], list[float]]) -> dict[str, Any]:
+    """Write ``(profile_id, year) -> weights`` as one little-endian float32 file plus a JSON index.
+
+    Records are 8760 values each, ordered by year then profile id, so every profile of a year
+    is one contiguous block that readers can view as a matrix without copying.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    ordered = sorted(shapes, key=lambda k: (k[1], k[0]))
+    entries: dict[str, int] = {}
+    with (root / DATA_FILE).open("wb") as f:
+        for record, (profile_id, year) in enumerate(ordered):
+            values = array("f", _expand(profile_id, shapes[(profile_id, year)]))
+            if sys.byteorder != "little":
+                values.byteswap()
+            values.tofile(f)
+            entries[_key(profile_id, year)] = record
+    index = {
+        "version": LIBRARY_VERSION,
+        "dtype": "<f4",
+        "hours_per_year": HOURS_PER_YEAR,
+        "records": len(ordered),
+        "entries": entries,
+    }
+    (root / INDEX_FILE).write_text(json.dumps(index, indent=2), encoding="utf-8")
+    return index
+
+
+def open_library(root: Path) -> dict[str, Any] | None:
+    """Memory-map a profile library read-only; ``None`` if ``root`` holds no library.
+
+    The float32 file is mapped once and sliced in place, so concurrent readers share the
+    page cache instead of each parsing and holding their own copy. The mapping is released
+    when the returned dict and every view taken from it are dropped.
+    """
+    index_path = root / INDEX_FILE
+    if not index_path.exists():
+        return None
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    if index.get("version") != LIBRARY_VERSION or index.get("hours_per_year") != HOURS_PER_YEAR:
+        raise SystemExit(f"Unsupported profile library at {root}; rebuild it with `make profiles`")
+    size = index["records"] * HOURS_PER_YEAR * 4
+    lib: dict[str, Any] = {"root": str(root), "index": index, "buffer": None, "values": None}
+    if size == 0:
+        lib["values"] = np.zeros(0, dtype="<f4") if np is not None else array("f")
+        return lib
+    with (root / DATA_FILE).open("rb") as f:
+        buf = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+    lib["buffer"] = buf
+    if np is not None:
+        lib["values"] = np.frombuffer(buf, dtype="<f4")
+    elif sys.byteorder == "little":
+        lib["values"] = memoryview(buf).cast("f")
+    else:
+        # Big-endian hosts without numpy cannot view the file in place; fall back to one copy.
+        values = array("f")
+        values.frombytes(buf[:])
+        values.byteswap()
+        lib["values"] = values
+    return lib
+
+
+def library_profiles(lib: dict[str, Any]) -> dict[str, list[int]]:
+    """Profile id -> sorted years available in the library."""
+    out: dict[str, list[int]] = {}
+    for key in lib["index"]["entries"]:
+        profile_id, year = key.rsplit("@", 1)
+        out.setdefault(profile_id, []).append(int(year))
+    return {k: sorted(v) for k, v in sorted(out.items())}
+
+
+def profile_weights(lib: dict[str, Any], profile_id: str, year: int) -> Any:
+    """Zero-copy 8760-hour view of one profile-year (ndarray with numpy, memoryview without)."""
+    record = lib["index"]["entries"].get(_key(profile_id, year))
+    if record is None:
+        raise SystemExit(f"Profile library has no {profile_id} weights for {year}")
+    start = record * HOURS_PER_YEAR
+    return lib["values"][start : start + HOURS_PER_YEAR]
+
+
+def year_block(lib: dict[str, Any], year: int) -> tuple[list[str], Any]:
+    """All profile ids stored for ``year`` and their weights as one contiguous block.
+
+    With numpy the block is a ``(profiles, 8760)`` view into the mapped file; without it, a
+    flat view of ``profiles * 8760`` values.
+    """
+    found = sorted(
+        (rec, key.rsplit("@", 1)[0]) for key, rec in lib["index"]["entries"].items() if key.endswith(f"@{year}")
+    )
+    if not found:
+        return [], None
+    first, last = found[0][0], found[-1][0]
+    block = lib["values"][first * HOURS_PER_YEAR : (last + 1) * HOURS_PER_YEAR]
+    if np is not None:
+        block = block.reshape(len(found), HOURS_PER_YEAR)
+    return [name for _, name in found], block
+
+
+def _panel_years(panel_path: Path) -> list[int]:
+    years: set[int] = set()
+    with panel_path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            years.add(int(row["timestamp_utc"][0:4]))
+    return sorted(years)
+
+
+def _read_source_csv(path: Path) -> dict[tuple[str, int], list[float]]:
+    """Long-format site shapes: ``profile_id,year,hour_of_year,weight`` (hour_of_year 0-8759)."""
+    out: dict[tuple[str, int], list[float]] = {}
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            key = (row["profile_id"], int(row["year"]))
+            weights = out.setdefault(key, [0.0] * HOURS_PER_YEAR)
+            weights[int(row["hour_of_year"])] = float(row["weight"])
+    return out
+
+
+def run_profiles() -> None:
+    cfg = load_config()
+    panel_path = Path(cfg["curated_output"]["panel_csv"])
+    lib_cfg = cfg.get("profile_library", {})
+    root = Path(lib_cfg.get("dir", "data/profiles"))
+    log_path = cfg["reports"]["metadata_log"]
+
+    years = [int(y) for y in lib_cfg.get("years") or _panel_years(panel_path)]
+    base = dict(PROFILE_SHAPES)
+    base.update(cfg.get("markets", {}).get("profiles") or {})
+    shapes: dict[tuple[str, int], list[float]] = {}
+    for name, shape in base.items():
+        for year in years:
+            shapes[(name, year)] = _expand(name, shape)
+    for source in lib_cfg.get("source_csvs") or []:
+        shapes.update(_read_source_csv(Path(source)))
+
+    index = write_library(root, shapes)
+    log_metadata(
+        log_path,
+        f"profiles:records={index['records']} years={','.join(str(y) for y in years)} dir={root}",
+    )
+
+
+if __name__ == "__main__":
+    run_profiles()
@@ -12,14 +12,18 @@ def now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def sha256_file(path: Path) -> str:
+def sha256_file(path: Path, limit: int | None = None) -> str:
+    """Hex sha256 of ``path``, or of only its first ``limit`` bytes."""
     h = hashlib.sha256()
+    remaining = limit
     with path.open("rb") as f:
-        while True:
-            chunk = f.read(8192)
+        while remaining is None or remaining > 0:
+            chunk = f.read(8192 if remaining is None else min(8192, remaining))
             if not chunk:
                 break
             h.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
     return h.hexdigest()
 
 
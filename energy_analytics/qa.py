@@ -5,6 +5,8 @@ import json
 from pathlib import Path
 
 from energy_analytics.config import load_config
+from energy_analytics.finance import IRR_STATUSES
+from energy_analytics.forecast import DEFAULT_MODELS, metric_names
 from energy_analytics.metadata import log_metadata
 
 REQUIRED_COLUMNS = {
@@ -53,6 +55,7 @@ FINANCE_SCENARIO_REQUIRED_COLUMNS = {
     "npv_musd",
     "after_tax_npv_musd",
     "irr",
+    "irr_status",
     "min_dscr",
     "avg_dscr",
     "lcoe_usd_mwh",
@@ -194,7 +197,9 @@ def run_qa() -> None:
     with forecast_metrics_path.open("r", encoding="utf-8", newline="") as f:
         for row in csv.DictReader(f):
             forecast_metrics[row["metric"]] = row["value"]
-    for req in ("naive_rmse_mw", "weather_rmse_mw", "naive_mape", "weather_mape", "best_model"):
+    # The configured models decide which rows the forecast stage wrote.
+    forecast_models = list(cfg.get("forecast", {}).get("models") or DEFAULT_MODELS)
+    for req in metric_names(forecast_models):
         if req not in forecast_metrics:
             failures.append(f"Forecast metric missing: {req}")
 
@@ -255,6 +260,8 @@ def run_qa() -> None:
             continue
         if min_dscr > avg_dscr:
             failures.append(f"Finance scenario row {i}: min_dscr cannot exceed avg_dscr")
+        if row["irr_status"] not in IRR_STATUSES:
+            failures.append(f"Finance scenario row {i}: unknown irr_status {row['irr_status']!r}")
 
     contract_types = {row["contract_type"] for row in finance_rows if "contract_type" in row}
     if {"merchant", "contracted"} - contract_types:
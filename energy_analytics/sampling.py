@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional accelerator; the pure-Python path is always available.
+    np = None
+
+DISTRIBUTIONS = ("normal", "uniform", "triangular")
+
+
+def draw_numpy(spec: dict[str, Any], rng: np.random.Generator, size: tuple[int, ...]) -> np.ndarray:
+    """``size`` draws from a distribution spec (``distribution`` plus its parameters)."""
+    kind = spec.get("distribution", "normal")
+    if kind == "normal":
+        return rng.normal(float(spec["mean"]), float(spec.get("std", 0.0)), size)
+    if kind == "uniform":
+        return rng.uniform(float(spec["low"]), float(spec["high"]), size)
+    if kind == "triangular":
+        return rng.triangular(float(spec["low"]), float(spec["mode"]), float(spec["high"]), size)
+    raise SystemExit(f"Unsupported distribution={kind}; expected {'|'.join(DISTRIBUTIONS)}")
+
+
+def draw(spec: dict[str, Any], rng: random.Random) -> float:
+    """One draw from a distribution spec; same specs as ``draw_numpy``."""
+    kind = spec.get("distribution", "normal")
+    if kind == "normal":
+        return rng.gauss(float(spec["mean"]), float(spec.get("std", 0.0)))
+    if kind == "uniform":
+        return rng.uniform(float(spec["low"]), float(spec["high"]))
+    if kind == "triangular":
+        return rng.triangular(float(spec["low"]), float(spec["high"]), float(spec["mode"]))
+    raise SystemExit(f"Unsupported distribution={kind}; expected {'|'.join(DISTRIBUTIONS)}")
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+
+def p2_init(q: float) -> dict[str, Any]:
+    """Empty P-square (Jain & Chlamtac) estimator for quantile ``q``.
+
+    Five markers track the running quantile in O(1) memory and O(1) time per update;
+    the state is a plain dict so it can be persisted alongside other pipeline state.
+    """
+    return {
+        "q": q,
+        "count": 0,
+        "heights": [],
+        "positions": [1, 2, 3, 4, 5],
+        "desired": [1.0, 1.0 + 2.0 * q, 1.0 + 4.0 * q, 3.0 + 2.0 * q, 5.0],
+        "increments": [0.0, q / 2.0, q, (1.0 + q) / 2.0, 1.0],
+    }
+
+
+def _p2_parabolic(h: list[float], n: list[int], i: int, d: int) -> float:
+    return h[i] + d / (n[i + 1] - n[i - 1]) * (
+        (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+        + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+    )
+
+
+def p2_update(state: dict[str, Any], x: float) -> None:
+    state["count"] += 1
+    h = state["heights"]
+    if state["count"] <= 5:
+        h.append(x)
+        h.sort()
+        return
+
+    n = state["positions"]
+    if x < h[0]:
+        h[0] = x
+        k = 0
+    elif x >= h[4]:
+        h[4] = x
+        k = 3
+    else:
+        k = 0
+        while x >= h[k + 1]:
+            k += 1
+    for i in range(k + 1, 5):
+        n[i] += 1
+    desired = state["desired"]
+    for i, inc in enumerate(state["increments"]):
+        desired[i] += inc
+
+    for i in (1, 2, 3):
+        d = desired[i] - n[i]
+        if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+            step = 1 if d > 0 else -1
+            candidate = _p2_parabolic(h, n, i, step)
+            if not h[i - 1] < candidate < h[i + 1]:
+                candidate = h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+            h[i] = candidate
+            n[i] += step
+
+
+def p2_value(state: dict[str, Any]) -> float:
+    h = state["heights"]
+    if not h:
+        return 0.0
+    if state["count"] <= 5:
+        return h[int(round((len(h) - 1) * state["q"]))]
+    return h[2]
+
+
+def pinball_loss(actual: float, pred: float, q: float) -> float:
+    diff = actual - pred
+    return q * diff if diff >= 0 else (q - 1.0) * diff
+
+
+def tdigest_init(compression: float = 200.0) -> dict[str, Any]:
+    """Empty merging t-digest (Dunning) with the k2 (logit) scale function.
+
+    Centroids are ``[mean, weight]`` pairs kept sorted by mean; the number retained is bounded
+    by about ``compression``, independent of how many values are added. Digests over disjoint
+    partitions merge into one digest of their union, so quantiles can be computed per
+    partition in parallel and combined afterwards. Until a digest holds more than
+    ``compression`` values it keeps each one and reports exact nearest-rank quantiles.
+    """
+    return {
+        "compression": float(compression),
+        "centroids": [],
+        "buffer": [],
+        "count": 0.0,
+        "min": math.inf,
+        "max": -math.inf,
+    }
+
+
+def _tdigest_k(q: float, compression: float, total: float) -> float:
+    # k2 keeps centroids near both tails tiny, which is where p95/p99 readings live.
+    q = min(max(q, 1e-15), 1.0 - 1e-15)
+    norm = 4.0 * math.log(max(total / compression, 1.0)) + 24.0
+    return compression / norm * math.log(q / (1.0 - q))
+
+
+def _tdigest_compress(state: dict[str, Any]) -> None:
+    if not state["buffer"]:
+        return
+    items = sorted(state["centroids"] + state["buffer"])
+    state["buffer"] = []
+    total = sum(w for _, w in items)
+    compression = state["compression"]
+    if total <= compression:
+        # Small digests keep every value, so their quantiles stay exact (see tdigest_quantile).
+        state["centroids"] = [list(c) for c in items]
+        return
+    merged: list[list[float]] = []
+    mean, weight = items[0]
+    before = 0.0
+    k_lo = _tdigest_k(0.0, compression, total)
+    for x, w in items[1:]:
+        # Merge while the combined centroid spans at most one unit of the scale function.
+        if _tdigest_k((before + weight + w) / total, compression, total) - k_lo <= 1.0:
+            weight += w
+            mean += (x - mean) * w / weight
+        else:
+            merged.append([mean, weight])
+            before += weight
+            k_lo = _tdigest_k(before / total, compression, total)
+            mean, weight = x, w
+    merged.append([mean, weight])
+    state["centroids"] = merged
+
+
+def tdigest_add(state: dict[str, Any], x: float, weight: float = 1.0) -> None:
+    state["buffer"].append([x, weight])
+    state["count"] += weight
+    if x < state["min"]:
+        state["min"] = x
+    if x > state["max"]:
+        state["max"] = x
+    if len(state["buffer"]) >= 5 * state["compression"]:
+        _tdigest_compress(state)
+
+
+def tdigest_merge(state: dict[str, Any], other: dict[str, Any]) -> None:
+    """Fold ``other`` into ``state`` in place; ``other`` is left unchanged."""
+    if not other["count"]:
+        return
+    state["buffer"].extend([list(c) for c in other["centroids"]] + [list(c) for c in other["buffer"]])
+    state["count"] += other["count"]
+    state["min"] = min(state["min"], other["min"])
+    state["max"] = max(state["max"], other["max"])
+    _tdigest_compress(state)
+
+
+def tdigest_quantile(state: dict[str, Any], q: float) -> float:
+    _tdigest_compress(state)
+    cents = state["centroids"]
+    if not cents:
+        return 0.0
+    if len(cents) == 1:
+        return cents[0][0]
+    if all(w == 1.0 for _, w in cents):
+        # Every value is still held: nearest-rank quantile, as the pre-digest exact reports used.
+        return cents[int(round((len(cents) - 1) * q))][0]
+    # Each centroid sits at the midpoint of its cumulative weight; the extremes anchor the tails.
+    target = q * state["count"]
+    pos = cents[0][1] / 2.0
+    if target <= pos:
+        return state["min"] + (cents[0][0] - state["min"]) * (target / pos if pos else 0.0)
+    for (m0, w0), (m1, w1) in zip(cents, cents[1:], strict=False):
+        nxt = pos + (w0 + w1) / 2.0
+        if target <= nxt:
+            return m0 + (m1 - m0) * (target - pos) / (nxt - pos)
+        pos = nxt
+    tail = state["count"] - pos
+    return cents[-1][0] + (state["max"] - cents[-1][0]) * ((target - pos) / tail if tail else 1.0)
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from energy_analytics.config import load_config
+from energy_analytics.engines import resolve_engine, resolve_workers
+from energy_analytics.metadata import log_metadata
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional accelerator; the pure-Python path is always available.
+    np = None
+
+SWEEP_COLUMNS = [
+    "config_id",
+    "power_mw",
+    "duration_h",
+    "energy_mwh",
+    "round_trip_efficiency",
+    "max_cycles_per_day",
+    "days",
+    "revenue_usd",
+    "annual_revenue_usd",
+    "revenue_usd_per_kw_year",
+    "cycles_per_year",
+]
+
+DISPATCH_COLUMNS = ["timestamp_utc", "price_usd_mwh", "charge_mw", "discharge_mw", "soc_mwh"]
+
+DEFAULT_BATTERY = {"power_mw": 100.0, "duration_h": 4.0, "round_trip_efficiency": 0.86, "max_cycles_per_day": 1.0}
+
+
+def _grid(battery: dict[str, float], steps_per_hour: int) -> dict[str, Any]:
+    """State-of-charge grid for one battery shape, in units of one MW of power.
+
+    Power is rated at the storage terminals: at most ``power_mw`` MWh enters or leaves the
+    battery each hour, and the grid sees that divided by sqrt(rte) when charging and
+    multiplied by it when discharging. One step is ``1 / steps_per_hour`` MWh per MW, so a
+    full-power hour moves the state by ``steps_per_hour`` levels and the energy limit and
+    daily discharge cap are integer level counts.
+    """
+    duration = float(battery["duration_h"])
+    rte = float(battery["round_trip_efficiency"])
+    cycles = float(battery["max_cycles_per_day"])
+    if duration <= 0 or not 0 < rte <= 1 or cycles <= 0:
+        raise SystemExit(
+            "storage batteries need duration_h > 0, 0 < round_trip_efficiency <= 1, max_cycles_per_day > 0"
+        )
+    levels = max(1, round(duration * steps_per_hour))
+    return {
+        "levels": levels + 1,
+        "moves": steps_per_hour,
+        "step_mwh": 1.0 / steps_per_hour,
+        "charge_cost": 1.0 / math.sqrt(rte),
+        "discharge_gain": math.sqrt(rte),
+        "discharge_cap": round(cycles * levels),
+    }
+
+
+def _dispatch_numpy(prices: Any, grid: dict[str, Any], keep_choices: bool = False) -> tuple[Any, Any, list[Any] | None]:
+    """Optimal daily arbitrage for every day at once, per MW of power.
+
+    Forward dynamic programme over (state of charge, energy discharged so far) with the
+    days as the leading array axis: each hour tries every charge/discharge move as a
+    shifted slice of the value array, so the work per hour is a handful of array
+    operations however many days there are. Days start and end empty.
+    Returns revenue per day, discharged levels per day and, if asked, the chosen move
+    per (hour, day, state) for schedule recovery.
+    """
+    days = prices.shape[0]
+    n_s, n_c, q = grid["levels"], grid["discharge_cap"] + 1, grid["moves"]
+    best = np.full((days, n_s, n_c), -np.inf)
+    best[:, 0, 0] = 0.0
+    choices: list[Any] | None = [] if keep_choices else None
+    for h in range(prices.shape[1]):
+        p = prices[:, h][:, None, None]
+        new = best.copy()
+        choice = np.zeros((days, n_s, n_c), dtype=np.int8) if keep_choices else None
+        for d in range(1, min(q, n_s - 1) + 1):
+            cost = p * (d * grid["step_mwh"] * grid["charge_cost"])
+            cand = best[:, : n_s - d, :] - cost
+            _improve(new[:, d:, :], cand, choice[:, d:, :] if keep_choices else None, d)
+            if d < n_c:
+                gain = p * (d * grid["step_mwh"] * grid["discharge_gain"])
+                cand = best[:, d:, : n_c - d] + gain
+                _improve(new[:, : n_s - d, d:], cand, choice[:, : n_s - d, d:] if keep_choices else None, -d)
+        best = new
+        if keep_choices:
+            choices.append(choice)
+    final = best[:, 0, :]
+    discharged = np.argmax(final, axis=1)
+    return final[np.arange(days), discharged], discharged, choices
+
+
+def _improve(target: Any, cand: Any, choice: Any, move: int) -> None:
+    better = cand > target
+    np.copyto(target, cand, where=better)
+    if choice is not None:
+        choice[better] = move
+
+
+def _dispatch_python(
+    prices: list[list[float]], grid: dict[str, Any], keep_choices: bool = False
+) -> tuple[list[float], list[int], list[list[int]] | None]:
+    """Same programme as ``_dispatch_numpy``, one day at a time.
+
+    With ``keep_choices`` the third item is each day's levels moved per hour.
+    """
+    n_s, n_c, q = grid["levels"], grid["discharge_cap"] + 1, grid["moves"]
+    revenue: list[float] = []
+    discharged: list[int] = []
+    schedules: list[list[int]] | None = [] if keep_choices else None
+    # Move order and price products match _dispatch_numpy exactly: staying put wins ties, then
+    # charge 1, discharge 1, charge 2, ... so both engines pick the same schedule on equal revenue.
+    buy = [d * grid["step_mwh"] * grid["charge_cost"] for d in range(q + 1)]
+    sell = [d * grid["step_mwh"] * grid["discharge_gain"] for d in range(q + 1)]
+    for day in prices:
+        best = [[-math.inf] * n_c for _ in range(n_s)]
+        best[0][0] = 0.0
+        choices: list[list[list[int]]] = []
+        for p in day:
+            new = [row[:] for row in best]
+            choice = [[0] * n_c for _ in range(n_s)]
+            for s in range(n_s):
+                for c in range(n_c):
+                    top = new[s][c]
+                    move = 0
+                    for d in range(1, q + 1):
+                        if s - d >= 0:
+                            cand = best[s - d][c] - p * buy[d]
+                            if cand > top:
+                                top, move = cand, d
+                        if s + d < n_s and c - d >= 0:
+                            cand = best[s + d][c - d] + p * sell[d]
+                            if cand > top:
+                                top, move = cand, -d
+                    new[s][c] = top
+                    choice[s][c] = move
+            best = new
+            choices.append(choice)
+        c_best = max(range(n_c), key=lambda c: (best[0][c], -c))
+        revenue.append(best[0][c_best])
+        discharged.append(c_best)
+        if schedules is not None:
+            s_at, c_at, moves = 0, c_best, [0] * len(day)
+            for h in range(len(day) - 1, -1, -1):
+                d = choices[h][s_at][c_at]
+                moves[h] = d
+                s_at -= d
+                c_at -= max(-d, 0)
+            schedules.append(moves)
+    return revenue, discharged, schedules
+
+
+def _schedule(prices: Any, choices: list[Any], discharged: Any) -> Any:
+    """Walk the stored moves backwards from each day's optimum; returns levels moved per hour."""
+    days = prices.shape[0]
+    rows = np.arange(days)
+    s = np.zeros(days, dtype=np.int64)
+    c = np.asarray(discharged, dtype=np.int64)
+    moves = np.zeros(prices.shape, dtype=np.int64)
+    for h in range(prices.shape[1] - 1, -1, -1):
+        d = choices[h][rows, s, c].astype(np.int64)
+        moves[:, h] = d
+        s = s - d
+        c = c - np.maximum(-d, 0)
+    return moves
+
+
+def _shape_key(battery: dict[str, float]) -> tuple[float, float, float]:
+    return (float(battery["duration_h"]), float(battery["round_trip_efficiency"]), float(battery["max_cycles_per_day"]))
+
+
+def _solve_shape(shape: tuple[float, float, float], prices: Any, steps_per_hour: int, engine: str) -> dict[str, float]:
+    """Pool worker: revenue and discharged energy per MW for one battery shape."""
+    grid = _grid(
+        dict(zip(("duration_h", "round_trip_efficiency", "max_cycles_per_day"), shape, strict=True)), steps_per_hour
+    )
+    if engine == "numpy":
+        revenue, discharged, _ = _dispatch_numpy(np.asarray(prices, dtype=np.float64), grid)
+        return {"revenue": float(revenue.sum()), "discharged_mwh": float(discharged.sum()) * grid["step_mwh"]}
+    revenue, discharged, _ = _dispatch_python(prices, grid)
+    return {"revenue": sum(revenue), "discharged_mwh": sum(discharged) * grid["step_mwh"]}
+
+
+def sweep_batteries(
+    prices: list[list[float]],
+    batteries: list[dict[str, float]],
+    steps_per_hour: int = 4,
+    engine: str = "auto",
+    workers: int = 1,
+) -> list[dict[str, Any]]:
+    """Arbitrage revenue for every battery configuration against daily price rows.
+
+    Dispatch is price-taking, so revenue scales linearly with power: each distinct
+    (duration, efficiency, cycle cap) shape is solved once per MW and the results are
+    scaled to every power rating. Distinct shapes run concurrently across a process pool.
+    """
+    engine = resolve_engine(engine, "storage")
+    shapes = list(dict.fromkeys(_shape_key(b) for b in batteries))
+    payload = np.asarray(prices, dtype=np.float64) if engine == "numpy" else prices
+    if workers <= 1 or len(shapes) <= 1:
+        solved = [_solve_shape(shape, payload, steps_per_hour, engine) for shape in shapes]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shapes))) as pool:
+            futures = [pool.submit(_solve_shape, shape, payload, steps_per_hour, engine) for shape in shapes]
+            solved = [fut.result() for fut in futures]
+    per_mw = dict(zip(shapes, solved, strict=True))
+
+    days = len(prices)
+    out: list[dict[str, Any]] = []
+    for b in batteries:
+        power = float(b["power_mw"])
+        result = per_mw[_shape_key(b)]
+        revenue = result["revenue"] * power
+        energy = power * float(b["duration_h"])
+        annual = revenue * 365.0 / days if days else 0.0
+        out.append(
+            {
+                **b,
+                "energy_mwh": energy,
+                "days": days,
+                "revenue_usd": revenue,
+                "annual_revenue_usd": annual,
+                "revenue_usd_per_kw_year": annual / (power * 1000.0) if power else 0.0,
+                "cycles_per_year": (
+                    (result["discharged_mwh"] * power / energy) * 365.0 / days if days and energy else 0.0
+                ),
+            }
+        )
+    return out
+
+
+def _config_id(b: dict[str, float]) -> str:
+    return f"p{b['power_mw']:g}_d{b['duration_h']:g}_rte{b['round_trip_efficiency']:g}_c{b['max_cycles_per_day']:g}"
+
+
+def _batteries(storage_cfg: dict[str, Any]) -> list[dict[str, float]]:
+    """Base battery first, then the Cartesian product of every swept setting."""
+    base = {k: float(v) for k, v in {**DEFAULT_BATTERY, **(storage_cfg.get("base") or {})}.items()}
+    sweep = storage_cfg.get("sweep") or {}
+    unknown = set(sweep) - set(DEFAULT_BATTERY)
+    if unknown:
+        raise SystemExit(f"Unknown storage.sweep settings: {sorted(unknown)}")
+    keys = list(sweep)
+    out = [base]
+    for values in itertools.product(*(sweep[k] for k in keys)):
+        b = {**base, **{k: float(v) for k, v in zip(keys, values, strict=True)}}
+        if b not in out:
+            out.append(b)
+    return out
+
+
+def _daily_prices(rows: list[dict[str, str]]) -> tuple[list[str], list[list[float]], list[list[str]]]:
+    """Complete UTC days (24 hourly prices) in panel order; partial days are dropped."""
+    by_day: dict[str, list[dict[str, str]]] = {}
+    for row in rows:
+        by_day.setdefault(row["timestamp_utc"][0:10], []).append(row)
+    days, prices, stamps = [], [], []
+    for day, hours in by_day.items():
+        if len(hours) != 24 or len({r["timestamp_utc"] for r in hours}) != 24:
+            continue
+        hours = sorted(hours, key=lambda r: r["timestamp_utc"])
+        days.append(day)
+        prices.append([float(r["price_usd_mwh"]) for r in hours])
+        stamps.append([r["timestamp_utc"] for r in hours])
+    return days, prices, stamps
+
+
+def run_storage() -> None:
+    cfg = load_config()
+    panel_path = Path(cfg["curated_output"]["panel_csv"])
+    sweep_out = Path(cfg["storage_output"]["sweep_csv"])
+    dispatch_out = Path(cfg["storage_output"]["dispatch_csv"])
+    log_path = cfg["reports"]["metadata_log"]
+
+    storage_cfg = cfg.get("storage", {})
+    engine = resolve_engine(str(storage_cfg.get("engine", "auto")), "storage")
+    steps_per_hour = int(storage_cfg.get("soc_steps_per_hour", 4))
+    if steps_per_hour <= 0:
+        raise SystemExit("storage.soc_steps_per_hour must be > 0")
+
+    with panel_path.open("r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    # One price series: the configured hub, else the panel's first.
+    hub = storage_cfg.get("hub") or (rows[0]["hub"] if rows else "")
+    rows = [r for r in rows if r["hub"] == hub]
+    days, prices, stamps = _daily_prices(rows)
+    if not days:
+        raise SystemExit(f"Storage valuation needs at least one complete day of {hub} prices")
+
+    batteries = _batteries(storage_cfg)
+    workers = resolve_workers(int(storage_cfg.get("workers", 0)))
+    results = sweep_batteries(prices, batteries, steps_per_hour, engine, workers)
+
+    sweep_out.parent.mkdir(parents=True, exist_ok=True)
+    with sweep_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        for r in results:
+            writer.writerow(
+                {
+                    "config_id": _config_id(r),
+                    "power_mw": f"{r['power_mw']:g}",
+                    "duration_h": f"{r['duration_h']:g}",
+                    "energy_mwh": f"{r['energy_mwh']:g}",
+                    "round_trip_efficiency": f"{r['round_trip_efficiency']:g}",
+                    "max_cycles_per_day": f"{r['max_cycles_per_day']:g}",
+                    "days": str(r["days"]),
+                    "revenue_usd": f"{r['revenue_usd']:.2f}",
+                    "annual_revenue_usd": f"{r['annual_revenue_usd']:.2f}",
+                    "revenue_usd_per_kw_year": f"{r['revenue_usd_per_kw_year']:.4f}",
+                    "cycles_per_year": f"{r['cycles_per_year']:.2f}",
+                }
+            )
+
+    # Hourly schedule for the base battery, recovered by walking the stored moves back.
+    base = batteries[0]
+    grid = _grid(base, steps_per_hour)
+    power = float(base["power_mw"])
+    if engine == "numpy":
+        price_arr = np.asarray(prices, dtype=np.float64)
+        _, discharged, choices = _dispatch_numpy(price_arr, grid, keep_choices=True)
+        moves = _schedule(price_arr, choices, discharged).tolist()
+    else:
+        moves = _dispatch_python(prices, grid, keep_choices=True)[2]
+    with dispatch_out.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=DISPATCH_COLUMNS)
+        writer.writeheader()
+        for day_prices, day_stamps, day_moves in zip(prices, stamps, moves, strict=True):
+            soc = 0.0
+            for ts, price, move in zip(day_stamps, day_prices, day_moves, strict=True):
+                # Moves are state-of-charge levels; grid power is the energy change net of losses.
+                stored = move * grid["step_mwh"] * power
+                soc += stored
+                charge = stored * grid["charge_cost"] if stored > 0 else 0.0
+                discharge = -stored * grid["discharge_gain"] if stored < 0 else 0.0
+                writer.writerow(
+                    {
+                        "timestamp_utc": ts,
+                        "price_usd_mwh": f"{price:.4f}",
+                        "charge_mw": f"{charge:.4f}",
+                        "discharge_mw": f"{discharge:.4f}",
+                        "soc_mwh": f"{soc:.4f}",
+                    }
+                )
+
+    top = max(results, key=lambda r: r["revenue_usd_per_kw_year"])
+    log_metadata(
+        log_path,
+        (
+            "storage:"
+            f"engine={engine} hub={hub} days={len(days)} configs={len(results)} "
+            f"base_annual_revenue={results[0]['annual_revenue_usd']:.0f} "
+            f"best={_config_id(top)} best_usd_per_kw_year={top['revenue_usd_per_kw_year']:.2f}"
+        ),
+    )
+
+
+if __name__ == "__main__":
+    run_storage()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from energy_analytics.profiles import HOURS_PER_YEAR
+
+# ERCOT's 5x16 block: hour-ending 7-22 Central Prevailing Time, Monday to Friday, taken at
+# the standard-time offset (no DST shift).
+DEFAULT_PEAK_BLOCK = {"utc_offset_h": -6, "start_hour": 6, "end_hour": 22, "weekdays": [0, 1, 2, 3, 4]}
+
+
+def time_parts(timestamps: list[str], peak: dict[str, Any]) -> dict[str, list[Any]]:
+    """Calendar fields for each ``YYYY-MM-DDTHH`` UTC timestamp, parsed in one pass.
+
+    Each timestamp is sliced once; calendar lookups are cached per UTC and per local day, so
+    a year of hours costs 8760 integer parses and about 365 ``date`` calls. ``month`` is the
+    UTC ``YYYY-MM``. ``local_month`` and ``on_peak`` place the hour in the peak-block cube: the
+    hour is shifted by ``utc_offset_h`` and is on-peak on ``weekdays`` from ``start_hour`` up
+    to (not including) ``end_hour``.
+    """
+    offset = int(peak["utc_offset_h"])
+    start, end = int(peak["start_hour"]), int(peak["end_hour"])
+    weekdays = {int(d) for d in peak["weekdays"]}
+    days: dict[str, tuple[int, str, int, int]] = {}
+    local_days: dict[int, tuple[str, bool]] = {}
+    out: dict[str, list[Any]] = {k: [] for k in ("year", "month", "hour", "hour_of_year", "local_month", "on_peak")}
+    for ts in timestamps:
+        day = days.get(ts[0:10])
+        if day is None:
+            d = date(int(ts[0:4]), int(ts[5:7]), int(ts[8:10]))
+            day = (d.year, ts[0:7], d.timetuple().tm_yday, d.toordinal())
+            days[ts[0:10]] = day
+        year, month, yday, ordinal = day
+        hour = int(ts[11:13])
+        shift, local_hour = divmod(hour + offset, 24)
+        local = local_days.get(ordinal + shift)
+        if local is None:
+            d = date.fromordinal(ordinal + shift)
+            local = (f"{d.year:04d}-{d.month:02d}", d.weekday() in weekdays)
+            local_days[ordinal + shift] = local
+        out["year"].append(year)
+        out["month"].append(month)
+        out["hour"].append(hour)
+        # Leap-year Dec 31 hours reuse the last hour of the 8760 shape.
+        out["hour_of_year"].append(min((yday - 1) * 24 + hour, HOURS_PER_YEAR - 1))
+        out["local_month"].append(local[0])
+        out["on_peak"].append(local[1] and start <= local_hour < end)
+    return out
@@ -0,0 +1,29 @@
+import os
+import unittest
+
+from energy_analytics.engines import np, percentile, resolve_engine, resolve_workers
+
+
+class EngineTests(unittest.TestCase):
+    def test_resolve_engine_names_the_stage(self) -> None:
+        self.assertEqual(resolve_engine("python", "markets"), "python")
+        self.assertEqual(resolve_engine("auto", "markets"), "numpy" if np is not None else "python")
+        with self.assertRaisesRegex(SystemExit, "storage.engine=fast"):
+            resolve_engine("fast", "storage")
+
+    def test_resolve_workers_caps_at_tasks(self) -> None:
+        self.assertEqual(resolve_workers(3), 3)
+        self.assertEqual(resolve_workers(0), os.cpu_count() or 1)
+        self.assertEqual(resolve_workers(8, 2), 2)
+        self.assertEqual(resolve_workers(0, 0), 1)
+
+    def test_percentile_interpolates_between_ranks(self) -> None:
+        values = [1.0, 2.0, 4.0, 8.0]
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 100), 8.0)
+        self.assertAlmostEqual(percentile(values, 50), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,28 @@
 import unittest
+from multiprocessing import shared_memory
+from unittest import mock
 
-from energy_analytics.forecast import _linear_fit, _mape, _rmse
+from energy_analytics.bench import synthetic_panel
+from energy_analytics.forecast import (
+    DEFAULT_MODELS,
+    DEFAULT_SCENARIO_SETTINGS,
+    MODELS,
+    PANEL_FIELDS,
+    _backtest_columns,
+    _ensemble_forecasts,
+    _linear_fit,
+    _mape,
+    _model_worker,
+    _rls_state,
+    _rls_update,
+    _rmse,
+    _simulate_scenarios,
+    _weather_linear_forecasts,
+    metric_names,
+    np,
+    run_backtest,
+    run_day_ahead_backtest,
+)
 
 
 class ForecastTests(unittest.TestCase):
@@ -15,6 +37,162 @@ class ForecastTests(unittest.TestCase):
     def test_mape(self) -> None:
         self.assertAlmostEqual(_mape([10, 20], [9, 18]), 0.1, places=6)
 
+    def test_incremental_backtest_matches_refit(self) -> None:
+        temps = [50.0 + ((i * 7) % 13) for i in range(40)]
+        loads = [40000.0 + 120.0 * t + ((i * 11) % 17) * 25.0 for i, t in enumerate(temps)]
+        forecasts = _weather_linear_forecasts(temps, loads, start=24)
+        self.assertEqual(len(forecasts), 16)
+        for i, fc in zip(range(24, 40), forecasts, strict=True):
+            a, b = _linear_fit(temps[:i], loads[:i])
+            self.assertAlmostEqual(fc, a + b * temps[i], places=6)
+
+    def test_rolling_window_matches_windowed_refit(self) -> None:
+        temps = [50.0 + ((i * 7) % 13) for i in range(60)]
+        loads = [40000.0 + 120.0 * t + ((i * 11) % 17) * 25.0 for i, t in enumerate(temps)]
+        forecasts = _weather_linear_forecasts(temps, loads, start=24, window=30)
+        for i, fc in zip(range(24, 60), forecasts, strict=True):
+            a, b = _linear_fit(temps[max(0, i - 30) : i], loads[max(0, i - 30) : i])
+            self.assertAlmostEqual(fc, a + b * temps[i], places=6)
+
+    def test_rls_downdate_reverses_update(self) -> None:
+        state = _rls_state(2, ridge=1e-6)
+        for x in range(1, 11):
+            _rls_update(state, [(0, 1.0), (1, float(x))], 3.0 + 2.0 * x)
+        _rls_update(state, [(0, 1.0), (1, 99.0)], -500.0)
+        _rls_update(state, [(0, 1.0), (1, 99.0)], -500.0, sign=-1.0)
+        self.assertAlmostEqual(state["theta"][1], 2.0, places=3)
+        self.assertEqual(state["n"], 10)
+
+    def test_rls_recovers_least_squares_coefficients(self) -> None:
+        state = _rls_state(2, ridge=1e-6)
+        for x in range(1, 11):
+            _rls_update(state, [(0, 1.0), (1, float(x))], 3.0 + 2.0 * x)
+        self.assertAlmostEqual(state["theta"][0], 3.0, places=3)
+        self.assertAlmostEqual(state["theta"][1], 2.0, places=3)
+        self.assertEqual(state["n"], 10)
+
+    def test_backtest_columns_cover_default_models(self) -> None:
+        columns = _backtest_columns(DEFAULT_MODELS)
+        self.assertEqual(columns[:4], ["timestamp_utc", "actual_load_mw", "naive_forecast_mw", "weather_forecast_mw"])
+        for prefix in ("multi", "weekly", "profile", "ensemble"):
+            self.assertIn(f"{prefix}_forecast_mw", columns)
+            self.assertIn(f"{prefix}_abs_pct_error", columns)
+        self.assertEqual(columns[-3:], ["ensemble_p10_mw", "ensemble_p50_mw", "ensemble_p90_mw"])
+        self.assertEqual(len(columns), 2 + 2 * (len(DEFAULT_MODELS) + 1) + 3)
+
+    def test_metric_names_follow_configured_models(self) -> None:
+        names = metric_names(["naive_24h", "weather_linear"])
+        self.assertIn("ensemble_rmse_mw", names)
+        self.assertIn("weather_mape", names)
+        self.assertNotIn("multi_rmse_mw", names)
+
+    def test_ensemble_uses_only_past_errors(self) -> None:
+        actual = [10.0, 10.0, 10.0]
+        fc, weights = _ensemble_forecasts(actual, [[10.0, 10.0, 10.0], [14.0, 14.0, 14.0]])
+        self.assertAlmostEqual(fc[0], 12.0)
+        self.assertAlmostEqual(fc[1], 10.0)
+        self.assertEqual(weights, [1.0, 0.0])
+
+    def test_process_pool_matches_serial(self) -> None:
+        panel = synthetic_panel(24 * 10)
+        serial = run_backtest(panel, engine="python", workers=1)
+        pooled = run_backtest(panel, engine="python", workers=2)
+        self.assertEqual(serial["series"], pooled["series"])
+        self.assertEqual(serial["best_model"], pooled["best_model"])
+
+    def test_worker_errors_are_not_masked_by_shared_memory(self) -> None:
+        def boom(panel, start, window, state):
+            raise ValueError("model failed")
+
+        n, start = 48, 24
+        shm = shared_memory.SharedMemory(create=True, size=8 * (len(PANEL_FIELDS) * n + (n - start)))
+        try:
+            with mock.patch.dict(MODELS, {"boom": {"prefix": "boom", "python": boom, "numpy": boom}}):
+                for engine in ["python"] + (["numpy"] if np is not None else []):
+                    with self.assertRaisesRegex(ValueError, "model failed"):
+                        _model_worker(shm.name, "boom", 0, n, start, engine, 0, {})
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_resumed_backtest_matches_full_run(self) -> None:
+        panel = synthetic_panel(24 * 12)
+        head = {key: values[: 24 * 9] for key, values in panel.items()}
+        for window in (0, 72):
+            full = run_backtest(panel, engine="python", window=window)
+            first = run_backtest(head, engine="python", window=window)
+            resumed = run_backtest(panel, engine="python", window=window, state=first["state"])
+            self.assertEqual(resumed["start"], 24 * 9)
+            for key, values in resumed["series"].items():
+                self.assertEqual(values, full["series"][key][24 * 8 :])
+            self.assertEqual(resumed["metrics"], full["metrics"])
+
+    def test_segments_partition_every_backtest_hour(self) -> None:
+        panel = synthetic_panel(24 * 40)
+        result = run_backtest(panel, engine="python")
+        n = len(result["series"]["actual"])
+        for dim in ("hour_of_day", "month", "temperature_band"):
+            rows = [r for r in result["segments"] if r["dimension"] == dim and r["prefix"] == "weather"]
+            self.assertEqual(sum(r["hours"] for r in rows), n)
+            sse = sum(r["rmse"] ** 2 * r["hours"] for r in rows)
+            self.assertAlmostEqual((sse / n) ** 0.5, result["metrics"]["weather_rmse"], places=6)
+        self.assertEqual(len([r for r in result["segments"] if r["dimension"] == "hour_of_day"]), 24 * 6)
+
+    def test_day_ahead_horizon_one_matches_naive_lag(self) -> None:
+        panel = synthetic_panel(24 * 8)
+        result = run_day_ahead_backtest(panel, issue_hour=6, engine="python")
+        self.assertEqual(result["issues"], [30, 54, 78, 102, 126, 150])
+        for d, t in enumerate(result["issues"]):
+            self.assertEqual(result["series"]["naive"][d], panel["load_mw"][t - 24 : t])
+            self.assertEqual(result["series"]["actual"][d], panel["load_mw"][t : t + 24])
+        self.assertEqual(len(result["horizon_metrics"]["ensemble"]["rmse"]), 24)
+
+    def test_degenerate_scenarios_compound_fixed_growth(self) -> None:
+        settings = dict(
+            DEFAULT_SCENARIO_SETTINGS,
+            draws=50,
+            growth={"distribution": "uniform", "low": 0.03, "high": 0.03},
+            growth_volatility=0.0,
+            peak_ratio={"distribution": "normal", "mean": 1.2, "std": 0.0},
+        )
+        bands = _simulate_scenarios(1000.0, settings, engine="python")
+        for k in range(3):
+            for n, (avg, peak) in enumerate(zip(bands["avg"][k], bands["peak"][k], strict=True), start=1):
+                self.assertAlmostEqual(avg, 1000.0 * 1.03**n, places=6)
+                self.assertAlmostEqual(peak, avg * 1.2, places=6)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_scenario_engines_agree_statistically(self) -> None:
+        py = _simulate_scenarios(1000.0, DEFAULT_SCENARIO_SETTINGS, engine="python")
+        vec = _simulate_scenarios(1000.0, DEFAULT_SCENARIO_SETTINGS, engine="numpy")
+        for key in ("avg", "peak"):
+            for a_rows, b_rows in zip(py[key], vec[key], strict=True):
+                for a, b in zip(a_rows, b_rows, strict=True):
+                    self.assertLess(abs(a - b) / b, 0.005)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_day_ahead_numpy_matches_python(self) -> None:
+        panel = synthetic_panel(24 * 30)
+        for window in (0, 24 * 7):
+            py = run_day_ahead_backtest(panel, engine="python", window=window)
+            vec = run_day_ahead_backtest(panel, engine="numpy", window=window)
+            for key, rows in py["series"].items():
+                for a, b in zip(rows, vec["series"][key], strict=True):
+                    for x, y in zip(a, b, strict=True):
+                        self.assertAlmostEqual(x, y, places=2)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_engine_matches_python(self) -> None:
+        panel = synthetic_panel(24 * 60)
+        py = run_backtest(panel, engine="python")
+        vec = run_backtest(panel, engine="numpy")
+        for key in ("naive", "weather", "weather_ape", "multi"):
+            for a, b in zip(py["series"][key], vec["series"][key], strict=True):
+                self.assertAlmostEqual(a, b, places=4)
+        for key, val in py["metrics"].items():
+            self.assertAlmostEqual(val, vec["metrics"][key], places=4)
+        self.assertEqual(py["best_model"], vec["best_model"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -11,7 +11,9 @@ class IngestTests(unittest.TestCase):
         manifest_path = Path("reports/ingestion_manifest.json")
         self.assertTrue(manifest_path.exists())
         payload = json.loads(manifest_path.read_text(encoding="utf-8"))
-        self.assertEqual(payload.get("record_count"), 4)
+        # load, price, weather, queue plus the optional nodal sample configured by default.
+        self.assertEqual(payload.get("record_count"), 5)
+        self.assertEqual(payload["records"][-1]["dataset"], "nodal")
         for rec in payload.get("records", []):
             self.assertTrue(rec.get("contract_valid"))
 
@@ -1,13 +1,430 @@
+import csv
+import json
+import tempfile
 import unittest
+from pathlib import Path
 
-from energy_analytics.finance import _annuity_payment, _npv
-from energy_analytics.markets import _moving_average
+from energy_analytics.finance import (
+    CASE_RESULTS,
+    _annuity_payment,
+    _build_case,
+    _npv,
+    _read_hourly_years,
+    evaluate_cases,
+    factorial_sweep,
+    hourly_capture_by_year,
+    irr_batch,
+    monte_carlo,
+    solve_irr,
+    sweep_case,
+    sweep_cases,
+    tornado,
+)
+from energy_analytics.markets import (
+    PROFILE_SHAPES,
+    _add_cube,
+    _add_negative_runs,
+    _cache_key,
+    _empty_negative_runs,
+    _home_partition,
+    _market_partition,
+    _merge_partitions,
+    _moving_average,
+    _negative_runs,
+    _partition_metrics,
+    _rolling_means,
+    _run_partitions,
+    _thaw_partition,
+    capture_prices,
+    np,
+)
+from energy_analytics.sketches import tdigest_quantile
+from energy_analytics.timeparts import DEFAULT_PEAK_BLOCK, time_parts
 
 
 class MarketsFinanceTests(unittest.TestCase):
     def test_moving_average(self) -> None:
         self.assertEqual(_moving_average([10, 20, 30], 2), [10.0, 15.0, 25.0])
 
+    def test_rolling_means_match_sliced_windows(self) -> None:
+        values = [float((i * 37) % 11 - 3) for i in range(60)]
+        out = _rolling_means(values, [1, 5, 24])
+        for w, means in out.items():
+            for i, m in enumerate(means):
+                chunk = values[max(0, i - w + 1) : i + 1]
+                self.assertAlmostEqual(m, sum(chunk) / len(chunk), places=9)
+
+    def test_capture_prices_match_row_weighting(self) -> None:
+        prices = [float((i * 13) % 40 - 5) for i in range(24 * 3)]
+        hod = [i % 24 for i in range(len(prices))]
+        hoy = list(range(len(prices)))
+        shapes = {"day": [1.0 if 6 <= h < 18 else 0.0 for h in range(24)], "annual": [0.5] * 8760}
+        engines = ["python"] + (["numpy"] if np is not None else [])
+        for engine in engines:
+            out = capture_prices(shapes, prices, hod, hoy, engine=engine)
+            day = [p for p, h in zip(prices, hod, strict=True) if 6 <= h < 18]
+            self.assertAlmostEqual(out["day"]["capture_price"], sum(day) / len(day), places=9)
+            self.assertAlmostEqual(out["annual"]["capture_ratio"], 1.0, places=9)
+            self.assertEqual(out["annual"]["resolution"], 8760)
+
+    def test_cache_key_tracks_the_home_partition(self) -> None:
+        settings = {"windows": [24], "compression": 100, "engine": "python", "peak_block": DEFAULT_PEAK_BLOCK}
+        north = _cache_key(settings, PROFILE_SHAPES, "", ["ERCOT", "HB_NORTH"])
+        self.assertEqual(north, _cache_key(settings, PROFILE_SHAPES, "", ["ERCOT", "HB_NORTH"]))
+        self.assertNotEqual(north, _cache_key(settings, PROFILE_SHAPES, "", ["ERCOT", "HB_WEST"]))
+        self.assertNotEqual(north, _cache_key(settings, PROFILE_SHAPES, "", ["", "HB_NORTH"]))
+
+    def test_partitions_merge_and_run_in_pool(self) -> None:
+        groups = {}
+        for k, (region, hub) in enumerate([("ERCOT", "HB_NORTH"), ("ERCOT", "HB_WEST"), ("SPP", "SOUTH")]):
+            groups[(region, hub)] = [
+                {
+                    "timestamp_utc": f"2025-01-{1 + i // 24:02d}T{i % 24:02d}:00:00Z",
+                    "region": region,
+                    "hub": hub,
+                    "price_usd_mwh": f"{(i * (k + 3)) % 60 - 10:.2f}",
+                }
+                for i in range(48 * (k + 1))
+            ]
+        settings = {"windows": [24, 168], "compression": 100.0, "engine": "python", "library_dir": ""}
+        serial = _run_partitions(groups, settings, workers=1)
+        pooled = _run_partitions(groups, settings, workers=3)
+        self.assertEqual([p["enriched"] for p in serial], [p["enriched"] for p in pooled])
+        self.assertEqual([(p["region"], p["hub"]) for p in serial], sorted(groups))
+
+        merged = dict(_partition_metrics(_merge_partitions(serial, 100.0), PROFILE_SHAPES, None, "python")[0])
+        prices = [float(r["price_usd_mwh"]) for rows in groups.values() for r in rows]
+        self.assertAlmostEqual(merged["avg_price_usd_mwh"], sum(prices) / len(prices), places=9)
+        self.assertEqual(merged["negative_price_hours"], sum(1 for p in prices if p < 0))
+        hod = [int(r["timestamp_utc"][11:13]) for rows in groups.values() for r in rows]
+        direct = capture_prices(PROFILE_SHAPES, prices, hod, hod, engine="python")
+        self.assertAlmostEqual(merged["solar_capture_price_usd_mwh"], direct["solar"]["capture_price"], places=9)
+
+        # The legacy metrics mart follows the configured hub, not the pooled ALL/ALL total.
+        pooled_total = _merge_partitions(serial, 100.0)
+        home = _home_partition(serial, pooled_total, "ERCOT", "HB_WEST")
+        self.assertEqual((home["region"], home["hub"]), ("ERCOT", "HB_WEST"))
+        self.assertEqual(home["hours"], 96)
+        self.assertIs(_home_partition(serial, pooled_total, "ERCOT", "HB_SOUTH"), pooled_total)
+
+    def test_partition_resume_matches_full_pass(self) -> None:
+        rows = [
+            {
+                "timestamp_utc": f"2025-{1 + i // 720:02d}-{1 + (i // 24) % 30:02d}T{i % 24:02d}:00:00Z",
+                "region": "ERCOT",
+                "hub": "HB_NORTH",
+                "price_usd_mwh": f"{((i * 37) % 101) * 0.7 - 12:.2f}",
+            }
+            for i in range(24 * 40)
+        ]
+        settings = {"windows": [24, 168, 720], "compression": 100.0, "engine": "python", "library_dir": ""}
+        full = _market_partition("ERCOT", "HB_NORTH", rows, settings)
+        first = _market_partition("ERCOT", "HB_NORTH", rows[:900], settings)
+        first_rows = first.pop("enriched")
+        state = _thaw_partition(json.loads(json.dumps(first)))
+        resumed = _market_partition("ERCOT", "HB_NORTH", rows[900:], settings, state)
+        self.assertEqual(first_rows + resumed["enriched"], full["enriched"])
+        self.assertEqual((resumed["hours"], resumed["negative_hours"]), (full["hours"], full["negative_hours"]))
+        for key in ("price_sum", "congestion_sum"):
+            self.assertAlmostEqual(resumed[key], full[key], places=6)
+        for a, b in zip(resumed["buckets"]["hod_sums"], full["buckets"]["hod_sums"], strict=True):
+            self.assertAlmostEqual(a, b, places=6)
+
+    def test_negative_runs_are_split_invariant(self) -> None:
+        prices = [5.0, -1.0, -2.0, 3.0, -1.0, -1.0, -1.0, 2.0, -4.0, -0.5]
+        engines = ["python"] + (["numpy"] if np is not None else [])
+        for engine in engines:
+            self.assertEqual(_negative_runs(prices, engine), ([1, 4, 8], [2, 3, 2]))
+        months = ["2025-01"] * 5 + ["2025-02"] * 5
+        hod = [i % 24 for i in range(len(prices))]
+        whole = _empty_negative_runs()
+        _add_negative_runs(whole, prices, months, hod, "python")
+        for cut in range(1, len(prices)):
+            split = _empty_negative_runs()
+            _add_negative_runs(split, prices[:cut], months[:cut], hod[:cut], engines[-1])
+            _add_negative_runs(split, prices[cut:], months[cut:], hod[cut:], "python")
+            self.assertEqual(split, whole, cut)
+        self.assertEqual(whole["lengths"], {2: 1, 3: 1})
+        self.assertEqual(whole["open"], 2)
+        self.assertEqual(whole["month_events"], {"2025-01": 2, "2025-02": 1})
+
+    def test_time_parts_and_peak_cube(self) -> None:
+        # 2025-01-03 is a Friday; 12:00 UTC is 06:00 CST (on-peak) and 04:00 UTC Saturday is
+        # still Friday 22:00 CST (off-peak, past the block).
+        stamps = [f"2025-01-{3 + i // 24:02d}T{i % 24:02d}:00:00Z" for i in range(72)]
+        cal = time_parts(stamps, DEFAULT_PEAK_BLOCK)
+        self.assertEqual((cal["hour"][12], cal["hour_of_year"][12], cal["year"][12]), (12, 60, 2025))
+        self.assertEqual([cal["on_peak"][i] for i in (11, 12, 27, 28)], [False, True, True, False])
+        self.assertFalse(any(cal["on_peak"][36:]))
+        self.assertEqual(cal["local_month"][0], "2025-01")
+        new_year = time_parts(["2025-01-01T03:00:00Z"], DEFAULT_PEAK_BLOCK)
+        self.assertEqual((new_year["month"][0], new_year["local_month"][0]), ("2025-01", "2024-12"))
+
+        prices = [float((i * 29) % 70 - 15) for i in range(72)]
+        congestion = [abs(p) / 3 for p in prices]
+        solar = [max(0.0, 1 - abs(i % 24 - 18) / 6) for i in range(72)]
+        wind = [0.5] * 72
+        engines = ["python"] + (["numpy"] if np is not None else [])
+        columns = (cal["local_month"], cal["on_peak"], prices, congestion, solar, wind)
+        cubes = []
+        for engine in engines:
+            cube = {}
+            _add_cube(cube, *[c[:30] for c in columns], engine)
+            _add_cube(cube, *[c[30:] for c in columns], engine)
+            cubes.append(cube)
+        peak = [p for p, on in zip(prices, cal["on_peak"], strict=True) if on]
+        cell = cubes[0]["2025-01|on_peak"]
+        self.assertEqual(cell[0], len(peak))
+        self.assertAlmostEqual(cell[1], sum(peak), places=9)
+        self.assertEqual((cell[-2], cell[-1]), (min(peak), max(peak)))
+        off_negative = sum(1 for p, on in zip(prices, cal["on_peak"], strict=True) if p < 0 and not on)
+        self.assertEqual(cubes[0]["2025-01|off_peak"][2], off_negative)
+        for other in cubes[1:]:
+            for key, values in cubes[0].items():
+                for a, b in zip(values, other[key], strict=True):
+                    self.assertAlmostEqual(a, b, places=9)
+
+    def test_case_grid_matches_build_case(self) -> None:
+        assumptions = {
+            "capacity_mw": 100,
+            "solar_capacity_factor": 0.3,
+            "project_life_years": 20,
+            "degradation_rate": 0.005,
+            "capex_per_kw": 1150,
+            "fixed_opex_per_kw_year": 18,
+            "debt_fraction": 0.6,
+            "debt_rate": 0.06,
+            "debt_tenor_years": 15,
+            "equity_discount_rate": 0.1,
+        }
+        cases = {
+            "contract_type": ["merchant", "contracted"] * 6,
+            "price_multiplier": [0.6 + 0.1 * i for i in range(12)],
+            "capex_multiplier": [0.9, 1.0, 1.1] * 4,
+            "debt_rate": [0.0, 0.05, 0.08] * 4,
+            "equity_discount_rate": [0.08] * 6 + [0.11] * 6,
+        }
+        engines = ["python"] + (["numpy"] if np is not None else [])
+        for engine in engines:
+            out = evaluate_cases(36.0, assumptions, cases, engine=engine)
+            for i in range(12):
+                overrides = {
+                    "debt_rate": cases["debt_rate"][i],
+                    "equity_discount_rate": cases["equity_discount_rate"][i],
+                }
+                ref = _build_case(
+                    36.0,
+                    {**assumptions, **overrides},
+                    cases["price_multiplier"][i],
+                    cases["capex_multiplier"][i],
+                    cases["contract_type"][i],
+                )
+                for key in CASE_RESULTS:
+                    self.assertAlmostEqual(out[key][i], ref[key], delta=1e-9 * max(1.0, abs(ref[key])), msg=key)
+        with self.assertRaises(SystemExit):
+            evaluate_cases(36.0, assumptions, {"project_life_years": [20, 25]})
+
+    def test_irr_solver_statuses(self) -> None:
+        rate, status = solve_irr([-100, 60, 60])
+        self.assertEqual(status, "ok")
+        self.assertAlmostEqual(_npv(rate, [-100, 60, 60]), 0.0, places=9)
+        rate, status = solve_irr([-100, 230, -132])
+        self.assertEqual(status, "multiple_roots")
+        self.assertIn(round(rate, 9), (0.1, 0.2))
+        rate, status = solve_irr([1, 2, 3])
+        self.assertEqual(status, "no_root")
+        self.assertNotEqual(rate, rate)
+        # Roots at 10% and 200%: Newton from 2.5 finds the one outside IRR_BRACKET, so the
+        # bracketed root comes back flagged; from 0.0 Newton finds 10% and the scan sees one root.
+        for guess, expected in [(2.5, "multiple_roots"), (0.0, "ok")]:
+            rate, status = solve_irr([-100, 410, -330], guess=guess)
+            self.assertEqual(status, expected)
+            self.assertAlmostEqual(rate, 0.1, places=9)
+            for engine in ["python"] + (["numpy"] if np is not None else []):
+                rates, statuses = irr_batch([[-100.0, 410.0, -330.0]], guesses=[guess], engine=engine)
+                self.assertEqual(statuses, [expected])
+                self.assertAlmostEqual(rates[0], 0.1, places=9)
+
+    def test_irr_batch_engines_agree(self) -> None:
+        rows = [[-100.0, 8.0 + i, 8.0 + i, 8.0 + i, 108.0 + i] for i in range(-40, 40, 4)]
+        rows += [[-56.0, -1.0, -1.0, 20.0, 20.0], [-100.0, 230.0, -132.0, 0.0, 0.0], [1.0, 2.0, 3.0, 0.0, 0.0]]
+        rates, statuses = irr_batch(rows, engine="python")
+        for rate, row in zip(rates[:-2], rows[:-2], strict=True):
+            self.assertAlmostEqual(_npv(rate, row) / 100.0, 0.0, places=9)
+        self.assertEqual(statuses[-2:], ["multiple_roots", "no_root"])
+        if np is not None:
+            fast, fast_statuses = irr_batch(np.asarray(rows), engine="numpy")
+            self.assertEqual(fast_statuses, statuses)
+            for a, b in zip(fast[:-1], rates[:-1], strict=True):
+                self.assertAlmostEqual(a, b, places=9)
+
+    def test_monte_carlo_is_seeded_per_chunk(self) -> None:
+        assumptions = {
+            "capacity_mw": 100,
+            "solar_capacity_factor": 0.3,
+            "project_life_years": 20,
+            "degradation_rate": 0.005,
+            "capex_per_kw": 1150,
+            "fixed_opex_per_kw_year": 18,
+            "debt_fraction": 0.6,
+            "debt_rate": 0.06,
+            "debt_tenor_years": 15,
+            "equity_discount_rate": 0.1,
+        }
+        settings = {
+            "draws": 900,
+            "chunk_draws": 250,
+            "seed": 7,
+            "contract_type": "contracted",
+            "dscr_covenant": 1.2,
+            "quantile_compression": 100,
+            "distributions": {
+                "price_multiplier": {"distribution": "normal", "mean": 1.6, "std": 0.2},
+                "debt_rate": {"distribution": "uniform", "low": 0.04, "high": 0.08},
+            },
+        }
+        engines = ["python"] + (["numpy"] if np is not None else [])
+        for engine in engines:
+            serial = monte_carlo(36.0, assumptions, settings, engine, workers=1)
+            pooled = monte_carlo(36.0, assumptions, settings, engine, workers=2)
+            self.assertEqual((serial["draws"], serial["chunks"]), (900, 4))
+            self.assertEqual(serial["breaches"], pooled["breaches"])
+            self.assertEqual(serial["digests"]["npv_musd"]["centroids"], pooled["digests"]["npv_musd"]["centroids"])
+            self.assertTrue(0 < serial["breaches"] < 900)
+            digest = serial["digests"]["min_dscr"]
+            p10, p50, p90 = (tdigest_quantile(digest, q) for q in (0.1, 0.5, 0.9))
+            self.assertLess(p10, p50)
+            self.assertLess(p50, p90)
+        # Some draws carry no debt: they cannot breach and have no DSCR to summarize.
+        unlevered = {
+            **settings,
+            "distributions": {"debt_fraction": {"distribution": "uniform", "low": -0.6, "high": 0.6}},
+        }
+        for engine in engines:
+            result = monte_carlo(36.0, assumptions, unlevered, engine, workers=1)
+            levered = result["digests"]["min_dscr"]["count"]
+            self.assertTrue(300 < levered < 600)
+            self.assertLessEqual(result["breaches"], levered)
+            self.assertGreater(tdigest_quantile(result["digests"]["min_dscr"], 0.0), 0.0)
+
+    def test_sweeps_share_cached_cases(self) -> None:
+        assumptions = {
+            "capacity_mw": 100,
+            "solar_capacity_factor": 0.3,
+            "project_life_years": 20,
+            "degradation_rate": 0.005,
+            "capex_per_kw": 1150,
+            "fixed_opex_per_kw_year": 18,
+            "debt_fraction": 0.6,
+            "debt_rate": 0.06,
+            "debt_tenor_years": 15,
+            "equity_discount_rate": 0.1,
+        }
+        drivers = [
+            {"name": "Price", "input": "price_multiplier", "low": 0.9, "high": 1.1},
+            {"name": "Debt rate", "input": "debt_rate", "low": 0.055, "high": 0.065},
+        ]
+        for engine in ["python"] + (["numpy"] if np is not None else []):
+            cache: dict = {}
+            rows = tornado(36.0, assumptions, {}, drivers, engine=engine, cache=cache)
+            self.assertEqual([r["driver"] for r in rows], ["Price", "Debt rate"])
+            self.assertGreater(rows[0]["delta_high"], 0)
+            self.assertLess(rows[1]["delta_high"], 0)
+            self.assertEqual(len(cache), 5)
+
+            values = {"price_multiplier": [0.9, 1, 1.1], "debt_rate": [0.06, 0.065]}
+            grid = factorial_sweep(36.0, assumptions, {}, values, engine=engine, cache=cache)
+            self.assertEqual(len(grid), 6)
+            self.assertEqual(grid[1]["inputs"], {"price_multiplier": 0.9, "debt_rate": 0.065})
+            # (0.9|1|1.1, 0.06) and (1, 0.065) were already valued by the tornado.
+            self.assertEqual(len(cache), 7)
+            ref = _build_case(36.0, {**assumptions, "debt_rate": 0.065}, 1.1, 1.0, "contracted")
+            self.assertAlmostEqual(grid[-1]["npv"], ref["npv"], delta=1e-6)
+            self.assertEqual(
+                sweep_case(36.0, assumptions, {"capex_multiplier": 1}, engine=engine),
+                sweep_case(36.0, assumptions, {}, engine=engine),
+            )
+
+        # Inputs that move together form one driver; a life that differs goes to its own grid.
+        combined = {
+            "name": "Both",
+            "low": {"price_multiplier": 0.9, "capex_multiplier": 1.1},
+            "high": {"price_multiplier": 1.1, "capex_multiplier": 0.9},
+        }
+        (row,) = tornado(36.0, assumptions, {}, [combined])
+        self.assertEqual(
+            (row["input"], row["low_value"]),
+            ("price_multiplier;capex_multiplier", "price_multiplier=0.9;capex_multiplier=1.1"),
+        )
+        ref = _build_case(36.0, assumptions, 0.9, 1.1, "contracted")
+        self.assertAlmostEqual(row["npv_low"], ref["npv"], delta=1e-6)
+        short, long = sweep_cases(36.0, assumptions, [{"project_life_years": 15}, {"project_life_years": 25}])
+        self.assertLess(short["npv"], long["npv"])
+        with self.assertRaises(SystemExit):
+            tornado(36.0, assumptions, {}, [{"input": "price", "low": 0.9, "high": 1.1}])
+
+    def test_hourly_revenue_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "hourly.csv"
+            with path.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["timestamp_utc", "region", "hub", "price_usd_mwh", "solar_profile"])
+                for day in (1, 2):
+                    for hour in range(24):
+                        solar = max(0.0, 1.0 - abs(hour - 12) / 6.0)
+                        stamp = f"2025-01-0{day}T{hour:02d}:00:00Z"
+                        writer.writerow([stamp, "ERCOT", "HB_NORTH", 20 + hour + day, solar])
+                writer.writerow(["2026-03-01T12:00:00Z", "ERCOT", "HB_NORTH", 99.0, 1.0])
+                writer.writerow(["2026-03-01T12:00:00Z", "ERCOT", "HB_WEST", 500.0, 1.0])
+            years, prices, weights = _read_hourly_years(path, "HB_NORTH", "solar")
+            if np is not None:
+                fast = _read_hourly_years(path, "HB_NORTH", "solar", engine="numpy")
+                self.assertEqual(fast[0], years)
+                self.assertTrue(np.allclose(fast[1], prices, rtol=0, atol=1e-12))
+                self.assertTrue(np.allclose(fast[2], weights, rtol=0, atol=1e-12))
+        self.assertEqual(years, [2025, 2026])
+        self.assertEqual(len(prices[0]), 8760)
+        # Unobserved hours take the mean of the same hour of day.
+        self.assertAlmostEqual(prices[0][24 * 200 + 5], 26.5)
+        self.assertEqual(prices[1][24 * 59 + 12], 99.0)
+        self.assertEqual(weights[1][0], 0.0)
+
+        captures = hourly_capture_by_year(prices, weights, engine="python")
+        observed = [(20 + h + d, max(0.0, 1.0 - abs(h - 12) / 6.0)) for d in (1, 2) for h in range(24)]
+        self.assertAlmostEqual(captures[0], sum(p * w for p, w in observed) / sum(w for _, w in observed))
+        self.assertEqual(captures[1], 99.0)
+        if np is not None:
+            for a, b in zip(hourly_capture_by_year(prices, weights, engine="numpy"), captures, strict=True):
+                self.assertAlmostEqual(a, b, places=9)
+
+        assumptions = {
+            "capacity_mw": 50,
+            "solar_capacity_factor": 0.25,
+            "project_life_years": 5,
+            "degradation_rate": 0.01,
+            "capex_per_kw": 1000,
+            "fixed_opex_per_kw_year": 15,
+            "debt_fraction": 0.5,
+            "debt_rate": 0.06,
+            "debt_tenor_years": 3,
+            "equity_discount_rate": 0.1,
+            "price_escalation_rate": 0.02,
+            "merchant_basis_discount": 0.9,
+        }
+        cases = {"contract_type": ["merchant", "contracted"], "price_multiplier": [1.2, 1.2]}
+        engines = ["python"] + (["numpy"] if np is not None else [])
+        for engine in engines:
+            out = evaluate_cases(30.0, assumptions, cases, engine=engine, capture_by_year=captures)
+            # Year 1 is the first market year's hourly generation x price; the strike ignores it.
+            self.assertAlmostEqual(out["year1_revenue"][0], 50 * 8760 * 0.25 * captures[0] * 1.2 * 0.9, places=4)
+            self.assertAlmostEqual(out["year1_revenue"][1], 50 * 8760 * 0.25 * (30.0 * 1.2 + 2.0), places=4)
+            ref = _build_case(30.0, assumptions, 1.2, 1.0, "merchant", captures)
+            self.assertAlmostEqual(out["npv"][0], ref["npv"], delta=1e-6)
+        # Market years replay in order over the five project years.
+        replayed = captures * 2 + captures[:1]
+        ref = _build_case(30.0, assumptions, 1.0, 1.0, "merchant", captures)
+        self.assertEqual(_build_case(30.0, assumptions, 1.0, 1.0, "merchant", replayed)["npv"], ref["npv"])
+
     def test_annuity_payment_positive(self) -> None:
         payment = _annuity_payment(1000, 0.05, 10)
         self.assertGreater(payment, 0)
@@ -0,0 +1,61 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from energy_analytics.nodal import build_store, nodal_basis, np, open_store
+
+
+class NodalBasisTests(unittest.TestCase):
+    def test_store_transposes_long_rows(self) -> None:
+        stamps = [f"2025-01-01T{h:02d}:00:00Z" for h in range(6)]
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / "nodal.csv"
+            with src.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["timestamp_utc", "region", "settlement_point", "price_usd_mwh"])
+                for h, ts in enumerate(stamps):
+                    writer.writerow([ts, "ERCOT", "B_NODE", f"{10 + h}"])
+                    if h != 2:
+                        writer.writerow([ts, "ERCOT", "A_NODE", f"{-h}"])
+                writer.writerow(["2025-01-02T00:00:00Z", "ERCOT", "A_NODE", "99"])
+            build_store(src, Path(tmp) / "store", stamps)
+            store = open_store(Path(tmp) / "store")
+            self.assertEqual(store["index"]["nodes"], ["A_NODE", "B_NODE"])
+            values = [float(v) for v in store["values"]]
+            self.assertEqual(values[6:], [10.0, 11.0, 12.0, 13.0, 14.0, 15.0])
+            self.assertNotEqual(values[2], values[2])  # A_NODE never reported hour 2
+            self.assertEqual(values[:2] + values[3:6], [0.0, -1.0, -3.0, -4.0, -5.0])
+
+    def test_chunks_pool_and_engines_agree(self) -> None:
+        stamps = [f"2025-01-{1 + h // 24:02d}T{h % 24:02d}:00:00Z" for h in range(72)]
+        hub = [30.0 + (h * 7) % 23 for h in range(72)]
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / "nodal.csv"
+            with src.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["timestamp_utc", "region", "settlement_point", "price_usd_mwh"])
+                for h, ts in enumerate(stamps):
+                    for k in range(7):
+                        if (h + k) % 11:
+                            writer.writerow([ts, "ERCOT", f"N{k}", f"{hub[h] + k - 3 + ((h * k) % 13) - 6:.2f}"])
+            root = Path(tmp) / "store"
+            build_store(src, root, stamps)
+            whole = nodal_basis(root, "HB_NORTH", hub, 5.0, 100, "python", 1)
+            self.assertEqual([r["settlement_point"] for r in whole], [f"N{k}" for k in range(7)])
+            self.assertEqual(nodal_basis(root, "HB_NORTH", hub, 5.0, 2, "python", 3), whole)
+            first = [hub[h] - 3 + -6 for h in range(72) if h % 11]  # N0: price - hub = -9 every hour
+            self.assertEqual(int(whole[0]["hours"]), len(first))
+            self.assertAlmostEqual(float(whole[0]["mean_basis_usd_mwh"]), -9.0, places=4)
+            self.assertAlmostEqual(float(whole[0]["congested_share"]), 1.0)
+            if np is not None:
+                fast = nodal_basis(root, "HB_NORTH", hub, 5.0, 3, "numpy", 1)
+                for a, b in zip(whole, fast, strict=True):
+                    self.assertEqual(a["hours"], b["hours"])
+                    for col in a:
+                        if col not in ("settlement_point", "hub", "hours"):
+                            self.assertAlmostEqual(float(a[col]), float(b[col]), places=3, msg=col)
+
+
+if __name__ == "__main__":
+    unittest.main()
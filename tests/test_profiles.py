@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from energy_analytics.markets import capture_prices, library_capture_prices
+from energy_analytics.profiles import (
+    SOLAR_SHAPE_24,
+    library_profiles,
+    open_library,
+    profile_weights,
+    write_library,
+)
+
+
+class ProfileLibraryTests(unittest.TestCase):
+    def test_round_trip_by_profile_and_year(self) -> None:
+        ramp = [h / 8760 for h in range(8760)]
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self.assertIsNone(open_library(root))
+            write_library(root, {("solar", 2025): SOLAR_SHAPE_24, ("site_a", 2025): ramp, ("site_a", 2026): ramp})
+            lib = open_library(root)
+            self.assertEqual(library_profiles(lib), {"site_a": [2025, 2026], "solar": [2025]})
+            solar = profile_weights(lib, "solar", 2025)
+            self.assertEqual(len(solar), 8760)
+            self.assertAlmostEqual(float(solar[24 * 40 + 12]), 1.0, places=6)
+            self.assertAlmostEqual(float(profile_weights(lib, "site_a", 2026)[4380]), 0.5, places=6)
+            with self.assertRaises(SystemExit):
+                profile_weights(lib, "solar", 2026)
+
+    def test_library_capture_matches_hour_of_day_engine(self) -> None:
+        prices = [float((i * 7) % 50 - 8) for i in range(24 * 10)]
+        hod = [i % 24 for i in range(len(prices))]
+        hoy = list(range(len(prices)))
+        expected = capture_prices({"solar": SOLAR_SHAPE_24}, prices, hod, hoy, engine="python")["solar"]
+        with tempfile.TemporaryDirectory() as tmp:
+            write_library(Path(tmp), {("solar", 2025): SOLAR_SHAPE_24})
+            lib = open_library(Path(tmp))
+            for engine in ("python", "auto"):
+                got = library_capture_prices(lib, prices, [2025] * len(prices), hoy, engine=engine)["solar"]
+                # Weights are stored as float32, so agreement is to single precision.
+                self.assertAlmostEqual(
+                    got["capture_price"], expected["capture_price"], delta=1e-6 * expected["capture_price"]
+                )
+                self.assertEqual(got["hours"], len(prices))
+            # Hours in years the library does not cover are left out of that profile.
+            partial = library_capture_prices(
+                lib, prices + prices, [2025] * len(prices) + [2026] * len(prices), hoy + hoy
+            )
+            self.assertEqual(partial["solar"]["hours"], len(prices))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+from energy_analytics.sketches import (
+    p2_init,
+    p2_update,
+    p2_value,
+    pinball_loss,
+    tdigest_add,
+    tdigest_init,
+    tdigest_merge,
+    tdigest_quantile,
+)
+
+
+class SketchTests(unittest.TestCase):
+    def test_p2_tracks_quantiles(self) -> None:
+        values = list(range(1, 10001))
+        random.Random(3).shuffle(values)
+        sketches = {q: p2_init(q) for q in (0.1, 0.5, 0.9)}
+        for v in values:
+            for sk in sketches.values():
+                p2_update(sk, float(v))
+        for q, sk in sketches.items():
+            self.assertAlmostEqual(p2_value(sk), q * 10000, delta=150)
+
+    def test_p2_exact_for_small_samples(self) -> None:
+        sk = p2_init(0.5)
+        for v in (5.0, 1.0, 3.0):
+            p2_update(sk, v)
+        self.assertEqual(p2_value(sk), 3.0)
+
+    def test_pinball_loss(self) -> None:
+        self.assertAlmostEqual(pinball_loss(10.0, 8.0, 0.9), 1.8)
+        self.assertAlmostEqual(pinball_loss(8.0, 10.0, 0.9), 0.2)
+
+    def test_merged_tdigests_track_tail_quantiles(self) -> None:
+        rng = random.Random(5)
+        values = [rng.expovariate(0.1) for _ in range(20000)]
+        parts = [tdigest_init() for _ in range(4)]
+        for i, v in enumerate(values):
+            tdigest_add(parts[i % 4], v)
+        merged = tdigest_init()
+        for part in parts:
+            tdigest_merge(merged, part)
+        self.assertEqual(merged["count"], 20000)
+        self.assertLess(len(merged["centroids"]), 400)
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            self.assertLess(abs(tdigest_quantile(merged, q) - exact) / exact, 0.02)
+
+    def test_tdigest_small_sample_is_exact_at_extremes(self) -> None:
+        digest = tdigest_init()
+        for v in (4.0, 1.0, 3.0, 2.0, 5.0):
+            tdigest_add(digest, v)
+        self.assertEqual(tdigest_quantile(digest, 0.0), 1.0)
+        self.assertEqual(tdigest_quantile(digest, 0.5), 3.0)
+        self.assertEqual(tdigest_quantile(digest, 1.0), 5.0)
+
+    def test_tdigest_below_compression_is_exact(self) -> None:
+        rng = random.Random(9)
+        values = [rng.gauss(10.0, 4.0) for _ in range(150)]
+        parts = [tdigest_init(200) for _ in range(3)]
+        for i, v in enumerate(values):
+            tdigest_add(parts[i % 3], v)
+        merged = tdigest_init(200)
+        for part in parts:
+            tdigest_merge(merged, part)
+        ordered = sorted(values)
+        for q in (0.05, 0.5, 0.95, 0.99):
+            self.assertEqual(tdigest_quantile(merged, q), ordered[int(round((len(ordered) - 1) * q))])
+        # Past the compression threshold values merge into centroids again.
+        for v in values:
+            tdigest_add(merged, v)
+        tdigest_quantile(merged, 0.5)
+        self.assertLess(len(merged["centroids"]), 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
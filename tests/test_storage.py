@@ -0,0 +1,62 @@
+import random
+import unittest
+
+from energy_analytics.storage import _dispatch_numpy, _dispatch_python, _grid, _schedule, np, sweep_batteries
+
+
+class StorageTests(unittest.TestCase):
+    def test_single_cycle_buys_low_sells_high(self) -> None:
+        day = [50.0] * 24
+        day[0], day[23] = 0.0, 100.0
+        battery = {"power_mw": 10.0, "duration_h": 1.0, "round_trip_efficiency": 1.0, "max_cycles_per_day": 1.0}
+        for engine in ["python"] + (["numpy"] if np is not None else []):
+            result = sweep_batteries([day, day], [battery], engine=engine)[0]
+            self.assertAlmostEqual(result["revenue_usd"], 2 * 10.0 * 100.0, places=6)
+            self.assertAlmostEqual(result["cycles_per_year"], 365.0, places=6)
+
+    def test_revenue_scales_with_power(self) -> None:
+        rng = random.Random(5)
+        days = [[30 + 25 * (h > 16) - 15 * (h < 6) + rng.gauss(0, 6) for h in range(24)] for _ in range(4)]
+        shape = {"duration_h": 2.0, "round_trip_efficiency": 0.85, "max_cycles_per_day": 1.5}
+        small, large = sweep_batteries(
+            days, [{**shape, "power_mw": 10.0}, {**shape, "power_mw": 40.0}], engine="python"
+        )
+        self.assertGreater(small["revenue_usd"], 0.0)
+        self.assertAlmostEqual(large["revenue_usd"], 4 * small["revenue_usd"], places=6)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_engines_agree_and_schedules_are_feasible(self) -> None:
+        rng = random.Random(9)
+        days = [[30 + 20 * ((h > 16) - (h < 6)) + rng.gauss(0, 8) for h in range(24)] for _ in range(5)]
+        grid = _grid({"duration_h": 2.0, "round_trip_efficiency": 0.86, "max_cycles_per_day": 1.5}, 4)
+        revenue, discharged, choices = _dispatch_numpy(np.asarray(days), grid, keep_choices=True)
+        py_revenue, py_discharged, _ = _dispatch_python(days, grid)
+        self.assertTrue(np.allclose(revenue, py_revenue, atol=1e-9))
+        moves = _schedule(np.asarray(days), choices, discharged)
+        for k, day in enumerate(days):
+            soc = np.cumsum(moves[k])
+            self.assertEqual((soc.min(), soc[-1]), (0, 0))
+            self.assertLessEqual(soc.max(), grid["levels"] - 1)
+            self.assertLessEqual(-moves[k][moves[k] < 0].sum(), grid["discharge_cap"])
+            cash = sum(
+                -p * m * grid["step_mwh"] * (grid["charge_cost"] if m > 0 else grid["discharge_gain"])
+                for p, m in zip(day, moves[k], strict=True)
+            )
+            self.assertAlmostEqual(cash, revenue[k], places=9)
+            self.assertEqual(int(discharged[k]), py_discharged[k])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_engines_pick_the_same_schedule_on_ties(self) -> None:
+        # Selling the charge bought at 0 in hour 22 or splitting it across hours 22 and 23 earns the same.
+        days = [[10.0, 40.0, 20.0, 10.0, 20.0, 20.0, 10.0, 10.0, 40.0, 40.0, 10.0, 10.0] * 2]
+        days[0][20:] = [10.0, 0.0, 30.0, 30.0]
+        grid = _grid({"duration_h": 2.0, "round_trip_efficiency": 0.64, "max_cycles_per_day": 0.5}, 4)
+        revenue, discharged, choices = _dispatch_numpy(np.asarray(days), grid, keep_choices=True)
+        py_revenue, py_discharged, py_moves = _dispatch_python(days, grid, keep_choices=True)
+        self.assertEqual(revenue.tolist(), py_revenue)
+        self.assertEqual(discharged.tolist(), py_discharged)
+        self.assertEqual(_schedule(np.asarray(days), choices, discharged).tolist(), py_moves)
+
+
+if __name__ == "__main__":
+    unittest.main()